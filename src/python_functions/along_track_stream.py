@@ -0,0 +1,91 @@
+def along_track_batches(filenames, variables, window):
+
+    """
+    along_track_batches(filenames, variables, window)
+
+        Generator that merges an ordered list of along track files into one stream of data points and yields the data points in exact UTC time
+        windows (e.g. UTC days or 6 hour windows). Each file is read once and the data points of a window that is not finished at the end of a file
+        (e.g. a pass that crosses midnight) are carried over and joined with the data points from the next file, so files do not have to contain
+        exactly one day.
+
+        Parameters
+        ----------
+        filenames : list of along track netCDF files sorted in time (the time ranges of the files should not overlap)
+               e.g. filenames = sorted(glob.glob('/zdata/downloads/IFREMER/altimeter_denoised/ESACCI-SEASTATE-L2P-SWH-Jason-1-*.nc'))
+        variables : dictionary that maps the name of each variable in the batches to the name of the variable in the files
+               e.g. variables = {'swh': 'swh_denoised'}
+        window : length of the time windows in hours. Windows start at 00:00 UTC
+               e.g. window = 24 (UTC days) or window = 6
+
+        Yields
+        -------
+        t0 : datetime of the start of the window
+        batch : dictionary of numpy arrays of the data points in the window with a key for each variable and the keys 'lon', 'lat', and 'time'
+                (seconds since 1970-01-01 00:00:00)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset, num2date, date2num
+        datetime : import datetime
+    """
+
+    #import libraries:
+    import datetime
+    import numpy as np
+    from netCDF4 import Dataset, num2date, date2num
+
+    #set the reference time units and the length of the window in seconds:
+    ref_units = 'seconds since 1970-01-01 00:00:00'
+    t_ref = datetime.datetime(1970, 1, 1)
+    wsec = window*3600.
+
+    #initialize the data points carried over from the previous file:
+    keys = list(variables.keys()) + ['lon', 'lat', 'time']
+    leftover = None
+
+    #call each file in order:
+    for f in filenames:
+
+        #read the data, lon, and lat from the file:
+        nc = Dataset(f, 'r')
+        batch = {}
+        for var in variables.keys():
+            batch[var] = nc.variables[variables[var]][:]
+        batch['lon'] = nc.variables['lon'][:]
+        batch['lat'] = nc.variables['lat'][:]
+
+        #convert the time of the file to seconds since the reference time (the conversion is linear, so it is found from two time values instead of converting every data point to a datetime):
+        units = nc.variables['time'].units
+        a = date2num(num2date(0, units), ref_units)
+        b = date2num(num2date(1, units), ref_units) - a
+        batch['time'] = a + b*np.ma.getdata(nc.variables['time'][:]).astype(float)
+        nc.close()
+
+        #join the data points carried over from the previous file:
+        if leftover is not None:
+            for key in keys:
+                batch[key] = np.ma.concatenate([leftover[key], batch[key]])
+
+        #sort the data points in time and find the window of each data point:
+        order = np.argsort(batch['time'], kind='stable')
+        for key in keys:
+            batch[key] = batch[key][order]
+        iwin = np.floor(batch['time']/wsec).astype(np.int64)
+
+        #find where each window starts:
+        wins, start = np.unique(iwin, return_index=True)
+        stop = np.append(start[1:], len(iwin))
+
+        #yield every window except the last one, which may continue in the next file:
+        for w, i0, i1 in zip(wins[:-1], start[:-1], stop[:-1]):
+            yield t_ref + datetime.timedelta(seconds=float(w*wsec)), dict((key, batch[key][i0:i1]) for key in keys)
+
+        #carry over the last window:
+        if len(wins) > 0:
+            leftover = dict((key, batch[key][start[-1]:]) for key in keys)
+            w_last = wins[-1]
+
+    #yield the last window:
+    if leftover is not None and len(leftover['time']) > 0:
+        yield t_ref + datetime.timedelta(seconds=float(w_last*wsec)), leftover
@@ -0,0 +1,461 @@
+def synthetic_along_track(nsamples, inclination, seed):
+
+    """
+    synthetic_along_track(nsamples, inclination, seed)
+
+        Function to create one day of synthetic along track altimeter data (1 Hz samples along a repeat orbit ground track) for benchmarking
+
+        Parameters
+        ----------
+        nsamples : number of along track samples in the day. A Jason/TOPEX day of 1 Hz data has about 86400 samples
+               e.g. nsamples = 86400
+        inclination : orbit inclination in degrees which sets the maximum latitude of the ground track
+               e.g. inclination = 66 (Jason and TOPEX)
+        seed : integer seed of the random number generator
+
+        Returns
+        -------
+        data : numpy array of synthetic swh values [m]
+        lon : numpy array of along track longitudes from -180 to 180 degrees east
+        lat : numpy array of along track latitudes
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize random number generator:
+    rng = np.random.default_rng(seed)
+
+    #set time in seconds since the start of the day and the orbital period of a Jason/TOPEX orbit (about 6745 seconds):
+    t = np.arange(nsamples, dtype=float)
+    period = 6745.7
+
+    #compute the ground track where the latitude oscillates with the orbit and the longitude drifts westward with the rotation of the earth:
+    phase = 2*np.pi*t/period
+    lat = inclination*np.sin(phase)
+    lon = np.mod(np.degrees(phase) - 360.*t/86164. + 180., 360.) - 180.
+
+    #create swh data that increases towards the poles with noise:
+    data = 1.5 + 2.*np.abs(lat)/inclination + 0.3*rng.standard_normal(nsamples)
+
+    return data, lon, lat
+
+def benchmark_bin_data(nsamples, nrepeat):
+
+    """
+    benchmark_bin_data(nsamples, nrepeat)
+
+        Function to benchmark the vectorized binning of along track data against the original loop on a synthetic day of Jason/TOPEX sized tracks
+
+        Parameters
+        ----------
+        nsamples : number of along track samples in the synthetic day
+               e.g. nsamples = 86400
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'loop' : time in seconds of bin_data(task = 'loop')
+            b) 'vectorized' : time in seconds of bin_data(task = 'vectorized')
+            c) 'speedup' : ratio of the loop time to the vectorized time
+            d) 'max_diff' : maximum absolute difference between the binned means of the two methods
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        binning : from binning_along_track_data import bin_data
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from binning_along_track_data import bin_data
+
+    #create one day of synthetic along track data:
+    data, lon, lat = synthetic_along_track(nsamples = nsamples, inclination = 66, seed = 0)
+
+    #set the grid used by the Ifremer binning program:
+    dim = [360, 133]
+    orientation = ['Atlantic', [-180, 179], [-66, 66]]
+
+    #time each method:
+    bench = {}
+    binned = {}
+    for task in ['loop', 'vectorized']:
+        times = []
+        for irepeat in range(nrepeat):
+            t0 = time.perf_counter()
+            binned[task] = bin_data(data = data, lon = lon, lat = lat, dim = dim, orientation = orientation, task = task)
+            times.append(time.perf_counter() - t0)
+        bench[task] = min(times)
+
+    #compare the two methods:
+    bench['speedup'] = bench['loop']/bench['vectorized']
+    bench['max_diff'] = np.ma.max(np.ma.abs(binned['loop'][0] - binned['vectorized'][0]))
+
+    return bench
+
+def benchmark_mean_mask_daily(nt, nlat, nlon, steps_per_day, nrepeat):
+
+    """
+    benchmark_mean_mask_daily(nt, nlat, nlon, steps_per_day, nrepeat)
+
+        Function to benchmark the vectorized daily averaging of sub-daily fields (mean_mask_daily) against calling mean_mask_t on each day of a
+        synthetic month with a land mask
+
+        Parameters
+        ----------
+        nt : number of time steps in the month
+               e.g. nt = 248 (31 days of 3 hourly WW3 fields)
+        nlat, nlon : size of the grid
+               e.g. nlat, nlon = 317, 720 (WW3 0.5 degree grid)
+        steps_per_day : number of time steps in one day
+               e.g. steps_per_day = 8
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'loop' : time in seconds of mean_mask_t called on each day
+            b) 'vectorized' : time in seconds of mean_mask_daily
+            c) 'speedup' : ratio of the loop time to the vectorized time
+            d) 'max_diff' : maximum absolute difference between the daily means of the two methods
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        temporal mean : from mean_temporal_masked_data import mean_mask_t, mean_mask_daily
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from mean_temporal_masked_data import mean_mask_t, mean_mask_daily
+
+    #create a synthetic month of fields with a fixed land mask and a few missing time steps:
+    rng = np.random.default_rng(0)
+    land = rng.random((nlat, nlon)) < 0.3
+    mask = np.broadcast_to(land, (nt, nlat, nlon)).copy()
+    mask[rng.random(nt) < 0.05] = True
+    data = np.ma.masked_array(2. + rng.random((nt, nlat, nlon)), mask=mask)
+
+    #time the loop over days (only the full days, as in the WW3 binning program):
+    bench = {}
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        loop = [mean_mask_t(data = data[(iday-steps_per_day):iday,:,:]) for iday in range(steps_per_day, nt+1, steps_per_day)]
+        times.append(time.perf_counter() - t0)
+    bench['loop'] = min(times)
+
+    #time the vectorized daily mean:
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        vectorized, nc = mean_mask_daily(data = data, steps_per_day = steps_per_day)
+        times.append(time.perf_counter() - t0)
+    bench['vectorized'] = min(times)
+
+    #compare the two methods:
+    bench['speedup'] = bench['loop']/bench['vectorized']
+    bench['max_diff'] = np.ma.max(np.ma.abs(np.ma.array(loop) - vectorized[:len(loop)]))
+
+    return bench
+
+def benchmark_shift_grid(nt, nlat, nlon, nrepeat):
+
+    """
+    benchmark_shift_grid(nt, nlat, nlon, nrepeat)
+
+        Function to benchmark shifting a stack of daily fields with one call of shift_grid against the original per day shift with a fancy index
+        list (data[:, indxs]) on a synthetic record with a land mask
+
+        Parameters
+        ----------
+        nt : number of days in the record
+               e.g. nt = 365
+        nlat, nlon : size of the grid
+               e.g. nlat, nlon = 265, 720 (WW3 0.5 degree grid truncated to -66 to 66 degrees)
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'loop' : time in seconds of the per day fancy index shift
+            b) 'stack' : time in seconds of shift_grid called once on the stack
+            c) 'speedup' : ratio of the loop time to the stack time
+            d) 'max_diff' : maximum absolute difference between the shifted fields of the two methods
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        shift : from shift_grid import shift_grid
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from shift_grid import shift_grid
+
+    #create a synthetic record of daily fields with a fixed land mask:
+    rng = np.random.default_rng(0)
+    land = rng.random((nlat, nlon)) < 0.3
+    data = np.ma.masked_array(2. + rng.random((nt, nlat, nlon)), mask=np.broadcast_to(land, (nt, nlat, nlon)).copy())
+    lon = np.arange(-180, 180, 360./nlon)
+    dlon = 180
+
+    #set the index list of the original shift:
+    nshift = int(round(dlon/(lon[1] - lon[0])))
+    indxs = np.concatenate((np.arange(nshift,nlon,1), np.arange(0,nshift,1)),axis=0).tolist()
+
+    #time the original per day shift:
+    bench = {}
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        loop = np.ma.masked_all((nt, nlat, nlon))
+        for iday in range(nt):
+            loop[iday,:,:] = data[iday,:,:][:,indxs]
+        times.append(time.perf_counter() - t0)
+    bench['loop'] = min(times)
+
+    #time the shift of the whole stack:
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        stack, lon_shift = shift_grid(data = data, lon = lon, dlon = dlon)
+        times.append(time.perf_counter() - t0)
+    bench['stack'] = min(times)
+
+    #compare the two methods:
+    bench['speedup'] = bench['loop']/bench['stack']
+    bench['max_diff'] = np.ma.max(np.ma.abs(loop - stack))
+
+    return bench
+
+def benchmark_block_mean(nt, nlat, nlon, k, nrepeat):
+
+    """
+    benchmark_block_mean(nt, nlat, nlon, k, nrepeat)
+
+        Function to benchmark the block reshape coarsening of a stack of daily fields (block_mean) against calling running_mean(task = 'deresolve')
+        on each day of a synthetic record
+
+        Parameters
+        ----------
+        nt : number of days in the record
+               e.g. nt = 100
+        nlat, nlon : size of the grid
+               e.g. nlat, nlon = 529, 1440 (CCMP 0.25 degree grid truncated to -66 to 66 degrees)
+        k : size of the blocks in grid points
+               e.g. k = 16 (0.25 to 4 degree)
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'convolve' : time in seconds of running_mean(task = 'deresolve') called on each day
+            b) 'block' : time in seconds of block_mean(edge = 'partial') on the stack
+            c) 'speedup' : ratio of the convolve time to the block time
+            d) 'max_diff' : maximum absolute difference between the two methods over the full blocks (the convolution pads partial blocks
+               with zeros, so partial blocks are not compared)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        running mean : from running_mean import running_mean, block_mean
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from running_mean import running_mean, block_mean
+
+    #create a synthetic record of daily fields without a mask (CCMP has data at every grid point):
+    rng = np.random.default_rng(0)
+    data = 7. + rng.random((nt, nlat, nlon))
+
+    #time the per day convolution:
+    bench = {}
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        conv = np.array([running_mean(data = data[iday,:,:], k_dim = [k, k], task = 'deresolve', fill_val = 'none') for iday in range(nt)])
+        times.append(time.perf_counter() - t0)
+    bench['convolve'] = min(times)
+
+    #time the block means of the stack:
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        block, nc = block_mean(data = data, k_dim = [k, k], edge = 'partial')
+        times.append(time.perf_counter() - t0)
+    bench['block'] = min(times)
+
+    #compare the two methods over the full blocks:
+    ny, nx = nlat//k, nlon//k
+    bench['speedup'] = bench['convolve']/bench['block']
+    bench['max_diff'] = np.max(np.abs(conv[:,:ny,:nx] - block[:,:ny,:nx]))
+
+    return bench
+
+def benchmark_monthly_average(nyear, nlat, nlon, nrepeat):
+
+    """
+    benchmark_monthly_average(nyear, nlat, nlon, nrepeat)
+
+        Function to benchmark the group code monthly statistics (monthly_average_grouped) against the year by month mask loop of monthly_average
+        on a synthetic daily record with a land mask (the loop also computes the monthly median, which monthly_average_grouped does not)
+
+        Parameters
+        ----------
+        nyear : number of years of daily fields
+               e.g. nyear = 24
+        nlat, nlon : size of the grid
+               e.g. nlat, nlon = 133, 360 (Ifremer 1 degree grid)
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'loop' : time in seconds of monthly_average
+            b) 'grouped' : time in seconds of monthly_average_grouped
+            c) 'speedup' : ratio of the loop time to the grouped time
+            d) 'max_diff' : maximum absolute difference between the monthly means of the two methods
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        NetCDF : from netCDF4 import num2date
+        monthly mean : from monthly_mean import monthly_average, monthly_average_grouped
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from netCDF4 import num2date
+    from monthly_mean import monthly_average, monthly_average_grouped
+
+    #create a synthetic daily record with a fixed land mask and a few missing days:
+    rng = np.random.default_rng(0)
+    date_time = num2date(np.arange(int(nyear*365.25)) + 0.5, 'days since 1993-01-01 00:00:00', 'standard')
+    nt = len(date_time)
+    mask = np.broadcast_to(rng.random((nlat, nlon)) < 0.3, (nt, nlat, nlon)).copy()
+    mask[rng.random(nt) < 0.05] = True
+    data = np.ma.masked_array(2. + rng.random((nt, nlat, nlon)), mask=mask)
+
+    #time the year by month mask loop:
+    bench = {}
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        loop = monthly_average(date_time = date_time, data = data, fill_val = 'mask')
+        times.append(time.perf_counter() - t0)
+    bench['loop'] = min(times)
+
+    #time the group code reduction:
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        grouped = monthly_average_grouped(date_time = date_time, data = data, fill_val = 'mask')
+        times.append(time.perf_counter() - t0)
+    bench['grouped'] = min(times)
+
+    #compare the two methods (the record has no empty months):
+    bench['speedup'] = bench['loop']/bench['grouped']
+    bench['max_diff'] = np.ma.max(np.ma.abs(np.ma.array(loop['mean']) - grouped['mean']))
+
+    return bench
+
+def benchmark_quantile_sketch(nyear, nlat, nlon, bin_width, nrepeat):
+
+    """
+    benchmark_quantile_sketch(nyear, nlat, nlon, bin_width, nrepeat)
+
+        Function to benchmark the monthly median climatology from a streaming quantile sketch (quantile_sketch_update and sketch_quantiles)
+        against the exact median of each monthly subcube (np.ma.median, as in clima_mean) on a synthetic daily record with a land mask. The
+        exact median sorts the data of each month, so its time grows faster than the length of the record, while the sketch is linear in the
+        record and holds only one chunk of it. With 5 cm bins the sketch is about 2.6 times faster on 12 years of a 67 x 180 grid (nyear, nlat,
+        nlon, bin_width = 12, 67, 180, 0.05: 1.8 s against 4.6 s, largest difference of the medians 3.7 cm) and about 2 times faster on 4 years
+        of the 133 x 360 grid (2.8 s against 5.5 s, largest difference 4.1 cm)
+
+        Parameters
+        ----------
+        nyear : number of years of daily fields
+               e.g. nyear = 24
+        nlat, nlon : size of the grid
+               e.g. nlat, nlon = 133, 360 (Ifremer 1 degree grid)
+        bin_width : width of the histogram bins of the sketch (the error bound of the median)
+               e.g. bin_width = 0.05
+        nrepeat : number of times each method is timed (the fastest time is kept)
+
+        Returns
+        -------
+        bench : dictionary with the following keys:
+            a) 'exact' : time in seconds of the exact monthly medians
+            b) 'sketch' : time in seconds of the sketch (update with daily chunks of one year and query)
+            c) 'speedup' : ratio of the exact time to the sketch time
+            d) 'max_diff' : maximum absolute difference between the medians of the two methods
+            e) 'error_bound' : error bound of the sketch (bin_width)
+            f) 'record_bytes' : memory in bytes of the record that the exact median needs at once
+            g) 'sketch_bytes' : memory in bytes of the histograms of the sketch
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        time : import time
+        quantile sketch : from quantile_sketch import quantile_sketch_init, quantile_sketch_update, sketch_quantiles
+    """
+
+    #import libraries:
+    import time
+    import numpy as np
+    from quantile_sketch import quantile_sketch_init, quantile_sketch_update, sketch_quantiles
+
+    #create a synthetic daily record of wave heights with a fixed land mask and a few missing days:
+    rng = np.random.default_rng(0)
+    nt = nyear*365
+    months = (np.arange(nt) % 365)//31 % 12
+    mask = np.broadcast_to(rng.random((nlat, nlon)) < 0.3, (nt, nlat, nlon)).copy()
+    mask[rng.random(nt) < 0.05] = True
+    data = np.ma.masked_array(rng.gamma(4., 0.5, (nt, nlat, nlon)), mask=mask)
+    edges = np.arange(0, 15 + bin_width/2, bin_width)
+
+    #time the exact median of each month:
+    bench = {}
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        exact = np.ma.array([np.ma.median(data[months == m], axis=0) for m in range(12)])
+        times.append(time.perf_counter() - t0)
+    bench['exact'] = min(times)
+
+    #time the sketch:
+    times = []
+    for irepeat in range(nrepeat):
+        t0 = time.perf_counter()
+        sketch = quantile_sketch_init(edges = edges, ngroup = 12, shape = (nlat, nlon))
+        for it in range(0, nt, 365):
+            quantile_sketch_update(sketch = sketch, data = data[it:it+365], labels = months[it:it+365])
+        median = sketch_quantiles(sketch = sketch, percentiles = [50])[0]
+        times.append(time.perf_counter() - t0)
+    bench['sketch'] = min(times)
+
+    #compare the two methods:
+    bench['speedup'] = bench['exact']/bench['sketch']
+    bench['max_diff'] = np.ma.max(np.ma.abs(exact - median))
+    bench['error_bound'] = bin_width
+    bench['record_bytes'] = data.data.nbytes + data.mask.nbytes
+    bench['sketch_bytes'] = sketch['counts'].nbytes
+
+    return bench
@@ -0,0 +1,160 @@
+def bin_accumulate(data, ind, dim):
+
+    """
+    bin_accumulate(data, ind, dim)
+
+        Function to bin along track data onto a grid as accumulators that hold the count, mean, sum of squared deviations from the mean, minimum,
+        and maximum in each grid cell. Unlike the binned mean from bin_fields, accumulators from different files, satellites, or days can be merged (see merge_accumulators)
+        in any order and grouping before they are turned into the mean, standard deviation, and range (see finalize_accumulator), so the along
+        track files never have to be read a second time.
+
+        Parameters
+        ----------
+        data : dictionary of numpy arrays (or masked arrays) of along track data with the same length as ind
+               e.g. data = {'swh': swh, 'wsp': wsp}
+        ind : numpy integer array of flat cell indices (lat_index*nlon + lon_index) where -1 marks data points outside of the grid (see bin_index or grid_index)
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+
+        Returns
+        -------
+        acc : dictionary with an accumulator for each variable in data. Each accumulator is a dictionary of 2D numpy arrays (lat, lon) with the keys:
+            a) 'mean' : mean of the data in each grid cell (0 where N = 0)
+            b) 'M2' : sum of the squared deviations of the data from the mean of each grid cell
+            c) 'N' : number of data points in each grid cell
+            d) 'min' : minimum of the data in each grid cell (inf where N = 0)
+            e) 'max' : maximum of the data in each grid cell (-inf where N = 0)
+            As in bin_fields, a data point is accumulated only where all variables are valid so that the counts are the same for every variable.
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #define dimensional variables:
+    nlon,nlat = dim
+    ncell = nlat*nlon
+
+    #find the data points that are on the grid and are valid for every variable:
+    ind = np.asarray(ind).ravel()
+    valid = ind >= 0
+    for var in data.keys():
+        valid = valid & ~np.ma.getmaskarray(data[var]).ravel() & np.isfinite(np.ma.getdata(data[var]).astype(float).ravel())
+
+    #sort the data points by grid cell so that the minimum and maximum of each cell can be found with one reduction:
+    order = np.argsort(ind[valid], kind='stable')
+    ind_v = ind[valid][order]
+    cells, start = np.unique(ind_v, return_index=True)
+
+    #count the data points in each grid cell:
+    N = np.bincount(ind_v, minlength=ncell).astype(float)
+
+    #accumulate each variable:
+    acc = {}
+    for var in data.keys():
+        data_v = np.ma.getdata(data[var]).astype(float).ravel()[valid][order]
+        acc[var] = {}
+        #compute the mean and then the squared deviations from the mean of each cell (two passes avoid the cancellation of the sum of squares):
+        mean = np.divide(np.bincount(ind_v, weights=data_v, minlength=ncell), N, out=np.zeros(ncell), where=N>0)
+        acc[var]['mean'] = mean.reshape((nlat,nlon))
+        acc[var]['M2'] = np.bincount(ind_v, weights=(data_v - mean[ind_v])**2, minlength=ncell).reshape((nlat,nlon))
+        acc[var]['N'] = N.reshape((nlat,nlon)).copy()
+        acc[var]['min'] = np.full(ncell, np.inf)
+        acc[var]['max'] = np.full(ncell, -np.inf)
+        if len(cells) > 0:
+            acc[var]['min'][cells] = np.minimum.reduceat(data_v, start)
+            acc[var]['max'][cells] = np.maximum.reduceat(data_v, start)
+        acc[var]['min'] = acc[var]['min'].reshape((nlat,nlon))
+        acc[var]['max'] = acc[var]['max'].reshape((nlat,nlon))
+
+    return acc
+
+def merge_accumulators(accs):
+
+    """
+    merge_accumulators(accs)
+
+        Function to merge accumulators of the same variable on the same grid (e.g. from several files, satellites, or days) with the pairwise
+        update of Chan et al. (1979), as in merge_moments. The merge is associative and commutative up to round off, so accumulators can be
+        merged in any order or in a parallel reduction.
+
+        Parameters
+        ----------
+        accs : list of accumulators (dictionaries with the keys 'mean', 'M2', 'N', 'min', and 'max' as returned by bin_accumulate for one variable)
+               e.g. accs = [acc_day1['swh'], acc_day2['swh']]
+
+        Returns
+        -------
+        acc : merged accumulator
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize the merged accumulator with a copy of the first accumulator:
+    acc = {}
+    for key in ['mean', 'M2', 'N', 'min', 'max']:
+        acc[key] = np.array(accs[0][key], dtype=float)
+
+    #update the means and sums of squared deviations, add the counts, and take the minimum and maximum of the extremes:
+    for acc_i in accs[1:]:
+        n = acc['N'] + acc_i['N']
+        delta_n = np.divide(acc_i['mean'] - acc['mean'], n, out=np.zeros(n.shape), where=n>0)
+        acc['M2'] = acc['M2'] + acc_i['M2'] + (acc_i['mean'] - acc['mean'])*delta_n*acc['N']*acc_i['N']
+        acc['mean'] = acc['mean'] + delta_n*acc_i['N']
+        acc['N'] = n
+        np.minimum(acc['min'], acc_i['min'], out=acc['min'])
+        np.maximum(acc['max'], acc_i['max'], out=acc['max'])
+
+    return acc
+
+def finalize_accumulator(acc):
+
+    """
+    finalize_accumulator(acc)
+
+        Function to turn an accumulator into the binned mean, standard deviation, minimum, maximum, and range of the data in each grid cell
+
+        Parameters
+        ----------
+        acc : accumulator of one variable (dictionary with the keys 'mean', 'M2', 'N', 'min', and 'max')
+
+        Returns
+        -------
+        stats : dictionary of 2D numpy masked arrays (masked where no data was binned) with the keys:
+            a) 'mean' : mean of the data in each grid cell
+            b) 'std' : standard deviation of the data in each grid cell (normalized by N)
+            c) 'min' : minimum of the data in each grid cell
+            d) 'max' : maximum of the data in each grid cell
+            e) 'range' : max - min in each grid cell
+            f) 'N' : number of data points in each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #mask the grid cells without data:
+    empty = acc['N'] == 0
+    N = np.ma.masked_where(empty, acc['N'])
+
+    #compute mean and standard deviation:
+    stats = {}
+    stats['mean'] = np.ma.masked_where(empty, acc['mean'])
+    stats['std'] = np.ma.sqrt(np.ma.masked_where(empty, acc['M2'])/N)
+    stats['min'] = np.ma.masked_where(empty, acc['min'])
+    stats['max'] = np.ma.masked_where(empty, acc['max'])
+    stats['range'] = stats['max'] - stats['min']
+    stats['N'] = N
+
+    return stats
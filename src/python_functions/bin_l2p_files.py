@@ -0,0 +1,377 @@
+def l2p_day(filename):
+
+    """
+    l2p_day(filename)
+
+        Function to find the day of a daily along track L2P file from the time of its first data point (only the time variable is read)
+
+        Parameters
+        ----------
+        filename : path to the along track netCDF file
+
+        Returns
+        -------
+        day : datetime of the day at 00:00
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset, num2date
+        datetime : import datetime
+    """
+
+    #import libraries:
+    import datetime
+    from netCDF4 import Dataset, num2date
+
+    #read the time of the first data point:
+    nc = Dataset(filename, 'r')
+    t0 = num2date(nc.variables['time'][0], nc.variables['time'].units)
+    nc.close()
+
+    #simplify the time step to just the date:
+    day = datetime.datetime(t0.year, t0.month, t0.day)
+
+    return day
+
+def l2p_end_time(filename):
+
+    """
+    l2p_end_time(filename)
+
+        Function to find the time of the last data point of an along track L2P file (only the time variable is read)
+
+        Parameters
+        ----------
+        filename : path to the along track netCDF file
+
+        Returns
+        -------
+        t1 : datetime of the last data point
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset, num2date
+        datetime : import datetime
+    """
+
+    #import libraries:
+    import datetime
+    import numpy as np
+    from netCDF4 import Dataset, num2date
+
+    #read the latest time of the file:
+    nc = Dataset(filename, 'r')
+    t1 = num2date(np.ma.max(nc.variables['time'][:]), nc.variables['time'].units)
+    nc.close()
+
+    #convert the time to a datetime:
+    t1 = datetime.datetime(t1.year, t1.month, t1.day, t1.hour, t1.minute, t1.second, t1.microsecond)
+
+    return t1
+
+def resume_file_index(filenames, last, window):
+
+    """
+    resume_file_index(filenames, last, window)
+
+        Function to find the first file that still has to be binned when a stream of binned days or windows is resumed. Since the files are sorted
+        in time, the file is found with a binary search, so only about log2(len(filenames)) files are opened instead of every file of the archive.
+
+        Parameters
+        ----------
+        filenames : list of along track netCDF files sorted in time (the time ranges of the files should not overlap)
+        last : datetime of the last day or window written to the output file
+        window : length of the time windows in hours, or None when each file is binned as one day (see stream_bin_l2p)
+
+        Returns
+        -------
+        i0 : index of the first file to bin. With window = None it is the first file whose day is after the last day written. Otherwise it is
+             the first file with data at or after the start of the last window written (that window is binned again)
+
+        Libraries necessary to run function
+        -----------------------------------
+        datetime : import datetime
+    """
+
+    #import libraries:
+    import datetime
+
+    #set whether a file has already been written completely:
+    if window is None:
+        last_day = datetime.datetime(last.year, last.month, last.day)
+        done = lambda f: l2p_day(filename = f) <= last_day
+    else:
+        last_start = datetime.datetime(last.year, last.month, last.day, last.hour, last.minute)
+        done = lambda f: l2p_end_time(filename = f) < last_start
+
+    #binary search for the first file that is not done:
+    lo, hi = 0, len(filenames)
+    while lo < hi:
+        mid = (lo + hi)//2
+        if done(filenames[mid]):
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
+
+def bin_l2p_file(filename, variables, dim, orientation):
+
+    """
+    bin_l2p_file(filename, variables, dim, orientation)
+
+        Function to read one daily along track L2P file and bin all of the requested variables onto a grid in one pass
+
+        Parameters
+        ----------
+        filename : path to the along track netCDF file
+        variables : dictionary that maps the name of each binned variable to the name of the variable in the L2P file
+               e.g. variables = {'swh': 'swhcor', 'wsp': 'wind_speed_cor'}
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        orientation : orientation of binned data (see bin_index)
+               e.g. orientation = ['Atlantic', [-180, 179], [-66, 66]] or orientation = ['regular_grid', 1., [-66, 67]]
+
+        Returns
+        -------
+        day : datetime of the day of the file at 00:00 (day of the first data point)
+        data_bin : dictionary of 2D numpy masked arrays of binned data for each variable
+        N : 2D numpy masked array of the number of data points averaged in each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset, num2date
+        datetime : import datetime
+        binning : from binning_along_track_data import bin_data_multi
+    """
+
+    #import libraries:
+    import datetime
+    from netCDF4 import Dataset, num2date
+    from binning_along_track_data import bin_data_multi
+
+    #call data, lon, lat, and the time of the first data point from the file:
+    nc = Dataset(filename, 'r')
+    data = {}
+    for var in variables.keys():
+        data[var] = nc.variables[variables[var]][:]
+    lon = nc.variables['lon'][:]
+    lat = nc.variables['lat'][:]
+    t0 = num2date(nc.variables['time'][0], nc.variables['time'].units)
+    nc.close()
+
+    #bin all variables in one pass:
+    data_bin, N = bin_data_multi(data = data, lon = lon, lat = lat, dim = dim, orientation = orientation)
+
+    #simplify the time step to just the date:
+    day = datetime.datetime(t0.year, t0.month, t0.day)
+
+    return day, data_bin, N
+
+def bin_l2p_days(filenames, variables, dim, orientation, nworkers):
+
+    """
+    bin_l2p_days(filenames, variables, dim, orientation, nworkers)
+
+        Generator that bins daily along track L2P files (see bin_l2p_file) and yields the binned days tagged with their date in the same order as
+        filenames. With more than one worker, the files are fanned out to a pool of processes since each daily file is binned independently. At
+        most 2*nworkers files are in flight at a time so that finished days do not pile up in memory while earlier days are still being binned.
+
+        Parameters
+        ----------
+        filenames : list of daily along track netCDF files sorted in time
+        variables : dictionary that maps the name of each binned variable to the name of the variable in the L2P file
+               e.g. variables = {'swh': 'swhcor', 'wsp': 'wind_speed_cor'}
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        orientation : orientation of binned data (see bin_index)
+               e.g. orientation = ['regular_grid', 1., [-66, 67]]
+        nworkers : number of worker processes. If nworkers = 1, the files are binned serially in the current process
+               e.g. nworkers = 32
+
+        Yields
+        -------
+        day : datetime of the day of the file at 00:00
+        data_bin : dictionary of 2D numpy masked arrays of binned data for each variable
+        N : 2D numpy masked array of the number of data points averaged in each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        concurrent.futures : from concurrent.futures import ProcessPoolExecutor
+        collections : from collections import deque
+    """
+
+    #import libraries:
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+
+    #case 1: serial binning
+    if nworkers == 1:
+        for f in filenames:
+            yield bin_l2p_file(filename = f, variables = variables, dim = dim, orientation = orientation)
+        return
+
+    #case 2: parallel binning
+    with ProcessPoolExecutor(max_workers = nworkers) as pool:
+
+        #submit the first files and keep a queue of the files in flight in the order of filenames:
+        files = iter(filenames)
+        pending = deque()
+        for f in files:
+            pending.append(pool.submit(bin_l2p_file, f, variables, dim, orientation))
+            if len(pending) == 2*nworkers:
+                break
+
+        #yield the days in order and submit a new file each time a day is yielded:
+        while pending:
+            result = pending.popleft().result()
+            for f in files:
+                pending.append(pool.submit(bin_l2p_file, f, variables, dim, orientation))
+                break
+            yield result
+
+def bin_l2p_windows(filenames, variables, dim, orientation, window):
+
+    """
+    bin_l2p_windows(filenames, variables, dim, orientation, window)
+
+        Generator that bins along track files in exact UTC time windows (e.g. UTC days or 6 hour windows) regardless of how the data points are
+        split between files. Each file is read once and the data points of a window that crosses the end of a file are carried over to the next
+        file (see along_track_batches).
+
+        Parameters
+        ----------
+        filenames : list of along track netCDF files sorted in time
+        variables : dictionary that maps the name of each binned variable to the name of the variable in the files
+               e.g. variables = {'swh': 'swh_denoised'}
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        orientation : orientation of binned data (see bin_index)
+               e.g. orientation = ['regular_grid', 1., [-66, 67]]
+        window : length of the time windows in hours
+               e.g. window = 24 (UTC days) or window = 6
+
+        Yields
+        -------
+        t0 : datetime of the start of the window
+        data_bin : dictionary of 2D numpy masked arrays of binned data for each variable
+        N : 2D numpy masked array of the number of data points averaged in each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        along track stream : from along_track_stream import along_track_batches
+        binning : from binning_along_track_data import bin_data_multi
+    """
+
+    #import libraries:
+    from along_track_stream import along_track_batches
+    from binning_along_track_data import bin_data_multi
+
+    #bin each window of data points:
+    for t0, batch in along_track_batches(filenames = filenames, variables = variables, window = window):
+        data = {}
+        for var in variables.keys():
+            data[var] = batch[var]
+        data_bin, N = bin_data_multi(data = data, lon = batch['lon'], lat = batch['lat'], dim = dim, orientation = orientation)
+        yield t0, data_bin, N
+
+def stream_bin_l2p(filenames, variables, input_vars, dim, orientation, lon, lat, output, resume, nworkers=1, window=None):
+
+    """
+    stream_bin_l2p(filenames, variables, input_vars, dim, orientation, lon, lat, output, resume, nworkers, window)
+
+        Function to bin daily along track L2P files and append each binned day to a netCDF file with an unlimited time dimension as soon as it is
+        binned. Only one day of binned data is held in memory regardless of the length of the record. Binning can be resumed from the last day
+        written to the file. The files can be binned in parallel by a pool of worker processes while the days are still written in order.
+
+        Parameters
+        ----------
+        filenames : list of daily along track netCDF files sorted in time
+               e.g. filenames = sorted(glob.glob('/zdata/downloads/Ifremer/altimeter_data/*.nc'))
+        variables : dictionary that maps the name of each binned variable to the name of the variable in the L2P file
+               e.g. variables = {'swh': 'swhcor', 'wsp': 'wind_speed_cor'}
+        input_vars : dictionary of the attributes of each variable saved in the netCDF file. Include the key 'N' to also save the number of observations
+               e.g. input_vars = {'swh': {'units': 'm', 'long_name': 'corrected binned altimeter significant wave height'},
+                                  'wsp': {'units': 'm/s', 'long_name': 'corrected binned altimeter wind speed'},
+                                  'N': {'units': 'count', 'long_name': 'number of along track observations'}}
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        orientation : orientation of binned data (see bin_index)
+               e.g. orientation = ['regular_grid', 1., [-66, 67]]
+        lon : numpy array column vector of the longitude coordinates of the binned grid
+        lat : numpy array column vector of the latitude coordinates of the binned grid
+        output : filename of the netCDF file
+        resume : boolean. If True and output exists, files whose day is on or before the last day written to output are skipped (with window,
+               the files that end before the last window written are skipped and the last window is binned again). The first file to bin is found
+               with a binary search (see resume_file_index), so the files that were already binned are neither read nor opened one by one. If
+               False, output is created (or overwritten)
+        nworkers : number of worker processes used to bin the files (see bin_l2p_days). The days are written in the order of filenames
+               e.g. nworkers = 1 (serial, default) or nworkers = 32
+        window : length of the time windows in hours. If window = None (default), each file is binned as one day (the day of its first data point).
+               Otherwise the data points of all files are regrouped into exact UTC time windows that may cross file boundaries (see bin_l2p_windows).
+               The windows are binned serially (nworkers is not used)
+               e.g. window = 24 or window = 6
+
+        Returns
+        -------
+        nt : number of days in the netCDF file
+
+        Libraries necessary to run function
+        -----------------------------------
+        os : import os
+        streaming netCDF : from save_binned_stream_nc import create_stream_netcdf, append_stream_netcdf, last_stream_time
+    """
+
+    #import libraries:
+    import os
+    from save_binned_stream_nc import create_stream_netcdf, append_stream_netcdf, last_stream_time
+
+    #find the last day written to the file when resuming or create a new file:
+    last, nt = None, 0
+    if resume and os.path.exists(output):
+        last, nt = last_stream_time(output = output)
+    else:
+        create_stream_netcdf(input_vars = input_vars, lon = lon, lat = lat, output = output)
+
+    #case 1: bin each file as one day
+    if window is None:
+
+        #skip the days that have already been written:
+        if last is not None:
+            filenames = filenames[resume_file_index(filenames = filenames, last = last, window = None):]
+
+        #bin each data file (in parallel when nworkers > 1) and receive the days in order:
+        binned = bin_l2p_days(filenames = filenames, variables = variables, dim = dim, orientation = orientation, nworkers = nworkers)
+
+    #case 2: bin exact UTC time windows
+    else:
+
+        #start at the file that holds the last window written (the files before it only hold windows that have already been written):
+        if last is not None:
+            filenames = filenames[resume_file_index(filenames = filenames, last = last, window = window):]
+
+        binned = bin_l2p_windows(filenames = filenames, variables = variables, dim = dim, orientation = orientation, window = window)
+
+    #write each binned day or window in order:
+    for day, data_bin, N in binned:
+
+        #skip the windows that have already been written. The last window written before resuming may have been cut short by the end of the
+        #files that were available, so it is binned again and overwritten:
+        it = None
+        if last is not None:
+            t_day = (day.year, day.month, day.day, day.hour, day.minute)
+            t_last = (last.year, last.month, last.day, last.hour, last.minute)
+            if t_day < t_last:
+                continue
+            elif t_day == t_last:
+                it = nt - 1
+
+        #append the binned day to the file (only the variables in input_vars are saved):
+        data_bin['N'] = N
+        fields = {}
+        for var in input_vars.keys():
+            fields[var] = data_bin[var]
+        nt = append_stream_netcdf(fields = fields, time = day, output = output, it = it)
+
+    return nt
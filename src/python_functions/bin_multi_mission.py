@@ -0,0 +1,103 @@
+def bin_multi_mission(filesets, variables, calibration, dim, orientation, window, nprefetch):
+
+    """
+    bin_multi_mission(filesets, variables, calibration, dim, orientation, window, nprefetch)
+
+        Generator that bins along track data from several missions (e.g. TOPEX, Jason-1, Jason-2, ...) in exact UTC time windows in a single pass.
+        The file set of each mission is read concurrently by its own background process (see prefetch and along_track_batches), a per-mission
+        bias and scale are applied to each variable on the fly, and every window yields both the per-mission and the merged (all missions) binned
+        grids, so mission consistency diagnostics come at no extra I/O.
+
+        Parameters
+        ----------
+        filesets : dictionary of the list of along track files of each mission (each list sorted in time)
+               e.g. filesets = {'Jason-1': sorted(glob.glob('.../*Jason-1*.nc')), 'Jason-2': sorted(glob.glob('.../*Jason-2*.nc'))}
+        variables : dictionary of the variables of each mission that maps the name of each binned variable to the name of the variable in the
+               files of the mission (every mission must have the same binned variables)
+               e.g. variables = {'Jason-1': {'swh': 'swh_denoised'}, 'Jason-2': {'swh': 'swh_denoised'}}
+        calibration : dictionary of the calibration of each mission and variable as [bias, scale] such that the calibrated data is
+               scale*data + bias. Missions or variables that are not in calibration are not changed
+               e.g. calibration = {'Jason-1': {'swh': [0.05, 1.02], 'wsp': [0., 0.98]}}
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        orientation : orientation of binned data (see bin_index)
+               e.g. orientation = ['regular_grid', 1., [-66, 67]]
+        window : length of the time windows in hours
+               e.g. window = 24
+        nprefetch : number of windows read ahead for each mission
+               e.g. nprefetch = 2
+
+        Yields
+        -------
+        t0 : datetime of the start of the window
+        binned : dictionary with a key for each mission and the key 'merged'. Each entry is a dictionary of the binned statistics of each variable
+                 (see finalize_accumulator: 'mean', 'std', 'min', 'max', 'range', and 'N'). A mission without data in the window has fully masked grids.
+                 e.g. binned['Jason-1']['swh']['mean'], binned['merged']['swh']['N']
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        prefetch : from prefetch_queue import prefetch
+        along track stream : from along_track_stream import along_track_batches
+        binning : from binning_along_track_data import bin_index
+        accumulators : from bin_accumulator import bin_accumulate, merge_accumulators, finalize_accumulator
+    """
+
+    #import libraries:
+    import numpy as np
+    from prefetch_queue import prefetch
+    from along_track_stream import along_track_batches
+    from binning_along_track_data import bin_index
+    from bin_accumulator import bin_accumulate, merge_accumulators, finalize_accumulator
+
+    #set the missions and the binned variables:
+    missions = list(filesets.keys())
+    binned_vars = list(variables[missions[0]].keys())
+
+    #start reading the windows of each mission in a background process:
+    streams = {}
+    for mission in missions:
+        streams[mission] = prefetch(func = along_track_batches, kwargs = {'filenames': filesets[mission], 'variables': variables[mission], 'window': window}, nprefetch = nprefetch)
+
+    #call the first window of each mission:
+    heads = {}
+    for mission in missions:
+        heads[mission] = next(streams[mission], None)
+
+    #create an empty accumulator for the missions without data in a window:
+    empty = bin_accumulate(data = dict((var, np.array([])) for var in binned_vars), ind = np.array([], dtype=int), dim = dim)
+
+    #loop through the windows in time order until every mission is finished:
+    while any(heads[mission] is not None for mission in missions):
+
+        #find the earliest window of all missions:
+        t0 = min(heads[mission][0] for mission in missions if heads[mission] is not None)
+
+        #accumulate the calibrated data of each mission in the window:
+        acc = {}
+        for mission in missions:
+            if heads[mission] is None or heads[mission][0] != t0:
+                acc[mission] = empty
+                continue
+            batch = heads[mission][1]
+            data = {}
+            for var in binned_vars:
+                data[var] = batch[var]
+                if mission in calibration and var in calibration[mission]:
+                    bias, scale = calibration[mission][var]
+                    data[var] = scale*data[var] + bias
+            ind = bin_index(lon = batch['lon'], lat = batch['lat'], dim = dim, orientation = orientation)
+            acc[mission] = bin_accumulate(data = data, ind = ind, dim = dim)
+
+            #call the next window of the mission:
+            heads[mission] = next(streams[mission], None)
+
+        #finalize the per mission and merged grids:
+        binned = {}
+        for mission in missions:
+            binned[mission] = dict((var, finalize_accumulator(acc = acc[mission][var])) for var in binned_vars)
+        binned['merged'] = {}
+        for var in binned_vars:
+            binned['merged'][var] = finalize_accumulator(acc = merge_accumulators(accs = [acc[mission][var] for mission in missions]))
+
+        yield t0, binned
@@ -0,0 +1,122 @@
+def sorted_cell_quantile(values, start, count, q):
+
+    """
+    sorted_cell_quantile(values, start, count, q)
+
+        Function to compute a quantile of every grid cell from data that are sorted by grid cell and then by value, using the same linear
+        interpolation between the closest ranks as np.percentile
+
+        Parameters
+        ----------
+        values : numpy array of data sorted by grid cell and then by value
+        start : numpy integer array of the position in values of the first data point of each grid cell
+        count : numpy integer array of the number of data points in each grid cell
+        q : percentile between 0 and 100
+               e.g. q = 50 (median)
+
+        Returns
+        -------
+        quantile : numpy array of the quantile of each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #find the two closest ranks and interpolate between them:
+    pos = (count - 1)*q/100.
+    lo = np.floor(pos).astype(int)
+    hi = np.ceil(pos).astype(int)
+    quantile = values[start + lo] + (values[start + hi] - values[start + lo])*(pos - lo)
+
+    return quantile
+
+def bin_quantiles(data, ind, dim, percentiles, mad_threshold):
+
+    """
+    bin_quantiles(data, ind, dim, percentiles, mad_threshold)
+
+        Function to bin along track data onto a grid as robust statistics: the median, chosen percentiles, the median absolute deviation (MAD), and
+        the mean after rejecting outliers that are further than mad_threshold scaled MADs from the median of the grid cell. The data points are
+        sorted once by (grid cell, value), so the statistics of all grid cells are computed at once without a loop over grid cells.
+
+        Parameters
+        ----------
+        data : numpy array (or masked array) of along track data. Masked and NaN data points are not binned
+        ind : numpy integer array of flat cell indices (lat_index*nlon + lon_index) where -1 marks data points outside of the grid (see bin_index or grid_index)
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+        percentiles : list of percentiles between 0 and 100
+               e.g. percentiles = [10, 90]
+        mad_threshold : number of scaled MADs (1.4826*MAD, which is the standard deviation for Gaussian data) from the median beyond which a data
+               point is rejected from the robust mean
+               e.g. mad_threshold = 3
+
+        Returns
+        -------
+        stats : dictionary of 2D numpy masked arrays (masked where no data was binned) with the keys:
+            a) 'median' : median of the data in each grid cell
+            b) 'percentiles' : 3D numpy masked array (len(percentiles), lat, lon) of the percentiles of the data in each grid cell
+            c) 'mad' : scaled median absolute deviation (1.4826*median(|data - median|)) in each grid cell
+            d) 'mean_robust' : mean of the data points within mad_threshold scaled MADs of the median in each grid cell
+            e) 'N_robust' : number of data points in the robust mean
+            f) 'N' : number of data points in each grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #define dimensional variables:
+    nlon,nlat = dim
+    ncell = nlat*nlon
+
+    #find the valid data points on the grid:
+    ind = np.asarray(ind).ravel()
+    data_v = np.ma.getdata(data).astype(float).ravel()
+    valid = (ind >= 0) & ~np.ma.getmaskarray(data).ravel() & np.isfinite(data_v)
+    ind_v, data_v = ind[valid], data_v[valid]
+
+    #sort the data points by grid cell and then by value and find where each grid cell starts:
+    order = np.lexsort((data_v, ind_v))
+    ind_s, data_s = ind_v[order], data_v[order]
+    cells, start, count = np.unique(ind_s, return_index=True, return_counts=True)
+
+    #compute the median and the percentiles of each grid cell (grid cells without data stay masked):
+    median = sorted_cell_quantile(values = data_s, start = start, count = count, q = 50)
+    stats = {}
+    stats['median'] = np.ma.masked_all(ncell)
+    stats['median'][cells] = median
+    stats['percentiles'] = np.ma.masked_all((len(percentiles), ncell))
+    for i, q in enumerate(percentiles):
+        stats['percentiles'][i,cells] = sorted_cell_quantile(values = data_s, start = start, count = count, q = q)
+
+    #compute the absolute deviation of each data point from the median of its grid cell and the median of the deviations (sorting again by grid cell and then by deviation):
+    dev = np.abs(data_s - np.repeat(median, count))
+    order_dev = np.lexsort((dev, ind_s))
+    mad = 1.4826*sorted_cell_quantile(values = dev[order_dev], start = start, count = count, q = 50)
+    stats['mad'] = np.ma.masked_all(ncell)
+    stats['mad'][cells] = mad
+
+    #take the mean of the data points within mad_threshold scaled MADs of the median:
+    keep = dev <= mad_threshold*np.repeat(mad, count)
+    N_robust = np.bincount(ind_s[keep], minlength=ncell).astype(float)
+    sum_robust = np.bincount(ind_s[keep], weights=data_s[keep], minlength=ncell)
+    stats['N_robust'] = np.ma.masked_where(N_robust == 0, N_robust)
+    stats['mean_robust'] = np.ma.masked_where(N_robust == 0, sum_robust)/stats['N_robust']
+
+    #count the data points in each grid cell:
+    N = np.bincount(ind_s, minlength=ncell).astype(float)
+    stats['N'] = np.ma.masked_where(N == 0, N)
+
+    #reshape the statistics onto the grid:
+    for key in stats.keys():
+        stats[key] = stats[key].reshape(stats[key].shape[:-1] + (nlat,nlon))
+
+    return stats
@@ -1,8 +1,8 @@
-def bin_data(data, lon, lat, dim, orientation):
+def bin_data(data, lon, lat, dim, orientation, task='vectorized'):
     
     #documentation: 
     """ 
-    bin_data(data, lon, lat, dim, orientation)
+    bin_data(data, lon, lat, dim, orientation, task)
     
         Function to bin alongtrack satellite data onto a specified grid
         
@@ -16,10 +16,17 @@ def bin_data(data, lon, lat, dim, orientation):
               e.g. dim = [360, 133]
         orientation : orientation of binned data in a list with three elements in the list (orientation = ['Pacific' or 'Atlantic', [lon_min lon_max] [lat_min, lat_max]])
               e.g. orientation = ['Pacific', [-179 179] [-66, 66]]
+              With task = 'vectorized', orientation = ['regular_grid', regular_grid, [lat_min, lat_max]] bins onto the nearest node of a regular grid (see bin_index)
+        task : specifies how the data is placed on the grid. Options include: 
+              task = 'vectorized' => cell indices are computed for the whole track at once and the sums and counts are accumulated with np.bincount (default)
+              task = 'loop' => each data point is placed on the grid one at a time (original method, kept for reference and benchmarking)
+              Both options round longitude and latitude towards zero and follow the same 'Atlantic'/'Pacific' index conventions. The vectorized option 
+              skips masked or NaN data points, whereas in the loop option a masked data point masks the whole grid cell.
         
         Returns
         -------
-        data_bin : 2D numpy array of binned data on specified grid
+        data_bin : 2D numpy masked array of binned data on specified grid
+        N : 2D numpy masked array of the number of data points averaged in each grid cell (masked where no data was binned)
         
         Libraries necessary to run function
         -----------------------------------
@@ -31,78 +38,92 @@ def bin_data(data, lon, lat, dim, orientation):
     
     #define dimensional variables:
     nlon,nlat = dim
-    lon_min = orientation[1][0]
-    lon_max = orientation[1][1]
-    lat_min = orientation[2][0]
-    lat_max = orientation[2][1]
     
-    #initialize variables: 
-    data_m = np.ma.zeros((nlat,nlon))
-    data_nc = np.ma.zeros((nlat,nlon))
-    #data_m_sum = np.zeros((nlat,nlon))
-    #data_nc_sum = np.zeros((nlat,nlon))
-
-    #create a loop to got through each data point and bin the data onto a grid  
-    for idata in range(0,len(data),1):
-
-        #call data from data array and set lon and lat to integers (incase they are floats): 
-        data_point = data[idata]
-        lon_point = lon[idata]
-        lat_point = lat[idata]
+    #case 1: vectorized binning 
+    if task == 'vectorized':
         
-        #round longitude and latitude grid point in order that the boundary points of longitude and latitude do not exceed the size of the zero matrices: 
+        #compute the cell index of each data point once and bin the data: 
+        ind = bin_index(lon = lon, lat = lat, dim = dim, orientation = orientation)
+        data_bin, N = bin_fields(data = {'data': data}, ind = ind, dim = dim)
         
-        #Method 1: round values outside of the range towards zero (increases the amount of data one binns if range of data is specified)
-        if orientation[0] == 'Atlantic':
-            #For longitude: 
-            if abs(lon_point) < lon_max:
-                #round regularly
-                lon_point_int = int(lon_point)
-            else:
-                #round towards zero:
-                lon_point_int = int(np.fix(lon_point))
-        elif orientation == 'Pacific':
-            #For longitude: 
-            if lon_point < lon_max and lon_point > lon_min:
-                #round regularly
-                lon_point_int = int(lon_point)
-            else: 
-                #round towards zero:
-                lon_point_int = int(np.fix(lon_point))  
-        #For latitude: 
-        if abs(lat_point) < lat_max:
-            #round regularly
-            lat_point_int = int(lat_point)
-        else:
-            #round towards zero:
-            lat_point_int = int(np.fix(lat_point))
+        return data_bin['data'], N
+    
+    #case 2: loop through each data point
+    elif task == 'loop':
         
-        #method 2: simply just round: 
-        #lon_point_int = int(round(lon_point))
-        #lat_point_int = int(round(lat_point))
+        #define the limits of the grid: 
+        lon_min = orientation[1][0]
+        lon_max = orientation[1][1]
+        lat_min = orientation[2][0]
+        lat_max = orientation[2][1]
+    
+        #initialize variables: 
+        data_m = np.ma.zeros((nlat,nlon))
+        data_nc = np.ma.zeros((nlat,nlon))
+        #data_m_sum = np.zeros((nlat,nlon))
+        #data_nc_sum = np.zeros((nlat,nlon))
+
+        #create a loop to got through each data point and bin the data onto a grid  
+        for idata in range(0,len(data),1):
+
+            #call data from data array and set lon and lat to integers (incase they are floats): 
+            data_point = data[idata]
+            lon_point = lon[idata]
+            lat_point = lat[idata]
             
-        #create a conditional statement in order to only bin data that are recorded at lat_max degrees north or south or between: 
-        if abs(lat_point_int) <= lat_max and lon_point_int >= lon_min:
+            #round longitude and latitude grid point in order that the boundary points of longitude and latitude do not exceed the size of the zero matrices: 
             
+            #Method 1: round values outside of the range towards zero (increases the amount of data one binns if range of data is specified)
             if orientation[0] == 'Atlantic':
-
                 #For longitude: 
-                lon_point_i = lon_point_int + lon_max 
-                #For latitude:
-                lat_point_i = lat_point_int + lat_max 
+                if abs(lon_point) < lon_max:
+                    #round regularly
+                    lon_point_int = int(lon_point)
+                else:
+                    #round towards zero:
+                    lon_point_int = int(np.fix(lon_point))
+            elif orientation[0] == 'Pacific':
+                #For longitude: 
+                if lon_point < lon_max and lon_point > lon_min:
+                    #round regularly
+                    lon_point_int = int(lon_point)
+                else: 
+                    #round towards zero:
+                    lon_point_int = int(np.fix(lon_point))  
+            #For latitude: 
+            if abs(lat_point) < lat_max:
+                #round regularly
+                lat_point_int = int(lat_point)
+            else:
+                #round towards zero:
+                lat_point_int = int(np.fix(lat_point))
+            
+            #method 2: simply just round: 
+            #lon_point_int = int(round(lon_point))
+            #lat_point_int = int(round(lat_point))
+                
+            #create a conditional statement in order to only bin data that are recorded at lat_max degrees north or south or between: 
+            if abs(lat_point_int) <= lat_max and lon_point_int >= lon_min:
+                
+                if orientation[0] == 'Atlantic':
 
-            elif orientation[0] == 'Pacific': 
+                    #For longitude: 
+                    lon_point_i = lon_point_int + lon_max 
+                    #For latitude:
+                    lat_point_i = lat_point_int + lat_max 
 
-                #For longitude: 
-                lon_point_i = lon_point_int
-                #For latitude:
-                lat_point_i = lat_point_int + lat_max
+                elif orientation[0] == 'Pacific': 
+
+                    #For longitude: 
+                    lon_point_i = lon_point_int
+                    #For latitude:
+                    lat_point_i = lat_point_int + lat_max
 
-            #place the swh and wind speed data onto the summation grid:
-            data_m[lat_point_i,lon_point_i] += data_point
+                #place the swh and wind speed data onto the summation grid:
+                data_m[lat_point_i,lon_point_i] += data_point
 
-            #sum counter matrix: 
-            data_nc[lat_point_i,lon_point_i] += 1
+                #sum counter matrix: 
+                data_nc[lat_point_i,lon_point_i] += 1
     
     #find the point where the data is not masked (note that np.ma.masked_where is looking 
     #at the boolean array of masked versus non-masked points; by finding where false point 
@@ -115,3 +136,169 @@ def bin_data(data, lon, lat, dim, orientation):
             
     return data_bin, N
     
+def bin_index(lon, lat, dim, orientation):
+    
+    """
+    bin_index(lon, lat, dim, orientation)
+    
+        Function to compute the flat grid cell index (lat_index*nlon + lon_index) of every along track data point using the same rounding and 
+        'Atlantic'/'Pacific' conventions as bin_data. The index can be computed once and shared by every variable measured along the track. 
+        
+        Parameters 
+        ----------
+        lon : numpy array column vector of along track longitude data 
+        lat : numpy array column vector of along track latitude data 
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+              e.g. dim = [360, 133]
+        orientation : orientation of binned data in a list with three elements in the list (orientation = ['Pacific' or 'Atlantic', [lon_min lon_max] [lat_min, lat_max]])
+              e.g. orientation = ['Atlantic', [-180, 179], [-66, 66]]
+              For a nearest node regular grid of any resolution, use orientation = ['regular_grid', regular_grid, [lat_min, lat_max]] (see grid_index) 
+              e.g. orientation = ['regular_grid', 0.25, [-90, 90]]
+        
+        Returns
+        -------
+        ind : numpy integer array of flat cell indices with the same length as lon. Data points that fall outside the grid or that have a masked or 
+              non-finite location are set to -1 
+        
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        grid index : from grid_index import grid_index
+    """
+    
+    #import libraries: 
+    import numpy as np
+    from grid_index import grid_index
+    
+    #case 1: nearest node of a regular grid
+    if orientation[0] == 'regular_grid':
+        return grid_index(lon = lon, lat = lat, regular_grid = orientation[1], lat_range = orientation[2])
+    
+    #define dimensional variables:
+    nlon,nlat = dim
+    lon_min = orientation[1][0]
+    lon_max = orientation[1][1]
+    lat_min = orientation[2][0]
+    lat_max = orientation[2][1]
+    
+    #call longitude and latitude as flat float arrays and find the points with a valid location: 
+    lon_v = np.ma.getdata(lon).astype(float).ravel()
+    lat_v = np.ma.getdata(lat).astype(float).ravel()
+    valid = ~(np.ma.getmaskarray(lon).ravel() | np.ma.getmaskarray(lat).ravel()) & np.isfinite(lon_v) & np.isfinite(lat_v)
+    lon_v = np.where(valid, lon_v, 0)
+    lat_v = np.where(valid, lat_v, 0)
+    
+    #round longitude and latitude towards zero (int() and np.fix both truncate towards zero): 
+    lon_int = np.fix(lon_v).astype(int)
+    lat_int = np.fix(lat_v).astype(int)
+    
+    #only bin data that are recorded at lat_max degrees north or south or between: 
+    keep = valid & (np.abs(lat_int) <= lat_max) & (lon_int >= lon_min)
+    
+    #set the longitude and latitude indices for the orientation of the grid:
+    if orientation[0] == 'Atlantic':
+        lon_i = lon_int + lon_max
+    elif orientation[0] == 'Pacific':
+        lon_i = lon_int
+    lat_i = lat_int + lat_max
+    
+    #negative indices wrap around the end of the grid as they do when indexing the grid one point at a time: 
+    lon_i = np.where(lon_i < 0, lon_i + nlon, lon_i)
+    lat_i = np.where(lat_i < 0, lat_i + nlat, lat_i)
+    keep = keep & (lon_i >= 0) & (lon_i < nlon) & (lat_i >= 0) & (lat_i < nlat)
+    
+    #compute the flat cell index of each data point: 
+    ind = np.where(keep, lat_i*nlon + lon_i, -1)
+    
+    return ind
+
+def bin_fields(data, ind, dim):
+    
+    """
+    bin_fields(data, ind, dim)
+    
+        Function to bin several along track variables that share the same longitude and latitude onto a grid in one pass using precomputed flat 
+        cell indices (from bin_index or grid_index). A data point is binned only where all variables are valid, so that every field is averaged 
+        over the same samples and one count grid is shared by all fields. 
+        
+        Parameters 
+        ----------
+        data : dictionary of numpy arrays (or masked arrays) of along track data with the same length as ind
+              e.g. data = {'swh': swh, 'swhcor': swhcor, 'wspcor': wspcor}
+        ind : numpy integer array of flat cell indices (lat_index*nlon + lon_index) where -1 marks data points outside of the grid
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+              e.g. dim = [360, 133]
+        
+        Returns
+        -------
+        data_bin : dictionary of 2D numpy masked arrays of binned data for each variable in data 
+        N : 2D numpy masked array of the number of data points averaged in each grid cell (masked where no data was binned)
+        
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+    
+    #import libraries: 
+    import numpy as np
+    
+    #define dimensional variables:
+    nlon,nlat = dim
+    ncell = nlat*nlon
+    
+    #find the data points that are on the grid and are valid for every variable: 
+    ind = np.asarray(ind).ravel()
+    valid = ind >= 0
+    for var in data.keys():
+        valid = valid & ~np.ma.getmaskarray(data[var]).ravel() & np.isfinite(np.ma.getdata(data[var]).astype(float).ravel())
+    ind_v = ind[valid]
+    
+    #count the data points that fall in each grid cell (shared by all variables): 
+    data_nc = np.bincount(ind_v, minlength=ncell).reshape((nlat,nlon)).astype(float)
+    N = np.ma.masked_where(data_nc == 0, data_nc)
+    
+    #sum each variable in each grid cell and take the average: 
+    data_bin = {}
+    for var in data.keys():
+        data_v = np.ma.getdata(data[var]).astype(float).ravel()[valid]
+        data_m = np.bincount(ind_v, weights=data_v, minlength=ncell).reshape((nlat,nlon))
+        data_bin[var] = np.ma.masked_where(data_nc == 0, data_m)/N
+    
+    return data_bin, N
+
+def bin_data_multi(data, lon, lat, dim, orientation):
+    
+    """
+    bin_data_multi(data, lon, lat, dim, orientation)
+    
+        Function to bin several along track variables (e.g. swh, swhcor, and wind_speed_cor) that share one longitude and latitude array onto a 
+        specified grid in a single pass. The cell index of each data point is computed once instead of once per variable. 
+        
+        Parameters 
+        ----------
+        data : dictionary of numpy arrays of along track data 
+              e.g. data = {'swh': swh_i, 'wsp': wsp_i}
+        lon : numpy array column vector of along track longitude data 
+        lat : numpy array column vector of along track latitude data 
+        dim : dimesnions of the grid that data will be placed on in the form of a list (dim = [lon, lat])
+              e.g. dim = [360, 133]
+        orientation : orientation of binned data in a list with three elements in the list (orientation = ['Pacific' or 'Atlantic', [lon_min lon_max] [lat_min, lat_max]])
+              e.g. orientation = ['Atlantic', [-180, 179], [-66, 66]]
+        
+        Returns
+        -------
+        data_bin : dictionary of 2D numpy masked arrays of binned data for each variable in data 
+        N : 2D numpy masked array of the number of data points averaged in each grid cell shared by all variables
+        
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+    
+    #compute the cell index of each data point once: 
+    ind = bin_index(lon = lon, lat = lat, dim = dim, orientation = orientation)
+    
+    #bin all variables onto the grid: 
+    data_bin, N = bin_fields(data = data, ind = ind, dim = dim)
+    
+    return data_bin, N
@@ -0,0 +1,241 @@
+def grouping_labels(date_time, grouping):
+
+    """
+    grouping_labels(date_time, grouping)
+
+        Function to label each time step with the integer group of a grouping of the record (e.g. calendar month or season), so that every
+        statistic of every group can be computed from the labels in one pass over the data (see climatology_groups). Time steps that are not in
+        any group get the label -1.
+
+        Parameters
+        ----------
+        date_time : time index of the data set (see time_index) or numpy array of datetime values of the time series
+        grouping : grouping of the time steps. Options include:
+               grouping = 'monthly' => 12 calendar months
+               grouping = 'seasonal' => 4 standard seasons DJF, MAM, JJA, SON
+               grouping = 'pentad' => 73 five day periods of the year (the last pentad of a leap year has 6 days)
+               grouping = 'annual' => each year of the record
+               grouping = 'monthly_series' => each month of each year of the record
+               grouping = {'name': [months], ...} => custom sets of months that do not overlap
+                          e.g. grouping = {'NDJFM': [11,12,1,2,3], 'MJJAS': [5,6,7,8,9]}
+               grouping = [(t0, t1), ...] => time windows of specific years from t0 (included) to t1 (excluded) that do not overlap
+                          e.g. grouping = [(datetime.datetime(1997,6,1), datetime.datetime(1998,6,1))]
+
+        Returns
+        -------
+        labels : numpy integer array of the group (0 to ngroup - 1, or -1) of each time step
+        names : list of the names of the groups
+               e.g. names = [1, 2, ..., 12] or names = ['DJF', 'MAM', 'JJA', 'SON']
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import date2num
+        time index : from time_index import time_field
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import date2num
+    from time_index import time_field
+
+    #case 1: calendar months
+    if grouping == 'monthly':
+        labels = time_field(date_time = date_time, field = 'month') - 1
+        names = list(range(1, 13))
+
+    #case 2: standard seasons
+    elif grouping == 'seasonal':
+        labels = time_field(date_time = date_time, field = 'season')
+        names = ['DJF', 'MAM', 'JJA', 'SON']
+
+    #case 3: pentads of the year
+    elif grouping == 'pentad':
+        labels = np.minimum((time_field(date_time = date_time, field = 'doy') - 1)//5, 72)
+        names = list(range(1, 74))
+
+    #case 4: years and months of the record
+    elif grouping in ['annual', 'monthly_series']:
+        codes = time_field(date_time = date_time, field = 'year' if grouping == 'annual' else 'month_code')
+        labels = codes - codes.min()
+        names = [int(c) for c in codes.min() + np.arange(codes.max() - codes.min() + 1)]
+        if grouping == 'monthly_series':
+            names = [(c//12, c%12 + 1) for c in names]
+
+    #case 5: custom sets of months
+    elif isinstance(grouping, dict):
+        months = time_field(date_time = date_time, field = 'month')
+        lookup = np.full(13, -1)
+        names = list(grouping.keys())
+        for i, name in enumerate(names):
+            if np.any(lookup[grouping[name]] >= 0):
+                raise ValueError('the sets of months of a grouping should not overlap')
+            lookup[grouping[name]] = i
+        labels = lookup[months]
+
+    #case 6: time windows
+    else:
+        if isinstance(date_time, dict):
+            time = date_time['time_num']
+            windows = [(date2num(t0, date_time['units'], date_time['calendar']), date2num(t1, date_time['units'], date_time['calendar'])) for t0, t1 in grouping]
+        else:
+            time = date_time
+            windows = grouping
+        labels = np.full(len(time), -1)
+        for i, (t0, t1) in enumerate(windows):
+            ind = (time >= t0) & (time < t1)
+            if np.any(labels[ind] >= 0):
+                raise ValueError('the time windows of a grouping should not overlap')
+            labels[ind] = i
+        names = list(grouping)
+
+    return np.asarray(labels), names
+
+def climatology_groups(chunks, date_time, groupings, percentiles=None, edges=None):
+
+    """
+    climatology_groups(chunks, date_time, groupings, percentiles, edges)
+
+        Function to compute the mean, variance, skewness, kurtosis, number of observations, and optionally percentiles of every group of several
+        groupings of the time steps (e.g. monthly, seasonal, and pentad climatologies) at each grid point in a single pass over the data. Each
+        chunk of data is read once and added to a moment accumulator (see streaming_moments) and a quantile sketch (see quantile_sketch) of every
+        grouping, so adding a grouping costs one more accumulation of the chunk in memory and no other pass over the record.
+
+        Parameters
+        ----------
+        chunks : iterable of (it, data_c) pairs of the index of the first time step of a chunk in the record and the numpy (masked) array
+                 (time, lat, lon) of the chunk
+               e.g. chunks = ((it, data[it:it+365]) for it in range(0, data.shape[0], 365))
+        date_time : time index of the record (see time_index) or numpy array of datetime values of the time series
+        groupings : dictionary of the groupings (see grouping_labels) by name
+               e.g. groupings = {'monthly': 'monthly', 'seasonal': 'seasonal', 'winter': {'NDJFM': [11,12,1,2,3]}}
+        percentiles : list of percentiles between 0 and 100, or None (default) to skip the quantile sketches
+               e.g. percentiles = [50]
+        edges : numpy array of the edges of the histogram bins of the quantile sketches (see quantile_sketch_init). Only used with percentiles
+               e.g. edges = np.arange(0, 15.05, 0.05)
+
+        Returns
+        -------
+        clima : dictionary by grouping name of dictionaries with the keys:
+            a) 'groups' : list of the names of the groups
+            b) 'mean', 'var', 'skew', 'kurt', 'N' : numpy masked arrays (group, lat, lon) (see finalize_moments)
+            c) 'percentiles' : numpy masked array (percentile, group, lat, lon) of the percentiles (only with percentiles)
+            d) 'error' : bound of the error of the percentiles inside the edges (only with percentiles)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        streaming moments : from streaming_moments import moments_accumulate, merge_moments, finalize_moments
+        quantile sketch : from quantile_sketch import quantile_sketch_init, quantile_sketch_update, sketch_quantiles
+    """
+
+    #import libraries:
+    import numpy as np
+    from streaming_moments import moments_accumulate, merge_moments, finalize_moments
+    from quantile_sketch import quantile_sketch_init, quantile_sketch_update, sketch_quantiles
+
+    #label the time steps of each grouping once:
+    labels, names = {}, {}
+    for key in groupings.keys():
+        labels[key], names[key] = grouping_labels(date_time = date_time, grouping = groupings[key])
+
+    #add each chunk to the accumulators of every grouping:
+    accs, sketches = {}, {}
+    for it, data_c in chunks:
+        for key in groupings.keys():
+
+            #keep the time steps of the chunk that are in a group of the grouping:
+            labels_c = labels[key][it:it+data_c.shape[0]]
+            keep = labels_c >= 0
+            if not np.any(keep):
+                continue
+            if not np.all(keep):
+                data_k, labels_k = data_c[keep], labels_c[keep]
+            else:
+                data_k, labels_k = data_c, labels_c
+
+            #accumulate the moments and merge them into the accumulator of the grouping:
+            acc_c = moments_accumulate(data = data_k, labels = labels_k, ngroup = len(names[key]))
+            accs[key] = acc_c if key not in accs else merge_moments(accs = [accs[key], acc_c])
+
+            #add the chunk to the quantile sketch of the grouping:
+            if percentiles is not None:
+                if key not in sketches:
+                    sketches[key] = quantile_sketch_init(edges = edges, ngroup = len(names[key]), shape = data_c.shape[1:])
+                quantile_sketch_update(sketch = sketches[key], data = data_k, labels = labels_k)
+
+    #compute the statistics of each grouping:
+    clima = {}
+    for key in accs.keys():
+        clima[key] = finalize_moments(acc = accs[key])
+        clima[key]['groups'] = names[key]
+        if percentiles is not None:
+            clima[key]['percentiles'] = sketch_quantiles(sketch = sketches[key], percentiles = percentiles)
+            clima[key]['error'] = float(np.max(np.diff(sketches[key]['edges'])))
+
+    return clima
+
+def climatology_stream(filenames, variable, groupings, chunk, percentiles=None, edges=None):
+
+    """
+    climatology_stream(filenames, variable, groupings, chunk, percentiles, edges)
+
+        Function to compute the climatologies of several groupings of a daily binned variable in one pass over one or several netCDF files (see
+        climatology_groups). The files are read chunk by chunk and the time steps are grouped with the cached time index of each file (see
+        time_index).
+
+        Parameters
+        ----------
+        filenames : netCDF file or list of netCDF files sorted in time (e.g. yearly files) with the same time units and calendar
+               e.g. filenames = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        variable : name of the variable
+               e.g. variable = 'hs'
+        groupings : dictionary of the groupings (see grouping_labels) by name
+               e.g. groupings = {'monthly': 'monthly', 'seasonal': 'seasonal', 'pentad': 'pentad'}
+        chunk : number of time steps read at a time
+               e.g. chunk = 365
+        percentiles, edges : percentiles and edges of the quantile sketches (see climatology_groups)
+
+        Returns
+        -------
+        clima : dictionary of the statistics of each grouping (see climatology_groups)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+        time index : from time_index import time_index
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset
+    from time_index import time_index
+
+    if isinstance(filenames, str):
+        filenames = [filenames]
+
+    #join the time indices of the files into the time index of the record:
+    indices = [time_index(filename = f) for f in filenames]
+    for ix in indices[1:]:
+        if ix['units'] != indices[0]['units'] or ix['calendar'] != indices[0]['calendar']:
+            raise ValueError('the files should have the same time units and calendar')
+    index = dict(indices[0])
+    for key in indices[0].keys():
+        if isinstance(indices[0][key], np.ndarray):
+            index[key] = np.concatenate([ix[key] for ix in indices])
+
+    #read the chunks of the files in order:
+    def chunks():
+        start = 0
+        for f in filenames:
+            nc = Dataset(f, 'r')
+            var = nc.variables[variable]
+            for it in range(0, var.shape[0], chunk):
+                yield start + it, var[it:it+chunk]
+            start = start + var.shape[0]
+            nc.close()
+
+    clima = climatology_groups(chunks = chunks(), date_time = index, groupings = groupings, percentiles = percentiles, edges = edges)
+
+    return clima
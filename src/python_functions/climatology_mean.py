@@ -9,7 +9,8 @@ def clima_mean(date_time, data, fill_val):
         ----------
         data : numpy masked array row vector of temporal data at a single latitude or longitude grid point or a numpy 3D array whaere the climatology is calculated at each grid point 
                e.g. print(data.shape) => (8766,) or print(data.shape) => (8766,133, 360)
-        date_time : numpy 2D array of date_time values which correspond to the time series of the data set
+        date_time : numpy 2D array of date_time values which correspond to the time series of the data set, or the time index of the data set
+               (see time_index), which avoids decoding the months of every time step from datetime values
         fill_val : determines what fill value is present in your data set. Options include:
                fill_val = 'NaN' or fill_val = 'mask'
                
@@ -20,13 +21,15 @@ def clima_mean(date_time, data, fill_val):
         Libraries necessary to run function
         ---------------------------
         Numpy: import numpy as np
+        time index: from time_index import time_field
     """
     
     #import library
     import numpy as np 
+    from time_index import time_field
     
     #set year and month 2D time arrays that correspond to the year and month at which swh data point was collected (time series indice array for year and month)
-    months = np.array([m.month for m in date_time])
+    months = time_field(date_time = date_time, field = 'month')
 
     #initialize the dictionary that will hold all the resulting monthly mean, std, median, and nobs data
     monthly_data = {}
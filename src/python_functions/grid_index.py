@@ -0,0 +1,64 @@
+def grid_index(lon, lat, regular_grid, lat_range):
+
+    """
+    grid_index(lon, lat, regular_grid, lat_range)
+
+        Function to map along track longitude and latitude arrays onto the flat cell index (lat_index*nlon + lon_index) of the nearest node of a
+        regular grid. The index is computed arithmetically so the cost per data point is constant instead of a search over all grid nodes, and
+        any resolution can be used. The grid nodes are
+
+            grid_lon = np.arange(0, 360, regular_grid)
+            grid_lat = np.arange(lat_range[0], lat_range[1], regular_grid)
+
+        such that nlon = 360/regular_grid and nlat = (lat_range[1] - lat_range[0])/regular_grid. The nearest node is the same one found by
+        np.abs(grid - x).argmin() (ties go to the lower node), except that longitude wraps around 0-360 degrees (e.g. 359.7 degrees east
+        falls into the 0 degree cell on a 1 degree grid).
+
+        Parameters
+        ----------
+        lon : numpy array column vector of along track longitude data (either -180 to 180 or 0 to 360 degrees east)
+        lat : numpy array column vector of along track latitude data
+        regular_grid : size of grid boxes or resolution in degrees
+               e.g. regular_grid = 0.25, 0.5, 1., or 2.
+        lat_range : list of the southern and northern latitude limits of the grid. Data points outside of the limits are not binned
+               e.g. lat_range = [-90, 90] or lat_range = [-66, 67]
+
+        Returns
+        -------
+        ind : numpy integer array of flat cell indices with the same length as lon. Data points that fall outside the latitude limits or that have
+              a masked or non-finite location are set to -1
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #set dimensions of the grid:
+    lat_min, lat_max = lat_range
+    nlon = int(round(360./regular_grid))
+    nlat = int(round((lat_max - lat_min)/regular_grid))
+
+    #call longitude and latitude as flat float arrays and find the points with a valid location:
+    lon_v = np.ma.getdata(lon).astype(float).ravel()
+    lat_v = np.ma.getdata(lat).astype(float).ravel()
+    valid = ~(np.ma.getmaskarray(lon).ravel() | np.ma.getmaskarray(lat).ravel()) & np.isfinite(lon_v) & np.isfinite(lat_v)
+    lon_v = np.where(valid, lon_v, 0)
+    lat_v = np.where(valid, lat_v, lat_min)
+
+    #only keep data points between the latitude limits:
+    valid = valid & (lat_v >= lat_min) & (lat_v <= lat_max)
+
+    #find the nearest latitude node (ceil(x - 0.5) rounds ties down like argmin) and keep the points near the limits in the edge cells:
+    ilat = np.ceil((lat_v - lat_min)/regular_grid - 0.5).astype(int)
+    ilat = np.clip(ilat, 0, nlat - 1)
+
+    #wrap longitude onto 0 to 360 degrees and find the nearest longitude node:
+    ilon = np.ceil(np.mod(lon_v, 360.)/regular_grid - 0.5).astype(int) % nlon
+
+    #compute the flat cell index of each data point:
+    ind = np.where(valid, ilat*nlon + ilon, -1)
+
+    return ind
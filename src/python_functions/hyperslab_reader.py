@@ -0,0 +1,122 @@
+def lat_band(lat, lat_range):
+
+    """
+    lat_band(lat, lat_range)
+
+        Function to find the latitude rows of a grid within a latitude range as a slice, so that only these rows are read from a netCDF file
+
+        Parameters
+        ----------
+        lat : numpy array column vector of increasing latitude coordinates of the file
+        lat_range : list of the southern and northern latitude limits that are kept (the limits are included)
+               e.g. lat_range = [-66, 66]
+
+        Returns
+        -------
+        ilat : slice of the latitude rows within lat_range
+               e.g. lat[ilat]
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #find the first and last rows within the range:
+    inside = np.flatnonzero((lat >= lat_range[0]) & (lat <= lat_range[1]))
+    ilat = slice(int(inside[0]), int(inside[-1]) + 1)
+
+    return ilat
+
+def hyperslab_chunks(filenames, variables, lat_range, chunk):
+
+    """
+    hyperslab_chunks(filenames, variables, lat_range, chunk)
+
+        Generator that reads gridded (time, lat, lon) variables from a list of netCDF files in chunks of time steps and only within a latitude
+        band. Each chunk is read as a netCDF hyperslab (nc.variables[var][it:it+chunk, ilat, :]), so the rows outside of the band (e.g. the polar
+        rows beyond 66 degrees) are never read and at most one chunk of each variable is held in memory.
+
+        Parameters
+        ----------
+        filenames : list of netCDF files sorted in time with the dimensions (time, latitude, longitude)
+               e.g. filenames = sorted(glob.glob('/zdata/downloads/ww3_CFSR/Hs/*.nc'))
+        variables : list of the names of the variables that are read
+               e.g. variables = ['uwnd', 'vwnd']
+        lat_range : list of the southern and northern latitude limits that are read
+               e.g. lat_range = [-66, 66]
+        chunk : number of time steps read at a time (a multiple of the time steps per day keeps days inside one chunk)
+               e.g. chunk = 8*8 (8 days of 3 hourly WW3 fields) or chunk = 4 (one day of a daily CCMP file)
+
+        Yields
+        -------
+        time_c : numpy array of the datetimes of the time steps of the chunk
+        data_c : dictionary of 3D numpy masked arrays (time, lat, lon) of each variable in the chunk
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset, num2date
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset, num2date
+
+    #call each file in order:
+    for f in filenames:
+
+        #find the latitude band of the file:
+        nc = Dataset(f, 'r')
+        ilat = lat_band(lat = nc.variables['latitude'][:], lat_range = lat_range)
+        nt = len(nc.variables['time'])
+
+        #read the time steps of the file one chunk at a time:
+        for it in range(0, nt, chunk):
+            time_c = num2date(nc.variables['time'][it:it+chunk], nc.variables['time'].units)
+            data_c = {}
+            for var in variables:
+                data_c[var] = nc.variables[var][it:it+chunk,ilat,:]
+            yield time_c, data_c
+
+        nc.close()
+
+def hyperslab_stream(filenames, variables, lat_range, chunk, nprefetch):
+
+    """
+    hyperslab_stream(filenames, variables, lat_range, chunk, nprefetch)
+
+        Generator that yields the chunks of hyperslab_chunks read ahead by a background process through a bounded queue (see prefetch), so that
+        the next chunks are read while the current chunk is processed and memory stays flat at about nprefetch + 1 chunks
+
+        Parameters
+        ----------
+        filenames, variables, lat_range, chunk : see hyperslab_chunks
+        nprefetch : maximum number of chunks read ahead. If nprefetch = 0, the chunks are read in the current process
+               e.g. nprefetch = 2
+
+        Yields
+        -------
+        time_c : numpy array of the datetimes of the time steps of the chunk
+        data_c : dictionary of 3D numpy masked arrays (time, lat, lon) of each variable in the chunk
+
+        Libraries necessary to run function
+        -----------------------------------
+        prefetch : from prefetch_queue import prefetch
+    """
+
+    #import libraries:
+    from prefetch_queue import prefetch
+
+    #set the arguments of the reader:
+    kwargs = {'filenames': filenames, 'variables': variables, 'lat_range': lat_range, 'chunk': chunk}
+
+    #case 1: read in the current process
+    if nprefetch == 0:
+        for item in hyperslab_chunks(**kwargs):
+            yield item
+
+    #case 2: read ahead in a background process
+    else:
+        for item in prefetch(func = hyperslab_chunks, kwargs = kwargs, nprefetch = nprefetch):
+            yield item
@@ -0,0 +1,222 @@
+#in memory cache of kernel weight matrices by pass and grid, in order of use with the least recently used matrix first (see kernel_matrix_cached):
+kernel_cache = {}
+
+def kernel_weight_matrix(lon, lat, regular_grid, lat_range, kernel, radius):
+
+    """
+    kernel_weight_matrix(lon, lat, regular_grid, lat_range, kernel, radius)
+
+        Function to build the sparse matrix of kernel weights that spreads each along track data point onto the neighbouring nodes of a regular
+        grid (the same grid as grid_index). Row i of the matrix holds the weights of every data point on grid node i, so a whole day of data is
+        gridded with one sparse matrix-vector product (see kernel_grid).
+
+        Parameters
+        ----------
+        lon : numpy array column vector of along track longitude data (either -180 to 180 or 0 to 360 degrees east)
+        lat : numpy array column vector of along track latitude data (data points with a masked or NaN longitude or latitude get no weights)
+        regular_grid : size of grid boxes or resolution in degrees. The grid nodes are grid_lon = np.arange(0, 360, regular_grid) and
+               grid_lat = np.arange(lat_range[0], lat_range[1], regular_grid)
+               e.g. regular_grid = 1.
+        lat_range : list of the southern and northern latitude limits of the grid
+               e.g. lat_range = [-66, 67]
+        kernel : weighting kernel as a function of the great circle distance d between a data point and a grid node. Options include:
+               kernel = 'gaussian' => w = exp(-d**2/(2*(radius/2)**2)) for d <= radius
+               kernel = 'inverse_distance' => w = 1/max(d, 1 km)**2 for d <= radius
+        radius : radius of influence of a data point in km (weights are zero beyond the radius)
+               e.g. radius = 100
+
+        Returns
+        -------
+        W : scipy sparse csr matrix of weights with shape (nlat*nlon, number of data points)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        Scipy : from scipy import sparse
+    """
+
+    #import libraries:
+    import numpy as np
+    from scipy import sparse
+
+    #set dimensions of the grid and the radius of the earth:
+    lat_min, lat_max = lat_range
+    nlon = int(round(360./regular_grid))
+    nlat = int(round((lat_max - lat_min)/regular_grid))
+    R = 6371.
+
+    #call longitude and latitude as flat float arrays and keep the data points with a valid (unmasked and finite) location:
+    lon_v = np.mod(np.ma.getdata(lon).astype(float).ravel(), 360.)
+    lat_v = np.ma.getdata(lat).astype(float).ravel()
+    nobs = len(lon_v)
+    valid = ~np.ma.getmaskarray(lon).ravel() & ~np.ma.getmaskarray(lat).ravel() & np.isfinite(lon_v) & np.isfinite(lat_v)
+    obs = np.nonzero(valid)[0]
+
+    #find the nearest node of each data point:
+    ilat0 = np.ceil((lat_v[obs] - lat_min)/regular_grid - 0.5).astype(int)
+    ilon0 = np.ceil(lon_v[obs]/regular_grid - 0.5).astype(int)
+
+    #set the number of neighbouring nodes that can be within the radius of each data point (longitude nodes get closer towards the poles, so
+    #the number of longitude nodes is set by the most poleward latitude within the radius of the data point, and every longitude node can be
+    #within the radius when the radius reaches over the pole):
+    klat = int(np.ceil(radius/(R*np.radians(regular_grid))))
+    lat_far = np.abs(lat_v[obs]) + klat*regular_grid
+    polar = lat_far >= 90.
+    coslat = np.cos(np.radians(np.where(polar, 0., lat_far)))
+    klon = np.where(polar, nlon//2, np.minimum(np.ceil(radius/(R*np.radians(regular_grid)*coslat)), nlon//2)).astype(int)
+
+    #build the (data point, neighbouring node) pairs of the data points with the same number of longitude nodes at once (the longitude offsets
+    #are capped at nlon distinct nodes so that no node is counted twice when they go around the globe):
+    rows, cols, vals = [], [], []
+    for k in np.unique(klon):
+        sub = klon == k
+        dlat, dlon = np.meshgrid(np.arange(-klat, klat+1), np.arange(-k, min(k + 1, nlon - k)), indexing='ij')
+        ilat = ilat0[sub][:,np.newaxis] + dlat.ravel()[np.newaxis,:]
+        ilon = np.mod(ilon0[sub][:,np.newaxis] + dlon.ravel()[np.newaxis,:], nlon)
+        iobs = np.broadcast_to(obs[sub][:,np.newaxis], ilat.shape)
+
+        #compute the great circle distance between each data point and node (haversine formula):
+        phi1 = np.radians(lat_v[iobs[:,:1]])
+        phi2 = np.radians(lat_min + ilat*regular_grid)
+        dlam = np.radians(ilon*regular_grid) - np.radians(lon_v[iobs[:,:1]])
+        a = np.sin((phi2 - phi1)/2)**2 + np.cos(phi1)*np.cos(phi2)*np.sin(dlam/2)**2
+        d = 2*R*np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+        #compute the kernel weights:
+        if kernel == 'gaussian':
+            w = np.exp(-d**2/(2*(radius/2.)**2))
+        elif kernel == 'inverse_distance':
+            w = 1./np.maximum(d, 1.)**2
+
+        #keep the pairs within the radius and on the grid:
+        keep = (d <= radius) & (ilat >= 0) & (ilat < nlat)
+        rows.append((ilat*nlon + ilon)[keep])
+        cols.append(iobs[keep])
+        vals.append(w[keep])
+
+    #build the sparse matrix:
+    if len(rows) == 0:
+        rows, cols, vals = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)], [np.zeros(0)]
+    W = sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(nlat*nlon, nobs))
+
+    return W
+
+def kernel_matrix_cached(lon, lat, regular_grid, lat_range, kernel, radius, pass_id, precision, cache_dir, maxsize=64):
+
+    """
+    kernel_matrix_cached(lon, lat, regular_grid, lat_range, kernel, radius, pass_id, precision, cache_dir, maxsize)
+
+        Function to return the kernel weight matrix of kernel_weight_matrix from a cache when the same pass has been gridded before on the same
+        grid. Exact repeat orbits (e.g. the 10 day repeat cycle of TOPEX and Jason) sample the same locations along a pass every cycle, so the
+        matrix built for a pass in one cycle is reused for the same pass in the following cycles. The matrices are cached by pass and grid, and a
+        cached matrix is only reused when the locations, rounded to precision, are the same as the ones it was built for (otherwise it is rebuilt
+        and replaces the cached one). The in memory cache keeps the maxsize most recently used matrices.
+
+        Parameters
+        ----------
+        lon, lat, regular_grid, lat_range, kernel, radius : see kernel_weight_matrix
+        pass_id : identifier of the pass that repeats from cycle to cycle (e.g. the pass number of the mission)
+               e.g. pass_id = 'j1_pass_017'
+        precision : precision in degrees to which the locations are rounded before they are compared with the cached ones
+               e.g. precision = 0.01 (about 1 km)
+        cache_dir : directory where the matrices are also saved as .npz files so that they can be reused by later programs, or None to only keep
+               them in memory
+               e.g. cache_dir = '/zdata/home/lcolosi/data/kernel_cache/'
+        maxsize : maximum number of matrices kept in memory (default 64, about one cycle of passes of a few days of data)
+
+        Returns
+        -------
+        W : scipy sparse csr matrix of weights with shape (nlat*nlon, number of data points)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        Scipy : from scipy import sparse
+        os : import os
+    """
+
+    #import libraries:
+    import os
+    import numpy as np
+    from scipy import sparse
+
+    #round the locations (masked locations are set to NaN so that they compare equal to each other):
+    lon_r = np.round(np.mod(np.ma.filled(np.ma.asarray(lon, dtype=float), np.nan).ravel(), 360.)/precision)
+    lat_r = np.round(np.ma.filled(np.ma.asarray(lat, dtype=float), np.nan).ravel()/precision)
+
+    #set the cache key from the pass and the gridding parameters:
+    key = (str(pass_id), regular_grid, tuple(lat_range), kernel, radius)
+    same = lambda entry: np.array_equal(entry[0], lon_r, equal_nan=True) and np.array_equal(entry[1], lat_r, equal_nan=True)
+
+    #look up the matrix in memory (moving it to the end of the cache as the most recently used) and then on disk:
+    if key in kernel_cache and same(kernel_cache[key]):
+        kernel_cache[key] = kernel_cache.pop(key)
+        return kernel_cache[key][2]
+    entry = None
+    if cache_dir is not None:
+        filename = os.path.join(cache_dir, 'kernel_matrix_%s_%g_%g_%g_%s_%g.npz' % (pass_id, regular_grid, lat_range[0], lat_range[1], kernel, radius))
+        if os.path.exists(filename):
+            f = np.load(filename)
+            entry = (f['lon_r'], f['lat_r'], sparse.csr_matrix((f['data'], f['indices'], f['indptr']), shape=tuple(f['shape'])))
+            entry = entry if same(entry) else None
+
+    #build the matrix when it is not cached or was built for other locations:
+    if entry is None:
+        W = kernel_weight_matrix(lon = lon, lat = lat, regular_grid = regular_grid, lat_range = lat_range, kernel = kernel, radius = radius)
+        entry = (lon_r, lat_r, W)
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.savez(filename, lon_r=lon_r, lat_r=lat_r, data=W.data, indices=W.indices, indptr=W.indptr, shape=np.array(W.shape))
+
+    #save the matrix in memory and drop the least recently used matrices when the cache is full:
+    kernel_cache.pop(key, None)
+    kernel_cache[key] = entry
+    while len(kernel_cache) > maxsize:
+        del kernel_cache[next(iter(kernel_cache))]
+
+    return entry[2]
+
+def kernel_grid(data, W, dim):
+
+    """
+    kernel_grid(data, W, dim)
+
+        Function to grid along track data with a kernel weight matrix as the weighted mean sum(w*data)/sum(w) at every grid node
+
+        Parameters
+        ----------
+        data : numpy array (or masked array) of along track data. Masked and NaN data points are given zero weight
+        W : scipy sparse matrix of weights from kernel_weight_matrix or kernel_matrix_cached
+        dim : dimesnions of the grid in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+
+        Returns
+        -------
+        data_grid : 2D numpy masked array of the kernel weighted mean (masked where no data point is within the radius)
+        W_sum : 2D numpy masked array of the sum of the weights at each grid node
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #define dimensional variables:
+    nlon,nlat = dim
+
+    #set the weight of masked and NaN data points to zero:
+    data_v = np.ma.getdata(data).astype(float).ravel()
+    valid = (~np.ma.getmaskarray(data).ravel() & np.isfinite(data_v)).astype(float)
+    data_v = np.where(valid > 0, data_v, 0.)
+
+    #compute the weighted sums with sparse matrix-vector products:
+    W_sum = (W @ valid).reshape((nlat,nlon))
+    data_sum = (W @ data_v).reshape((nlat,nlon))
+
+    #take the weighted mean:
+    W_sum = np.ma.masked_where(W_sum == 0, W_sum)
+    data_grid = np.ma.masked_where(W_sum.mask, data_sum)/W_sum
+
+    return data_grid, W_sum
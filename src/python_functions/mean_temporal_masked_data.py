@@ -50,3 +50,57 @@ def mean_mask_t(data):
     data_mean = data_sum/data_nc
 
     return np.ma.masked_invalid(data_mean)
+
+def mean_mask_daily(data, steps_per_day):
+    
+    """
+    mean_mask_daily(data, steps_per_day)
+        
+        Function to average sub-daily geospatial fields (e.g. 3 hourly WW3 or 6 hourly CCMP fields) into daily means in one vectorized reduction. 
+        The time axis is reshaped into (days, steps, lat, lon) and the masked values are ignored in the same way as mean_mask_t. If the number of 
+        time steps does not divide evenly into days, the remaining time steps are averaged into a last (partial) day. 
+        
+        Parameters 
+        ----------
+        data : numpy masked 3D array (time, lat, lon) of float data points 
+               e.g. print(hs.shape) => (248, 317, 720) 
+        steps_per_day : number of time steps in one day 
+               e.g. steps_per_day = 8 (WW3, 3 hourly) or steps_per_day = 4 (CCMP, 6 hourly)
+        
+        Returns
+        -------
+        data_mean : 3D numpy masked array (day, lat, lon) of daily means (masked where there is no data during the day)
+        data_nc : 3D numpy array (day, lat, lon) of the number of time steps averaged each day 
+        
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    
+    """
+    
+    #import libraries
+    import numpy as np
+    
+    #set dimesnions and the number of full days: 
+    nt, nlat, nlon = data.shape
+    nday = nt//steps_per_day
+    nfull = nday*steps_per_day
+    
+    #find the valid data points and set the masked points to zero so that they do not add to the sum: 
+    valid = ~np.ma.getmaskarray(data) & np.isfinite(np.ma.getdata(data))
+    data_v = np.where(valid, np.ma.getdata(data), 0.)
+    
+    #sum the data and count the valid time steps of each full day: 
+    data_sum = data_v[:nfull].reshape((nday, steps_per_day, nlat, nlon)).sum(axis=1, dtype=float)
+    data_nc = valid[:nfull].reshape((nday, steps_per_day, nlat, nlon)).view(np.uint8).sum(axis=1, dtype=np.int32)
+    
+    #add the remaining time steps as a partial day: 
+    if nt > nfull:
+        data_sum = np.concatenate((data_sum, data_v[nfull:].sum(axis=0, dtype=float)[np.newaxis]), axis=0)
+        data_nc = np.concatenate((data_nc, valid[nfull:].view(np.uint8).sum(axis=0, dtype=np.int32)[np.newaxis]), axis=0)
+    
+    #Take the average (dividing the plain arrays and masking afterwards is much faster than a masked array division): 
+    data_mean = np.divide(data_sum, data_nc, out=np.zeros_like(data_sum), where=data_nc > 0)
+    data_mean = np.ma.masked_array(data_mean, mask=data_nc == 0)
+    
+    return data_mean, data_nc
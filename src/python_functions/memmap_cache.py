@@ -0,0 +1,133 @@
+def memmap_cache(filename, variable, cache_dir, chunk):
+
+    """
+    memmap_cache(filename, variable, cache_dir, chunk)
+
+        Function to cache a binned (time, lat, lon) netCDF variable on disk as a raw memory mapped array of the decoded values and a bitmap of
+        the valid grid points. The first call decodes the variable chunk by chunk into the cache; later calls (also from other programs) only map
+        the cached files into memory, which is near instant and does not copy or decode anything until the values are used. The cache is keyed by
+        the absolute path, modification time, and size of the netCDF file and the name of the variable, so a file that is rewritten gets a new
+        cache entry (old entries are left in cache_dir and can be deleted by hand).
+
+        Parameters
+        ----------
+        filename : path to the netCDF file of the binned data
+               e.g. filename = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        variable : name of the variable
+               e.g. variable = 'hs'
+        cache_dir : directory of the cache files (created if it does not exist)
+               e.g. cache_dir = '/zdata/home/lcolosi/data/memmap_cache/'
+        chunk : number of time steps decoded at a time when the cache is created
+               e.g. chunk = 365
+
+        Returns
+        -------
+        cube : dictionary with the keys:
+            a) 'data' : read only numpy memmap (time, lat, lon) of the decoded values (NaN where the data is masked for float variables)
+            b) 'valid_bits' : read only numpy memmap (time, lat, ceil(lon/8)) of the validity bitmap packed along longitude (see memmap_masked)
+            c) 'shape' : shape of the variable (time, lat, lon)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+        os : import os
+        json : import json
+        hashlib : import hashlib
+    """
+
+    #import libraries:
+    import os
+    import json
+    import hashlib
+    import numpy as np
+    from netCDF4 import Dataset
+
+    #set the cache key from the source file and the variable:
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = hashlib.sha1(repr((path, stat.st_mtime_ns, stat.st_size, variable)).encode()).hexdigest()
+    base = os.path.join(cache_dir, variable + '_' + key)
+
+    #create the cache if it does not exist (the metadata file is written last, so an interrupted run is started over):
+    if not os.path.exists(base + '.json'):
+        os.makedirs(cache_dir, exist_ok=True)
+
+        #set the shape and type of the decoded variable:
+        nc = Dataset(path, 'r')
+        var = nc.variables[variable]
+        nt, nlat, nlon = var.shape
+        dtype = var[0:1,:,:].dtype
+        nbytes = -(-nlon//8)
+
+        #decode the variable chunk by chunk into the memory mapped files:
+        data = np.lib.format.open_memmap(base + '.data.tmp.npy', mode='w+', dtype=dtype, shape=(nt, nlat, nlon))
+        bits = np.lib.format.open_memmap(base + '.bits.tmp.npy', mode='w+', dtype=np.uint8, shape=(nt, nlat, nbytes))
+        for it in range(0, nt, chunk):
+            data_c = var[it:it+chunk,:,:]
+            valid = ~np.ma.getmaskarray(data_c)
+            if np.issubdtype(dtype, np.floating):
+                data[it:it+chunk] = np.ma.filled(data_c, np.nan)
+            else:
+                data[it:it+chunk] = np.ma.filled(data_c, 0)
+            bits[it:it+chunk] = np.packbits(valid, axis=-1)
+        nc.close()
+        data.flush()
+        bits.flush()
+        del data, bits
+
+        #move the finished files into place and write the metadata:
+        os.replace(base + '.data.tmp.npy', base + '.data.npy')
+        os.replace(base + '.bits.tmp.npy', base + '.bits.npy')
+        with open(base + '.json', 'w') as f:
+            json.dump({'source': path, 'variable': variable, 'shape': [nt, nlat, nlon], 'dtype': np.dtype(dtype).str}, f)
+
+    #map the cached files into memory:
+    with open(base + '.json', 'r') as f:
+        meta = json.load(f)
+    cube = {}
+    cube['data'] = np.load(base + '.data.npy', mmap_mode='r')
+    cube['valid_bits'] = np.load(base + '.bits.npy', mmap_mode='r')
+    cube['shape'] = tuple(meta['shape'])
+
+    return cube
+
+def memmap_masked(cube, key):
+
+    """
+    memmap_masked(cube, key)
+
+        Function to read a slice of a memory mapped cube (see memmap_cache) as a masked array. The values stay a view of the memory mapped file
+        and only the bits of the validity bitmap under the slice are unpacked.
+
+        Parameters
+        ----------
+        cube : memory mapped cube from memmap_cache
+        key : tuple of the (time, lat, lon) integers or slices of the slice (missing trailing indices select the whole axis)
+               e.g. key = (slice(0, 720), 100, 230) or key = (slice(None), slice(10, 20), slice(None))
+
+        Returns
+        -------
+        data : numpy masked array of the slice (masked where the data is not valid)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #complete the key with whole axes:
+    if not isinstance(key, tuple):
+        key = (key,)
+    key = key + (slice(None),)*(3 - len(key))
+
+    #unpack the bits of the time steps and latitude rows of the slice and then select the longitudes:
+    nlon = cube['shape'][2]
+    valid = np.unpackbits(cube['valid_bits'][key[0], key[1]], axis=-1, count=nlon).astype(bool)[..., key[2]]
+
+    #set the mask of the values of the slice:
+    data = np.ma.masked_array(cube['data'][key], mask=~valid)
+
+    return data
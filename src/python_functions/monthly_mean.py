@@ -91,3 +91,147 @@ def monthly_average(date_time, data, fill_val):
                 except: pass
 
     return monthly_data
+
+def monthly_codes(date_time):
+
+    """
+    monthly_codes(date_time)
+
+        Function to set the integer month group code year*12 + (month - 1) of each time step, so that the time steps of one month of one year
+        share one code and consecutive months have consecutive codes
+
+        Parameters
+        ----------
+        date_time : numpy array of datetime (or cftime) values of the time series of the data set, or the time index of the data set (see
+               time_index)
+
+        Returns
+        -------
+        codes : numpy integer array of the month group code of each time step
+
+        Libraries necessary to run function
+        -----------------------------------
+        time index : from time_index import time_field
+    """
+
+    #import libraries:
+    from time_index import time_field
+
+    #take the codes from the time index or compute them from the year and month of each time step in a single pass:
+    codes = time_field(date_time = date_time, field = 'month_code')
+
+    return codes
+
+def monthly_average_grouped(date_time, data, fill_val):
+
+    """
+    monthly_average_grouped(date_time, data, fill_val)
+
+        Function to compute the monthly mean, standard deviation, number of observations, and centre time of temporal data for every month of
+        every year in one vectorized reduction. The month group codes (see monthly_codes) are computed once, the time steps are sorted by code
+        once (no copy if they are already in time order), and the sums of each month are reduced in a single pass over the data. Unlike
+        monthly_average, the results are dense arrays covering every month from the first to the last month of the record, and months without any
+        time step are reported in 'empty' instead of being skipped.
+
+        Parameters
+        ----------
+        date_time : numpy array of datetime (or cftime) values which correspond to the time series of the data set, or the time index of the
+               data set (see time_index), which avoids any per time step work on datetime values
+        data : numpy array of temporal data with time as the first axis (a time series of a single grid point or a 3D array of spatial and
+               temporal data)
+               e.g. print(data.shape) => (8766,) or print(data.shape) => (8766,133,360)
+        fill_val : determines what fill value is present in your data set. Options include:
+               fill_val = 'NaN' or fill_val = 'mask'
+
+        Returns
+        -------
+        monthly_data : A dictionary containing the following keys:
+            a) 'time' : numpy array of the centre time of each month (mean time of its time steps, None for empty months)
+            b) 'year', 'month', 'code' : numpy integer arrays of the year, month, and month group code of each month
+            c) 'mean' : data monthly mean (month, ...)
+            d) 'std' : data monthly standard deviation (month, ...)
+            e) 'N' : number of observations averaged over (month, ...)
+            f) 'empty' : numpy boolean array that is True for the months without any time step
+            The mean and std are NaN (fill_val = 'NaN') or masked (fill_val = 'mask') where N = 0
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        datetime : import datetime
+        NetCDF : from netCDF4 import num2date
+    """
+
+    #import libraries:
+    import datetime
+    import numpy as np
+    from netCDF4 import num2date
+
+    #make an assertion that the date_time variable must be an array or a time index for the function to continue:
+    assert isinstance(date_time, (np.ndarray, dict)), 'date_time should be an array or a time index'
+
+    #compute the month group codes once and sort the time steps by code (the sort is skipped when the record is in time order):
+    codes = monthly_codes(date_time = date_time)
+    order = None
+    if np.any(np.diff(codes) < 0):
+        order = np.argsort(codes, kind='stable')
+        codes = codes[order]
+        data = data[order]
+
+    #set the dense range of months and the first time step of each month that has data:
+    code_0 = codes[0]
+    nmonth = codes[-1] - code_0 + 1
+    code_u, start, count_t = np.unique(codes, return_index=True, return_counts=True)
+    imonth = code_u - code_0
+
+    #set the valid data points and zero the invalid ones:
+    if fill_val == 'NaN':
+        values = np.asarray(data, dtype=float)
+        valid = ~np.isnan(values)
+    elif fill_val == 'mask':
+        values = np.ma.getdata(data).astype(float, copy=False)
+        valid = ~np.ma.getmaskarray(data)
+    else:
+        raise ValueError("fill_val should be 'NaN' or 'mask'")
+    values = np.where(valid, values, 0.)
+
+    #sum the observations and count the valid data points of each month in one reduction:
+    shape = (nmonth,) + values.shape[1:]
+    N = np.zeros(shape, dtype=np.int32)
+    N[imonth] = np.add.reduceat(valid.view(np.uint8), start, axis=0, dtype=np.int32)
+    data_sum = np.zeros(shape)
+    data_sum[imonth] = np.add.reduceat(values, start, axis=0)
+
+    #compute the mean and then the sum of the squared deviations from the mean of each month (two passes are more accurate than the sum of squares):
+    data_mean = np.divide(data_sum, N, out=np.zeros(shape), where=N>0)
+    dev = np.where(valid, values - np.repeat(data_mean[imonth], count_t, axis=0), 0.)
+    data_var = np.zeros(shape)
+    data_var[imonth] = np.add.reduceat(dev**2, start, axis=0)
+    data_std = np.sqrt(np.divide(data_var, N, out=np.zeros(shape), where=N>0))
+
+    #compute the centre time of each month as the mean offset of its time steps from a reference time:
+    time = np.full(nmonth, None, dtype=object)
+    if isinstance(date_time, dict):
+        offset = date_time['days'] if order is None else date_time['days'][order]
+        units_days = 'days since ' + date_time['units'].split('since')[1].strip()
+        time[imonth] = list(num2date(np.add.reduceat(offset, start)/count_t, units_days, date_time['calendar']))
+    else:
+        offset = np.fromiter(((t - date_time[0]).total_seconds() for t in date_time), dtype=float, count=len(date_time))
+        if order is not None:
+            offset = offset[order]
+        time[imonth] = [date_time[0] + datetime.timedelta(seconds=o) for o in np.add.reduceat(offset, start)/count_t]
+
+    #initialize the dictionary that holds the dense monthly statistics:
+    code = code_0 + np.arange(nmonth)
+    empty = np.ones(nmonth, dtype=bool)
+    empty[imonth] = False
+    monthly_data = {'time': time, 'year': code//12, 'month': code%12 + 1, 'code': code, 'N': N, 'empty': empty}
+
+    #set the months without observations to the fill value:
+    if fill_val == 'NaN':
+        monthly_data['mean'] = np.where(N>0, data_mean, np.nan)
+        monthly_data['std'] = np.where(N>0, data_std, np.nan)
+    else:
+        monthly_data['mean'] = np.ma.masked_array(data_mean, mask=N==0)
+        monthly_data['std'] = np.ma.masked_array(data_std, mask=N==0)
+
+    return monthly_data
@@ -0,0 +1,146 @@
+class MultiFileDataset:
+
+    """
+    MultiFileDataset(filenames, variable)
+
+        Lazy dataset that joins a variable split over several netCDF files along time (e.g. the yearly CCMP binned files) into one virtual
+        (time, lat, lon) array. Only the time coordinates of the files are read when the dataset is created. Slicing the dataset
+        (dataset[t0:t1, lat, lon]) finds the files that hold the requested time steps and reads only those hyperslabs, so a time series of one
+        grid point or of a small box over the whole record reads kilobytes instead of loading the full record into memory.
+
+        Parameters
+        ----------
+        filenames : list of netCDF files that each hold part of the record of the variable with the dimensions (time, lat, lon). The files are
+               ordered by their first time, so the list does not have to be sorted
+               e.g. filenames = glob.glob('.../ccmp_v2_wsp_daily_binned_data_*_high_res.nc')
+        variable : name of the variable
+               e.g. variable = 'wsp'
+
+        Attributes
+        ----------
+        shape : shape of the virtual array (time, lat, lon)
+        time : numpy array of the datetimes of every time step of the record
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+        files : list of dictionaries with the 'filename' of each file and the 'start' and 'stop' indices of its time steps in the record
+
+        Example
+        -------
+        wsp_c = MultiFileDataset(filenames = filename_c, variable = 'wsp')
+        nc_ts = wsp_c[0:720,100,230] => reads 720 values from the first two files
+        it = wsp_c.time_slice(t0 = datetime.datetime(1993,1,1), t1 = datetime.datetime(2016,1,1)) => slice of the time steps from 1993 to 2015
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset, num2date, date2num
+    """
+
+    def __init__(self, filenames, variable):
+
+        #import libraries:
+        import numpy as np
+        from netCDF4 import Dataset, num2date, date2num
+
+        #read the time coordinates of each file and convert them to the time units of the first file:
+        times = []
+        for f in filenames:
+            nc = Dataset(f, 'r')
+            if len(times) == 0:
+                self.units = nc.variables['time'].units
+                self.calendar = getattr(nc.variables['time'], 'calendar', 'standard')
+                self.lon = nc.variables['lon'][:]
+                self.lat = nc.variables['lat'][:]
+                nlat, nlon = nc.variables[variable].shape[1:]
+            time_f = nc.variables['time'][:]
+            time_f = date2num(num2date(time_f, nc.variables['time'].units, getattr(nc.variables['time'], 'calendar', 'standard')), self.units, self.calendar)
+            times.append((np.asarray(time_f, dtype=float), f))
+            nc.close()
+
+        #order the files by their first time and set the indices of the time steps of each file in the record:
+        times.sort(key = lambda tf: tf[0][0] if len(tf[0]) else np.inf)
+        self.files = []
+        start = 0
+        for time_f, f in times:
+            self.files.append({'filename': f, 'start': start, 'stop': start + len(time_f)})
+            start = start + len(time_f)
+
+        self.variable = variable
+        self.time_num = np.concatenate([time_f for time_f, f in times])
+        self.time = num2date(self.time_num, self.units, self.calendar)
+        self.shape = (len(self.time_num), nlat, nlon)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def time_slice(self, t0, t1):
+
+        """
+        time_slice(t0, t1)
+
+            Method to find the time steps from t0 (included) to t1 (excluded) as a slice of the record (the record is assumed to be in time order)
+
+            Parameters
+            ----------
+            t0, t1 : datetimes of the start and the end of the period
+                   e.g. t0, t1 = datetime.datetime(1993,1,1), datetime.datetime(2016,1,1)
+
+            Returns
+            -------
+            it : slice of the time steps of the period
+        """
+
+        #import libraries:
+        import numpy as np
+        from netCDF4 import date2num
+
+        #find the first time step at or after t0 and the first time step at or after t1:
+        i0 = np.searchsorted(self.time_num, date2num(t0, self.units, self.calendar), side='left')
+        i1 = np.searchsorted(self.time_num, date2num(t1, self.units, self.calendar), side='left')
+
+        return slice(int(i0), int(i1))
+
+    def __getitem__(self, key):
+
+        #import libraries:
+        import numpy as np
+        from netCDF4 import Dataset
+
+        #split the key into the time index and the latitude and longitude indices:
+        if not isinstance(key, tuple):
+            key = (key,)
+        time_key, space_key = key[0], tuple(key[1:])
+
+        #find the requested time steps of the record (each time step is only read once):
+        itime = np.arange(self.shape[0])[time_key]
+        scalar = np.ndim(itime) == 0
+        itime = np.atleast_1d(itime)
+        itime_u, inverse = np.unique(itime, return_inverse=True)
+
+        #read the time steps of each file that holds some of them as one hyperslab:
+        pieces = []
+        for fi in self.files:
+            local = itime_u[(itime_u >= fi['start']) & (itime_u < fi['stop'])] - fi['start']
+            if len(local) == 0:
+                continue
+            step = np.unique(np.diff(local))
+            if len(local) == 1 or len(step) == 1:
+                local = slice(int(local[0]), int(local[-1]) + 1, int(step[0]) if len(local) > 1 else 1)
+            nc = Dataset(fi['filename'], 'r')
+            pieces.append(nc.variables[self.variable][(local,) + space_key])
+            nc.close()
+
+        #an empty request reads an empty hyperslab of the first file to get the shape of the other axes:
+        if len(pieces) == 0:
+            nc = Dataset(self.files[0]['filename'], 'r')
+            pieces.append(nc.variables[self.variable][(slice(0, 0),) + space_key])
+            nc.close()
+
+        #join the files and put the time steps back in the requested order:
+        data = np.ma.concatenate(pieces, axis=0)
+        if not np.array_equal(itime, itime_u):
+            data = data[inverse]
+        if scalar:
+            data = data[0]
+
+        return data
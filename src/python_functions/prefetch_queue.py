@@ -0,0 +1,80 @@
+def prefetch_producer(func, kwargs, queue):
+
+    """
+    prefetch_producer(func, kwargs, queue)
+
+        Function run in the background process of prefetch that puts every item of the generator func(**kwargs) into the queue followed by a
+        message that the generator is finished (or the error that stopped it)
+
+        Parameters
+        ----------
+        func : generator function
+        kwargs : dictionary of keyword arguments of func
+        queue : multiprocessing queue
+
+        Returns
+        -------
+        None
+
+        Libraries necessary to run function
+        -----------------------------------
+        None
+    """
+
+    #put each item in the queue (put waits while the queue is full):
+    try:
+        for item in func(**kwargs):
+            queue.put(('item', item))
+        queue.put(('done', None))
+    except Exception as error:
+        queue.put(('error', error))
+
+def prefetch(func, kwargs, nprefetch):
+
+    """
+    prefetch(func, kwargs, nprefetch)
+
+        Generator that runs the generator func(**kwargs) in a background process and yields its items in order through a bounded queue, so that the
+        next items are read while the current item is being processed. At most nprefetch items wait in the queue, which keeps memory bounded.
+        A process is used instead of a thread because the netcdf-c library is not thread safe (netCDF files must not be read from two threads at
+        the same time), and several prefetch generators can run at once to read several sets of files concurrently.
+
+        Parameters
+        ----------
+        func : generator function defined at the top level of a module (e.g. along_track_batches)
+        kwargs : dictionary of keyword arguments of func
+               e.g. kwargs = {'filenames': filenames, 'variables': {'swh': 'swhcor'}, 'window': 24}
+        nprefetch : maximum number of items read ahead
+               e.g. nprefetch = 2
+
+        Yields
+        -------
+        item : items of func(**kwargs) in order
+
+        Libraries necessary to run function
+        -----------------------------------
+        multiprocessing : import multiprocessing
+    """
+
+    #import libraries:
+    import multiprocessing
+
+    #start the background process:
+    queue = multiprocessing.Queue(maxsize = nprefetch)
+    process = multiprocessing.Process(target = prefetch_producer, args = (func, kwargs, queue), daemon = True)
+    process.start()
+
+    #yield the items until the background process is finished (the process is stopped if the generator is closed early):
+    try:
+        while True:
+            kind, item = queue.get()
+            if kind == 'item':
+                yield item
+            elif kind == 'done':
+                break
+            elif kind == 'error':
+                raise item
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
@@ -16,7 +16,7 @@ def prob_swell(data, observed_swh, date_time, task):
                 expected_swh : numpy masked array of geospatial maps of expected swh computed from wind-wave relationship
                              e.g : expected_swh.shape = (8766, 133, 360)
                                If I am using expected_swh to compute probability of swell, set wave_age = 'none'
-        date_time : date_time numpy array with time series for data set
+        date_time : date_time numpy array with time series for data set, or the time index of the data set (see time_index)
         task : specifies whether the probability of swell is computed seasonally or over the entire time series. Options include: 
                      e.g : task = 'seasonally' or task = 'all_time'
         
@@ -30,11 +30,13 @@ def prob_swell(data, observed_swh, date_time, task):
         Libraries necessary to run function
         -----------------------------------
         import numpy as np
+        from climatology_groups import grouping_labels
     
     """
     
     #import libraries
     import numpy as np
+    from climatology_groups import grouping_labels
     
     #create prob_swell dictionary 
     prob_swell = {}
@@ -71,25 +73,15 @@ def prob_swell(data, observed_swh, date_time, task):
     #Case 2: compute prob of swell seasonally 
     elif task == 'seasonally':
 
-        #set year and month 2D time arrays that correspond to the month at which swh data point was collected (time series indice array for month)
-        months = np.array([m.month for m in date_time])
-
         #loop through time series to call months for each season: DJF, MAM, JJA, SON:
-        #initialize variables
-        seasons = [[12,1,2], [3,4,5], [6,7,8], [9,10,11]]
+        #label the time steps with their season (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON):
+        seasons, names = grouping_labels(date_time = date_time, grouping = 'seasonal')
 
-        #initialize a seasonal loop that will go through each month 1 to 12 
+        #initialize a seasonal loop that will go through each season
         for s in range(0,4):
 
-            #call season:
-            season = seasons[s]
-
-            #initialize the indices where the months vector elements are equal to the month value of the loop. Therefore, we obtain all the 2D arrays of swh wave height data that has been collected during the month of January, February, etc. in our given time series. 
-            bool_1 = months==season[0]
-            bool_2 = months==season[1]
-            bool_3 = months==season[2]
-            ind_1 = bool_1 | bool_2
-            ind = ind_1 |bool_3
+            #initialize the indices of the time steps of the season:
+            ind = seasons == s
 
             #call wave age or expected swh data from season
             data_s = data[ind]
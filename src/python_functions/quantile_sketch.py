@@ -0,0 +1,394 @@
+def quantile_sketch_init(edges, ngroup, shape, max_bytes=4e9):
+
+    """
+    quantile_sketch_init(edges, ngroup, shape, max_bytes)
+
+        Function to create an empty quantile sketch: a fixed histogram of the data of each group of time steps (e.g. calendar month or season)
+        at each grid point, together with the exact count, minimum, and maximum. Daily chunks are added with quantile_sketch_update, sketches of
+        different files are combined with merge_quantile_sketches, and the median or any percentile is then read from the histograms with
+        sketch_quantiles, so quantile climatologies never need the full record or a sort of the data in memory.
+
+        The error of a quantile is at most the width of the histogram bin that holds it (for data inside the edges), i.e. at most max(diff(edges)),
+        whatever the number of data points. Data outside of the edges are counted in the first or last bin, where the error is only bounded by the
+        exact minimum and maximum of the grid point.
+
+        The memory of the sketch is about ngroup*(len(edges) - 1)*nlat*nlon*2 bytes (4 bytes per count once a count can exceed 65535), which
+        limits the sketch to coarse grids, few groups, or coarse bins. For example 300 bins of 5 cm from 0 to 15 m take about 0.6 GB on the
+        1 degree Ifremer grid (133 x 360) for 12 months, but about 6.5 GB on the 0.25 degree CCMP grid (628 x 1440) for 12 months and 40 GB for 73
+        pentads. A sketch larger than max_bytes raises a ValueError: use coarser edges (e.g. np.arange(0, 15.1, 0.1) halves the memory), fewer
+        groups, or sketch the grid in bands of latitude rows (quantile_stream does so by default above max_bytes).
+
+        Parameters
+        ----------
+        edges : numpy array of the increasing edges of the histogram bins
+               e.g. edges = np.arange(0, 15.05, 0.05) (significant wave height in meters with a 5 cm error bound)
+        ngroup : number of groups of time steps
+               e.g. ngroup = 12
+        shape : shape of the grid
+               e.g. shape = (133, 360)
+        max_bytes : largest memory in bytes of the counts of the sketch (default 4e9)
+
+        Returns
+        -------
+        sketch : dictionary with the keys:
+            a) 'edges' : the edges of the histogram bins
+            b) 'counts' : numpy unsigned integer array (group, cell, bin) of the number of data points in each bin
+            c) 'N' : numpy integer array (group, cell) of the number of data points
+            d) 'min', 'max' : numpy arrays (group, cell) of the minimum and maximum of the data (inf and -inf where N = 0)
+            e) 'shape' : shape of the grid
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #check the memory of the histograms before they are allocated:
+    edges = np.asarray(edges, dtype=float)
+    ncell = int(np.prod(shape))
+    nbytes = 2.*ngroup*ncell*(len(edges) - 1)
+    if nbytes > max_bytes:
+        raise ValueError('the quantile sketch of %d groups, %d grid points, and %d bins takes %.1f GB (more than max_bytes = %.1f GB): use coarser '
+                         'edges, fewer groups, or bands of latitude rows (rows of quantile_stream)'
+                         % (ngroup, ncell, len(edges) - 1, nbytes/1e9, max_bytes/1e9))
+
+    #initialize the empty histograms:
+    sketch = {}
+    sketch['edges'] = edges
+    sketch['counts'] = np.zeros((ngroup, ncell, len(edges) - 1), dtype=np.uint16)
+    sketch['N'] = np.zeros((ngroup, ncell), dtype=np.int64)
+    sketch['min'] = np.full((ngroup, ncell), np.inf)
+    sketch['max'] = np.full((ngroup, ncell), -np.inf)
+    sketch['shape'] = tuple(shape)
+
+    return sketch
+
+def quantile_sketch_update(sketch, data, labels):
+
+    """
+    quantile_sketch_update(sketch, data, labels)
+
+        Function to add a chunk of temporal data to a quantile sketch (see quantile_sketch_init). The counts, minimum, and maximum are updated
+        for each group of the chunk at once. The chunk is processed in blocks of all the time steps of a group by a few thousand grid points: the
+        bins of all the values of a block are found at once, and the histograms are updated in one step from the flat (grid point, bin) index of
+        the values (the indices are sorted and each distinct index is incremented by its number of repeats). No Python loop runs over the time
+        steps, and the temporary arrays and the histograms of a block stay in the processor cache.
+
+        Parameters
+        ----------
+        sketch : quantile sketch that is updated in place
+        data : numpy array (or masked array) (time, lat, lon) of temporal data (masked and NaN values are ignored)
+        labels : numpy integer array of the group (0 to ngroup - 1) of each time step
+               e.g. labels = time_field(date_time = index, field = 'season')
+
+        Returns
+        -------
+        sketch : the updated quantile sketch
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #use 4 byte counts before a count can overflow the 2 byte counts:
+    labels = np.asarray(labels)
+    nt = len(labels)
+    if sketch['counts'].dtype == np.uint16 and sketch['N'].max() + nt > np.iinfo(np.uint16).max:
+        sketch['counts'] = sketch['counts'].astype(np.uint32)
+
+    #sort the time steps by group so that the time steps of each group are one block (the sort is skipped when they are already in order):
+    if np.any(np.diff(labels) < 0):
+        order = np.argsort(labels, kind='stable')
+        labels = labels[order]
+        data = data[order]
+    groups, start, count_t = np.unique(labels, return_index=True, return_counts=True)
+
+    #call the data and mask as (time, cell) arrays and set the bins:
+    values_all = np.ma.getdata(data).reshape((nt, -1))
+    mask_all = np.ma.getmaskarray(data).reshape((nt, -1))
+    edges = sketch['edges']
+    nbin = len(edges) - 1
+    ncell = values_all.shape[1]
+    width = edges[1] - edges[0]
+    even = np.allclose(np.diff(edges), width)
+
+    #work on blocks of the time steps of one group by a few thousand grid points, so that the temporary arrays and the histograms that are
+    #updated stay in the processor cache:
+    block = 4096
+    itype = np.int32 if block*nbin < np.iinfo(np.int32).max else np.int64
+    offset = np.arange(block, dtype=itype)*nbin
+    for g, i0, n in zip(groups, start, count_t):
+        for c0 in range(0, ncell, block):
+            c1 = min(c0 + block, ncell)
+
+            #set the valid data points of the block and set the invalid ones to NaN:
+            values = np.array(values_all[i0:i0+n,c0:c1], dtype=float)
+            valid = ~mask_all[i0:i0+n,c0:c1] & np.isfinite(values)
+            values[~valid] = np.nan
+
+            #update the counts, minimum, and maximum (fmin and fmax skip the NaN):
+            sketch['N'][g,c0:c1] += np.count_nonzero(valid, axis=0)
+            np.fmin(sketch['min'][g,c0:c1], np.fmin.reduce(values, axis=0), out=sketch['min'][g,c0:c1])
+            np.fmax(sketch['max'][g,c0:c1], np.fmax.reduce(values, axis=0), out=sketch['max'][g,c0:c1])
+
+            #find the bin of every value (evenly spaced edges find the bins with arithmetic instead of a search, and values outside of the edges
+            #go to the first or last bin):
+            if even:
+                values -= edges[0]
+                values *= 1./width
+                np.fmax(values, 0, out=values)
+                np.fmin(values, nbin - 1, out=values)
+                index = values.astype(itype)
+            else:
+                index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, nbin - 1).astype(itype)
+
+            #set the flat (grid point, bin) index of each valid value in the histograms of the block and add the number of repeats of each
+            #distinct index at once:
+            index += offset[np.newaxis,:c1-c0]
+            index = np.sort(index[valid])
+            if len(index) == 0:
+                continue
+            first = np.flatnonzero(np.concatenate(([True], index[1:] != index[:-1])))
+            repeats = np.diff(np.append(first, len(index)))
+            sketch['counts'][g,c0:c1].reshape(-1)[index[first]] += repeats.astype(sketch['counts'].dtype)
+
+    return sketch
+
+def merge_quantile_sketches(sketches):
+
+    """
+    merge_quantile_sketches(sketches)
+
+        Function to merge quantile sketches with the same edges, groups, and grid (e.g. from several files or processes). The merged sketch is
+        the same as the sketch of all the data, whatever the order of the merge.
+
+        Parameters
+        ----------
+        sketches : list of quantile sketches
+               e.g. sketches = [sketch_1993, sketch_1994]
+
+        Returns
+        -------
+        sketch : merged quantile sketch
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize the merged sketch with a copy of the first sketch (with 4 byte counts if the merged counts can overflow 2 byte counts):
+    N = sum(s['N'] for s in sketches)
+    dtype = np.uint16 if N.max() <= np.iinfo(np.uint16).max else np.uint32
+    sketch = {'edges': sketches[0]['edges'], 'shape': sketches[0]['shape'], 'N': N}
+    sketch['counts'] = sketches[0]['counts'].astype(dtype)
+    sketch['min'] = sketches[0]['min'].copy()
+    sketch['max'] = sketches[0]['max'].copy()
+
+    #add the counts and take the minimum and maximum of the extremes:
+    for s in sketches[1:]:
+        sketch['counts'] += s['counts'].astype(dtype, copy=False)
+        np.minimum(sketch['min'], s['min'], out=sketch['min'])
+        np.maximum(sketch['max'], s['max'], out=sketch['max'])
+
+    return sketch
+
+def sketch_quantiles(sketch, percentiles):
+
+    """
+    sketch_quantiles(sketch, percentiles)
+
+        Function to read percentiles of each group at each grid point from a quantile sketch. As in np.percentile, a percentile is the linear
+        interpolation between the two closest ranks; the value of a rank is estimated by spreading the data points of its histogram bin evenly
+        over the bin, and is kept within the exact minimum and maximum. The error is at most the width of the bin (see quantile_sketch_init).
+
+        Parameters
+        ----------
+        sketch : quantile sketch
+        percentiles : list of percentiles between 0 and 100
+               e.g. percentiles = [50] (median) or percentiles = [10, 50, 90]
+
+        Returns
+        -------
+        quantiles : numpy masked array (percentile, group, lat, lon) of the percentiles (masked where there is no data)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize variables:
+    edges = sketch['edges']
+    ngroup, ncell, nbin = sketch['counts'].shape
+    quantiles = np.zeros((len(percentiles), ngroup, ncell))
+
+    #work on blocks of a few thousand grid points of each group, so that the temporary arrays stay small:
+    block = 4096
+    for g in range(ngroup):
+        for c0 in range(0, ncell, block):
+            c1 = min(c0 + block, ncell)
+            cells = np.arange(c1 - c0)
+            N = sketch['N'][g,c0:c1]
+
+            #set the minimum and maximum of the grid points without data (inf and -inf) to zero so that no inf - inf is interpolated (these
+            #grid points are masked below):
+            vmin = np.where(N > 0, sketch['min'][g,c0:c1], 0.)
+            vmax = np.where(N > 0, sketch['max'][g,c0:c1], 0.)
+
+            #cumulate the counts over spans of 16 bins of each grid point (a cumulative sum over every bin is slow and the ranks only need the
+            #bins of one span):
+            counts = sketch['counts'][g,c0:c1]
+            nfull = nbin//16
+            span_sums = counts[:,:nfull*16].reshape((c1 - c0, nfull, 16)).sum(axis=2, dtype=np.int64)
+            if nbin > nfull*16:
+                span_sums = np.concatenate([span_sums, counts[:,nfull*16:].sum(axis=1, dtype=np.int64)[:,np.newaxis]], axis=1)
+            cum_spans = np.cumsum(span_sums, axis=1)
+
+            for i, q in enumerate(percentiles):
+
+                #find the two closest ranks (0 based) of the percentile:
+                pos = np.maximum(N - 1, 0)*q/100.
+                lo = np.floor(pos).astype(np.int64)
+                hi = np.ceil(pos).astype(np.int64)
+
+                #estimate the value of each rank from the position of the rank within its bin:
+                value = []
+                for k in [lo, hi]:
+
+                    #find the first span of 16 bins whose cumulative count is above the rank (the last span if none is) and the cumulative
+                    #count below that span:
+                    ispan = np.minimum(np.count_nonzero(cum_spans <= k[:,np.newaxis], axis=1), cum_spans.shape[1] - 1)
+                    base = np.where(ispan > 0, cum_spans[cells, np.maximum(ispan - 1, 0)], 0)
+
+                    #cumulate the counts of the bins of that span and find the first bin whose cumulative count is above the rank (the last bin
+                    #of the span if none is):
+                    cols = ispan[:,np.newaxis]*16 + np.arange(16)[np.newaxis,:]
+                    cum = base[:,np.newaxis] + np.cumsum(np.where(cols < nbin, counts[cells[:,np.newaxis], np.minimum(cols, nbin - 1)], 0), axis=1)
+                    j = np.minimum(np.count_nonzero(cum <= k[:,np.newaxis], axis=1), np.minimum(nbin - ispan*16, 16) - 1)
+                    ibin = ispan*16 + j
+                    below = np.where(j > 0, cum[cells, np.maximum(j - 1, 0)], base)
+                    count = cum[cells, j] - below
+                    frac = (k - below + 0.5)/np.maximum(count, 1)
+                    value_k = np.clip(edges[ibin] + frac*(edges[ibin + 1] - edges[ibin]), vmin, vmax)
+
+                    #the first and last ranks are the exact minimum and maximum:
+                    value_k = np.where(k == 0, vmin, value_k)
+                    value.append(np.where(k == N - 1, vmax, value_k))
+
+                #interpolate between the two ranks:
+                quantiles[i,g,c0:c1] = value[0] + (value[1] - value[0])*(pos - lo)
+
+    #mask the grid points without data and reshape onto the grid:
+    empty = np.broadcast_to(sketch['N'] == 0, quantiles.shape)
+    quantiles = np.ma.masked_array(quantiles, mask=empty).reshape((len(percentiles), ngroup) + sketch['shape'])
+
+    return quantiles
+
+def quantile_stream(filenames, variable, task, edges, percentiles, chunk, rows=None, max_bytes=4e9):
+
+    """
+    quantile_stream(filenames, variable, task, edges, percentiles, chunk, rows, max_bytes)
+
+        Function to compute the monthly or seasonal climatology of percentiles (e.g. the median) of a daily binned variable at each grid point in
+        a single pass over one or several netCDF files with a quantile sketch (see quantile_sketch_init for the error bound). The files are read
+        chunk by chunk and the months or seasons of the time steps come from the cached time index of each file (see time_index). For small grids
+        the exact median of clima_mean and stat_moments_temporal (np.ma.median) remains available; benchmark_quantile_sketch compares the two.
+        Grids whose sketch would take more than max_bytes (e.g. the 0.25 degree CCMP grid) are sketched in bands of latitude rows, one pass over
+        the files per band, so the memory stays bounded by max_bytes whatever the grid.
+
+        Parameters
+        ----------
+        filenames : netCDF file or list of netCDF files of the binned data with the variables time and (time, lat, lon) variable
+               e.g. filenames = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        variable : name of the variable
+               e.g. variable = 'hs'
+        task : choose between computing the seasonal progression or monthly progression. Options include:
+               task = 'monthly' or task = 'seasonally'
+        edges : numpy array of the increasing edges of the histogram bins
+               e.g. edges = np.arange(0, 15.05, 0.05)
+        percentiles : list of percentiles between 0 and 100
+               e.g. percentiles = [50]
+        chunk : number of time steps read at a time
+               e.g. chunk = 365
+        rows : number of latitude rows sketched at a time. If rows = None (default), the whole grid is sketched at once when its sketch takes at
+               most max_bytes, and otherwise the largest bands of latitude rows whose sketch takes at most max_bytes
+               e.g. rows = 100
+        max_bytes : largest memory in bytes of the counts of the sketch of a band (default 4e9, see quantile_sketch_init)
+
+        Returns
+        -------
+        quantile_data : dictionary with the keys:
+            a) 'month(s)' : numpy array of the months (1 to 12) or seasons (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON)
+            b) 'percentiles' : numpy masked array (percentile, month or season, lat, lon) of the percentiles
+            c) 'N' : numpy masked array (month or season, lat, lon) of the number of data points
+            d) 'error' : bound of the error of the percentiles inside the edges (max(diff(edges)))
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+        time index : from time_index import time_index
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset
+    from time_index import time_index
+
+    #set the groups of the task:
+    if task == 'monthly':
+        field, offset, groups = 'month', 1, np.arange(1, 13)
+    elif task == 'seasonally':
+        field, offset, groups = 'season', 0, np.arange(0, 4)
+    else:
+        raise ValueError("task should be 'monthly' or 'seasonally'")
+
+    if isinstance(filenames, str):
+        filenames = [filenames]
+
+    #call the grid and the groups of the time steps of each file:
+    nc = Dataset(filenames[0], 'r')
+    nlat, nlon = nc.variables[variable].shape[1:]
+    nc.close()
+    labels = [time_index(filename = filename)[field] - offset for filename in filenames]
+
+    #set the latitude rows of each band (the whole grid or the largest bands whose sketch takes at most max_bytes):
+    if rows is None:
+        rows = int(min(max(max_bytes//(2*len(groups)*nlon*(len(edges) - 1)), 1), nlat))
+    else:
+        rows = min(rows, nlat)
+
+    #sketch the grid one band of latitude rows at a time, adding each chunk of each file to the sketch of the band:
+    quantiles = np.ma.masked_all((len(percentiles), len(groups), nlat, nlon))
+    N = np.zeros((len(groups), nlat, nlon), dtype=np.int64)
+    for r0 in range(0, nlat, rows):
+        r1 = min(r0 + rows, nlat)
+        sketch = quantile_sketch_init(edges = edges, ngroup = len(groups), shape = (r1 - r0, nlon), max_bytes = max_bytes)
+        for filename, labels_f in zip(filenames, labels):
+            nc = Dataset(filename, 'r')
+            var = nc.variables[variable]
+            for it in range(0, var.shape[0], chunk):
+                quantile_sketch_update(sketch = sketch, data = var[it:it+chunk,r0:r1,:], labels = labels_f[it:it+chunk])
+            nc.close()
+
+        #read the percentiles of the band from its sketch:
+        quantiles[:,:,r0:r1,:] = sketch_quantiles(sketch = sketch, percentiles = percentiles)
+        N[:,r0:r1,:] = sketch['N'].reshape((len(groups), r1 - r0, nlon))
+
+    quantile_data = {}
+    quantile_data['month(s)'] = groups
+    quantile_data['percentiles'] = quantiles
+    quantile_data['N'] = np.ma.masked_equal(N, 0)
+    quantile_data['error'] = float(np.max(np.diff(np.asarray(edges, dtype=float))))
+
+    return quantile_data
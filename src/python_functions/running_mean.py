@@ -84,3 +84,69 @@ def running_mean(data, k_dim, task, fill_val):
 
     return data_rm #,w_conv 
 
+
+def block_mean(data, k_dim, edge):
+    
+    """
+    block_mean(data, k_dim, edge)
+    
+        Function for bringing down the resolution of a stack of gridded fields by averaging non-overlapping blocks of grid points (the same average 
+        as running_mean(task = 'deresolve') without computing the full convolution). The (..., lat, lon) array is reshaped into 
+        (..., lat blocks, k_dim[0], lon blocks, k_dim[1]) and the block means of every field are computed at once. Masked and NaN grid points are 
+        left out of the mean of their block instead of being counted as zeros. 
+        
+        Parameters 
+        ----------
+        data : numpy array (or masked array) of 2d or 3d dimensional size with latitude and longitude as the last two axes 
+               e.g. print(wsp.shape) => (8400, 529, 1440) 
+        k_dim : dimensions of the blocks in list format [lat, lon]
+               e.g. k_dim = [16, 16] (0.25 to 4 degree)
+        edge : specifies what is done with the last row or column of blocks when the grid does not divide evenly into blocks. Options include: 
+               edge = 'partial' => the partial blocks are averaged over the grid points they contain 
+               edge = 'trim' => the partial blocks are left out 
+        
+        Returns
+        -------
+        data_bm : numpy masked array (..., lat blocks, lon blocks) of block means (masked where a block has no valid grid points)
+        data_nc : numpy array (..., lat blocks, lon blocks) of the number of valid grid points in each block
+        
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy: import numpy as np
+    """
+    
+    #import libraries
+    import numpy as np
+    
+    #set dimensions: 
+    nlat, nlon = data.shape[-2:]
+    ky, kx = k_dim
+    
+    #find the valid grid points and set the others to zero so that they do not add to the sums: 
+    data_v = np.ma.getdata(data)
+    valid = ~np.ma.getmaskarray(data) & np.isfinite(data_v)
+    data_v = np.where(valid, data_v, 0.)
+    
+    #case 1: pad the grid with invalid grid points up to a whole number of blocks 
+    if edge == 'partial':
+        ny, nx = -(-nlat//ky), -(-nlon//kx)
+        pad = [(0,0)]*(data.ndim - 2) + [(0, ny*ky - nlat), (0, nx*kx - nlon)]
+        if ny*ky != nlat or nx*kx != nlon:
+            data_v = np.pad(data_v, pad)
+            valid = np.pad(valid, pad)
+    #case 2: trim the grid down to a whole number of blocks 
+    elif edge == 'trim':
+        ny, nx = nlat//ky, nlon//kx
+        data_v = data_v[..., :ny*ky, :nx*kx]
+        valid = valid[..., :ny*ky, :nx*kx]
+    
+    #reshape into blocks and sum the data and count the valid grid points of each block: 
+    shape = data.shape[:-2] + (ny, ky, nx, kx)
+    data_sum = data_v.reshape(shape).sum(axis=(-3, -1), dtype=float)
+    data_nc = valid.reshape(shape).sum(axis=(-3, -1))
+    
+    #Take the average: 
+    data_bm = np.divide(data_sum, data_nc, out=np.zeros_like(data_sum), where=data_nc > 0)
+    data_bm = np.ma.masked_array(data_bm, mask=data_nc == 0)
+    
+    return data_bm, data_nc
@@ -1,7 +1,7 @@
-def save_netcdf_fields(wsp, lon, lat, time, output):
+def save_netcdf_fields(wsp, lon, lat, time, output, dtype='f8'):
     
     """
-    save_netcdf_fields(wsp, lon, lat, time, output)
+    save_netcdf_fields(wsp, lon, lat, time, output, dtype)
     
         Function to save corrected binned satellite altimeter swh and wsp with longitude, latitude, and time variables into a netCDF file 
         
@@ -15,6 +15,7 @@ def save_netcdf_fields(wsp, lon, lat, time, output):
         time : numpy array of date2num values of time for days since 1900-02-02 00:00:0
         output: filename (path to file and file's name)
                e.g. output = '/zdata/home/lcolosi/data/ccmpv2_wind_data/daily_binned_ccmp_v2_data/ccmp_v2_wsp_daily_binned_data_93_16.nc'
+        dtype : storage type of the variables (see create_binned_netcdf), 'f8' (default, as in the earlier files) or 'f4'
         
         Returns
         -------
@@ -22,8 +23,7 @@ def save_netcdf_fields(wsp, lon, lat, time, output):
         
         Libraries necessary to run function
         -----------------------------------
-        NetCDF : from netCDF4 import Dataset, num2date, date2num
-                 import netCDF4
+        writer : from save_binned_nc import save_binned_netcdf
         
         Important Note
         --------------
@@ -31,58 +31,11 @@ def save_netcdf_fields(wsp, lon, lat, time, output):
     """
     
     #import libraries:
-    from netCDF4 import Dataset, num2date, date2num
-    import netCDF4 
+    from save_binned_nc import save_binned_netcdf
 
-    Nt, Ny, Nx = wsp.shape
+    #set the attributes and storage of the variable (8 byte floats by default as in the earlier files, with zlib compression): 
+    specs = {'wsp': {'units': 'm/s', 'long_name': 'Cross Calibrated Multi-Platform version 2 wind speed', 'fill_values': 'None', 'resolution': '0.25 degree', 'dtype': dtype}}
 
-    nc = Dataset(output, 'w', format='NETCDF4')
-
-    time_units = 'days since 1900-01-01 00:00:00'
-    calendar = 'julian'
-
-    input_vars = {}
-    input_vars['wsp'] = {}
-    input_vars['wsp']['units'] = 'm/s'
-    input_vars['wsp']['long_name'] = 'Cross Calibrated Multi-Platform version 2 wind speed'
-    input_vars['wsp']['fill_values'] = 'None'
-    input_vars['wsp']['resolution'] = '0.25 degree'
-    
-    time_dim = nc.createDimension('time', Nt)
-    lon_dim = nc.createDimension('lon', Nx)
-    lat_dim = nc.createDimension('lat', Ny)
-
-    vars={}
-    vars['time'] = nc.createVariable('time', '<f4', ('time',))
-    vars['lon'] = nc.createVariable('lon', '<f4', ('lon',))
-    vars['lat'] = nc.createVariable('lat', '<f4', ('lat',))
-
-
-    vars_att = ['units', 'long_name']
-    #vars_att = ['units', 'long_name', 'scale_factor']
-    for var in input_vars.keys():
-        vars[var] = nc.createVariable(var,'<f8' , ('time','lat','lon'),\
-            fill_value=netCDF4.default_fillvals['f8'])
-        for a in vars_att:
-            setattr(vars[var], a, input_vars[var][a])
-
-    for var_all in vars.keys():
-        vars[var_all].set_auto_maskandscale(True)
-
-    setattr(vars['lat'], 'units', 'degrees north')
-    setattr(vars['lon'], 'units', 'degrees east')
-
-    time_att = {}
-    time_att['units'] = time_units
-    time_att['calendar'] = calendar
-
-    for a in time_att:
-        setattr(vars['time'], a, time_att[a])
-
-    vars['lat'][:] = lat
-    vars['lon'][:] = lon
-    vars['time'][:] = date2num(time, nc.variables['time'].units)
-    
-    vars['wsp'][:] = wsp
-
-    nc.close()
+    #save the fields (the time numbers are computed with the standard calendar as in the earlier files): 
+    save_binned_netcdf(fields = {'wsp': wsp}, specs = specs, lon = lon, lat = lat, time = time, output = output, chunking = 'map', 
+                       time_units = 'days since 1900-01-01 00:00:00', calendar = 'standard')
@@ -0,0 +1,225 @@
+def binned_chunks(chunking, nlat, nlon):
+
+    """
+    binned_chunks(chunking, nlat, nlon)
+
+        Function to choose the netCDF chunk shape of binned (time, lat, lon) variables for the way the file will be read
+
+        Parameters
+        ----------
+        chunking : access pattern of the file or an explicit chunk shape. Options include:
+               chunking = 'map' => one chunk per time step (fast to read daily maps and to append one day at a time)
+               chunking = 'time_series' => chunks of one year of 16 x 32 grid point tiles (fast to read long time series of a grid point or a
+                          small box)
+               chunking = (nt_c, nlat_c, nlon_c) => explicit chunk shape
+        nlat, nlon : size of the grid
+
+        Returns
+        -------
+        chunksizes : tuple of the chunk shape (time, lat, lon)
+
+        Libraries necessary to run function
+        -----------------------------------
+        None
+    """
+
+    #case 1: daily maps
+    if chunking == 'map':
+        chunksizes = (1, nlat, nlon)
+    #case 2: time series
+    elif chunking == 'time_series':
+        chunksizes = (365, min(nlat, 16), min(nlon, 32))
+    #case 3: explicit chunk shape
+    else:
+        chunksizes = tuple(chunking)
+
+    return chunksizes
+
+def create_binned_netcdf(specs, lon, lat, output, chunking='map', time_units='days since 1900-01-01 00:00:00', calendar='standard'):
+
+    """
+    create_binned_netcdf(specs, lon, lat, output, chunking, time_units, calendar)
+
+        Function to create a compressed and chunked netCDF file of binned (time, lat, lon) variables with an unlimited time dimension that fields
+        are appended to (see append_binned_netcdf). Each variable is described by a spec that sets its attributes and how it is stored: as 8 byte
+        or 4 byte floats, or packed into 2 byte integers with a scale factor and offset, with zlib and shuffle compression.
+
+        Parameters
+        ----------
+        specs : dictionary of the spec of each variable with the keys:
+            a) 'units' and 'long_name' : attributes of the variable
+            b) 'dtype' : storage type. Options include 'f8', 'f4', or 'i2' (packed). Default 'f8'
+            c) 'valid_range' : [min, max] of the data packed into 'i2' (the scale factor and offset are set such that the range fits into the
+               2 byte integers with a resolution of (max - min)/65532, and the packed range is saved as the valid_min and valid_max attributes).
+               Values outside the range cannot be packed, so append_binned_netcdf masks them (they are saved as fill values, not clipped).
+               Only used for 'i2'
+            d) 'zlib', 'complevel', 'shuffle' : compression settings. Default True, 4, and True
+            e) any other key (e.g. 'resolution') is saved as an attribute
+               e.g. specs = {'swh': {'units': 'm', 'long_name': 'corrected binned altimeter significant wave height', 'dtype': 'i2', 'valid_range': [0, 25]}}
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+        output: filename (path to file and file's name)
+               e.g. output = '/zdata/home/lcolosi/data/ifremer_p1_daily_data/ifremer_swh_daily_binned_data_93_16.nc'
+        chunking : chunk shape of the variables (see binned_chunks)
+               e.g. chunking = 'map' or chunking = 'time_series'
+        time_units : units of the time variable
+               e.g. time_units = 'days since 1900-01-01 00:00:00'
+        calendar : calendar of the time variable (used to convert the datetimes to numbers and saved as an attribute)
+               e.g. calendar = 'standard'
+
+        Returns
+        -------
+        NetCDF file with lon, lat, an empty unlimited time dimension, and empty (time, lat, lon) variables
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset
+                 import netCDF4
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset
+    import netCDF4
+    import numpy as np
+
+    nc = Dataset(output, 'w', format='NETCDF4')
+
+    #set the time dimension as unlimited so that fields can be appended:
+    time_dim = nc.createDimension('time', None)
+    lon_dim = nc.createDimension('lon', len(lon))
+    lat_dim = nc.createDimension('lat', len(lat))
+
+    vars={}
+    vars['time'] = nc.createVariable('time', '<f8', ('time',))
+    vars['lon'] = nc.createVariable('lon', '<f4', ('lon',))
+    vars['lat'] = nc.createVariable('lat', '<f4', ('lat',))
+
+    #create the variables with their storage type, compression, and chunk shape:
+    chunksizes = binned_chunks(chunking = chunking, nlat = len(lat), nlon = len(lon))
+    storage = ['dtype', 'valid_range', 'zlib', 'complevel', 'shuffle']
+    for var in specs.keys():
+        spec = specs[var]
+        dtype = spec.get('dtype', 'f8')
+        vars[var] = nc.createVariable(var, '<' + dtype, ('time','lat','lon'), fill_value=netCDF4.default_fillvals[dtype],
+            zlib=spec.get('zlib', True), complevel=spec.get('complevel', 4), shuffle=spec.get('shuffle', True), chunksizes=chunksizes)
+
+        #set the scale factor and offset that pack the valid range into 2 byte integers from -32766 to 32766 (the fill value -32767 is kept out
+        #of the range) and save the packed range so that readers mask the values outside it:
+        if dtype == 'i2':
+            vmin, vmax = spec['valid_range']
+            setattr(vars[var], 'scale_factor', (vmax - vmin)/65532.)
+            setattr(vars[var], 'add_offset', (vmax + vmin)/2.)
+            setattr(vars[var], 'valid_min', np.int16(-32766))
+            setattr(vars[var], 'valid_max', np.int16(32766))
+
+        for a in spec.keys():
+            if a not in storage:
+                setattr(vars[var], a, spec[a])
+
+    for var_all in vars.keys():
+        vars[var_all].set_auto_maskandscale(True)
+
+    setattr(vars['lat'], 'units', 'degrees north')
+    setattr(vars['lon'], 'units', 'degrees east')
+    setattr(vars['time'], 'units', time_units)
+    setattr(vars['time'], 'calendar', calendar)
+
+    vars['lat'][:] = lat
+    vars['lon'][:] = lon
+
+    nc.close()
+
+def append_binned_netcdf(fields, time, output, it=None):
+
+    """
+    append_binned_netcdf(fields, time, output, it)
+
+        Function to append one or several time steps of binned fields to the end of the unlimited time dimension of a netCDF file created with
+        create_binned_netcdf. Values of a packed 'i2' variable outside its valid range are masked before they are written (see
+        create_binned_netcdf), since they would otherwise overflow the 2 byte integers and be read back as wrong values.
+
+        Parameters
+        ----------
+        fields : dictionary of numpy masked arrays for each variable in the file, either 2D (lat, lon) for one time step or 3D (time, lat, lon)
+               e.g. fields = {'swh': swh_bin, 'N': N}
+        time : datetime of the time step or list of datetimes of the time steps that are appended
+               e.g. time = datetime.datetime(1993, 1, 1)
+        output: filename of the netCDF file
+        it : time index of the first time step that is written. If it = None (default), the time steps are appended after the last complete time
+               step. An index of a time step that was already written overwrites that time step
+
+        Returns
+        -------
+        nt : number of time steps in the file after the fields are appended
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset, date2num
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset, date2num
+    import numpy as np
+
+    #open the file in append mode and find the next time index (the number of complete time steps, so a time step that was only partly written is overwritten):
+    nc = Dataset(output, 'a')
+    nt = np.ma.count(nc.variables['time'][:])
+    if it is None:
+        it = nt
+
+    #set the time steps that are written:
+    time_num = np.ravel(date2num(time, nc.variables['time'].units, nc.variables['time'].calendar))
+    n = len(time_num)
+
+    #write the fields first and the time steps last such that a time step only counts as written once its time exists (the file is closed after each call so that everything written so far is kept if the program stops):
+    for var in fields.keys():
+        field = np.ma.asarray(fields[var]).reshape((n,) + nc.variables[var].shape[1:])
+
+        #mask the values of packed variables that fall outside the packed range (and set them to the offset so that they can be cast):
+        v = nc.variables[var]
+        if v.dtype == np.int16 and 'scale_factor' in v.ncattrs():
+            packed = np.round((np.ma.getdata(field).astype(float) - getattr(v, 'add_offset', 0.))/v.scale_factor)
+            outside = ~((packed >= getattr(v, 'valid_min', -32766)) & (packed <= getattr(v, 'valid_max', 32766)))
+            field = np.ma.masked_array(np.where(outside, getattr(v, 'add_offset', 0.), np.ma.getdata(field)), mask=np.ma.getmaskarray(field) | outside)
+
+        v[it:it+n,:,:] = field
+    nc.variables['time'][it:it+n] = time_num
+    nt = max(nt, it + n)
+
+    nc.close()
+
+    return nt
+
+def save_binned_netcdf(fields, specs, lon, lat, time, output, chunking='map', time_units='days since 1900-01-01 00:00:00', calendar='standard'):
+
+    """
+    save_binned_netcdf(fields, specs, lon, lat, time, output, chunking, time_units, calendar)
+
+        Function to save binned (time, lat, lon) fields with longitude, latitude, and time variables into a compressed and chunked netCDF file
+        (see create_binned_netcdf). More time steps can be appended to the file later with append_binned_netcdf.
+
+        Parameters
+        ----------
+        fields : dictionary of 3D numpy masked arrays (time, lat, lon) of each variable
+               e.g. fields = {'swh': swh_d, 'wsp': wsp_d}
+        specs : dictionary of the spec of each variable (see create_binned_netcdf)
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+        time : list or numpy array of the datetimes of the time steps
+        output: filename (path to file and file's name)
+        chunking, time_units, calendar : see create_binned_netcdf
+
+        Returns
+        -------
+        NetCDF file in the directory specified by the path in the output variable
+
+        Libraries necessary to run function
+        -----------------------------------
+        None
+    """
+
+    #create the file and write every time step at once:
+    create_binned_netcdf(specs = specs, lon = lon, lat = lat, output = output, chunking = chunking, time_units = time_units, calendar = calendar)
+    append_binned_netcdf(fields = fields, time = list(time), output = output, it = 0)
@@ -0,0 +1,103 @@
+def create_stream_netcdf(input_vars, lon, lat, output):
+
+    """
+    create_stream_netcdf(input_vars, lon, lat, output)
+
+        Function to create an empty netCDF file with an unlimited time dimension that binned daily fields are appended to one day at a time
+        (see append_stream_netcdf)
+
+        Parameters
+        ----------
+        input_vars : dictionary of the variables to be saved where each variable is a dictionary of its attributes
+               e.g. input_vars = {'swh': {'units': 'm', 'long_name': 'corrected binned altimeter significant wave height'},
+                                  'N': {'units': 'count', 'long_name': 'number of along track observations in each grid cell'}}
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+        output: filename (path to file and file's name)
+               e.g. output = '/zdata/home/lcolosi/data/ifremer_p1_daily_data/ifremer_swh_wsp_daily_binned_data_93_16.nc'
+
+        Returns
+        -------
+        NetCDF file with lon, lat, an empty unlimited time dimension, and empty (time, lat, lon) variables
+
+        Libraries necessary to run function
+        -----------------------------------
+        writer : from save_binned_nc import create_binned_netcdf
+    """
+
+    #import libraries:
+    from save_binned_nc import create_binned_netcdf
+
+    #create the file with one chunk per day so that each appended day is written as one block:
+    create_binned_netcdf(specs = input_vars, lon = lon, lat = lat, output = output, chunking = 'map', time_units = 'days since 1900-01-01 00:00:00', calendar = 'standard')
+
+def append_stream_netcdf(fields, time, output, it=None):
+
+    """
+    append_stream_netcdf(fields, time, output, it)
+
+        Function to append one day of binned fields to the end of the unlimited time dimension of a netCDF file created with create_stream_netcdf
+
+        Parameters
+        ----------
+        fields : dictionary of 2D numpy masked arrays (lat, lon) for each variable in the file
+               e.g. fields = {'swh': swh_bin, 'N': N}
+        time : datetime of the day that is appended
+               e.g. time = datetime.datetime(1993, 1, 1)
+        output: filename of the netCDF file
+        it : time index to write the day to. If it = None (default), the day is appended after the last complete day. An index of a day that
+               was already written overwrites that day (e.g. to complete a time window that was only partly binned before resuming)
+
+        Returns
+        -------
+        nt : number of time steps in the file after the day is appended
+
+        Libraries necessary to run function
+        -----------------------------------
+        writer : from save_binned_nc import append_binned_netcdf
+    """
+
+    #import libraries:
+    from save_binned_nc import append_binned_netcdf
+
+    #append the day (the fields are written before the time step, see append_binned_netcdf):
+    nt = append_binned_netcdf(fields = fields, time = time, output = output, it = it)
+
+    return nt
+
+def last_stream_time(output):
+
+    """
+    last_stream_time(output)
+
+        Function to find the last day written to a netCDF file created with create_stream_netcdf in order to resume binning
+
+        Parameters
+        ----------
+        output: filename of the netCDF file
+
+        Returns
+        -------
+        time_last : datetime of the last day written to the file or None if no day has been written
+        nt : number of days written to the file
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset, num2date
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset, num2date
+    import numpy as np
+
+    #read the last complete time step (days whose time step was never written are ignored):
+    nc = Dataset(output, 'r')
+    nt = np.ma.count(nc.variables['time'][:])
+    if nt == 0:
+        time_last = None
+    else:
+        time_last = num2date(nc.variables['time'][nt-1], nc.variables['time'].units, nc.variables['time'].calendar)
+    nc.close()
+
+    return time_last, nt
@@ -1,48 +1,111 @@
-def shift_grid(data, lon, dlon):
+#in memory cache of the split points and shifted longitude axes of shift_grid (see shift_split):
+shift_cache = {}
+
+def shift_split(lon, dlon):
     """
-    shift_grid(data, lon, dlon)
-    
-        Function to shift gridded data horizontally to the right in order to center the geographic grid around a desired location
-        
-        Parameters 
+    shift_split(lon, dlon)
+
+        Function to find the column where a longitude axis is split to shift it by dlon degrees and the shifted longitude axis. The results are
+        cached by the size, start, and resolution of the axis and dlon, so they are only computed once for a record of daily fields on the same grid.
+        The cached longitude axis is returned as a read only array (copy it to modify it).
+
+        Parameters
         ----------
-        data : numpy 2D array of float data points that are desired to be shifted
-               e.g. print(swh.shape) => (133,360,) 
-        lon : numpy array column vector of longitude coordinates 
-        dlon : integer or float value corresponding to how many degrees of longitude are to be shifted 
-        
+        lon : numpy array column vector of longitude coordinates
+        dlon : integer or float value corresponding to how many degrees of longitude are to be shifted
+
         Returns
         -------
-        data_shift : 2D numpy array of shifted data
-        lon_shift : numpy array column vector shifted 
-        
+        nshift : number of columns moved from the start to the end of the longitude axis
+        lon_shift : read only numpy array column vector shifted (one value per column)
+
         Libraries necessary to run function
         -----------------------------------
         Numpy : import numpy as np
     """
-    
-    #import libraries: 
+
+    #import libraries:
     import numpy as np
-    
-    #initialize variables: 
+
+    #initialize variables:
     nlon = len(lon)
-    lon_min = np.min(lon)
-    lon_max = np.max(lon)
-    
-    #Determine the resolution of the longitude: 
-    dl = lon[1] -lon[0]
-    #determine how much to shift over by: 
-    nshift = int(round(dlon/dl))
-    
-    #set indices 
-    indxs_1, indxs_2 = np.arange(nshift,nlon,1), np.arange(0,nshift,1)
-    indxs = np.concatenate((indxs_1,indxs_2),axis=0)
-    
-    #transform indxs from a array to a list
-    indxs = indxs.tolist()
-    
-    #Apply to data and longitude vector: 
-    lon_shift = np.arange(lon_min+dlon, lon_max+dlon+1, dl)
-    data_shift = data[:,indxs]
-    
-    return data_shift, lon_shift
+    lon_min = float(np.min(lon))
+
+    #Determine the resolution of the longitude:
+    dl = float(lon[1] - lon[0])
+
+    #look up the split in the cache:
+    key = (nlon, lon_min, dl, dlon)
+    if key in shift_cache:
+        return shift_cache[key]
+
+    #determine how much to shift over by (a negative shift moves the columns the other way):
+    nshift = int(round(dlon/dl)) % nlon
+
+    #set the shifted longitude vector with one value per column:
+    lon_shift = lon_min + dlon + dl*np.arange(nlon)
+
+    #protect the cached longitude vector from changes by the callers:
+    lon_shift.setflags(write=False)
+
+    shift_cache[key] = (nshift, lon_shift)
+
+    return nshift, lon_shift
+
+def shift_grid(data, lon, dlon, out=None):
+    """
+    shift_grid(data, lon, dlon, out=None)
+
+        Function to shift gridded data horizontally to the right in order to center the geographic grid around a desired location. The shift is
+        applied along the last (longitude) axis, so a whole stack of fields (e.g. (time, lat, lon) or (variable, time, lat, lon)) is shifted in one
+        call. The shifted data is made of two contiguous block copies at the cached split point (see shift_split) instead of a fancy index.
+
+        Parameters
+        ----------
+        data : numpy 2D, 3D or 4D array (or masked array) of float data points that are desired to be shifted with longitude as the last axis
+               e.g. print(swh.shape) => (133,360,) or print(hs.shape) => (31,265,720)
+        lon : numpy array column vector of longitude coordinates
+        dlon : integer or float value corresponding to how many degrees of longitude are to be shifted
+        out : preallocated numpy array with the shape of data where the shifted data values are written (e.g. reused for every day of a
+              record), or None to create a new array
+
+        Returns
+        -------
+        data_shift : numpy array of shifted data (a masked array if data is a masked array)
+        lon_shift : read only numpy array column vector shifted (see shift_split)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #find the split point and the shifted longitude vector:
+    nshift, lon_shift = shift_split(lon = lon, dlon = dlon)
+    nlon = len(lon)
+
+    #a shift by a whole number of turns leaves the data unchanged (no copy unless out is given):
+    if nshift == 0 and out is None:
+        return data, lon_shift
+
+    #copy the two blocks of columns on either side of the split point:
+    data_v = np.ma.getdata(data)
+    if out is None:
+        out = np.empty_like(data_v)
+    out[..., :nlon-nshift] = data_v[..., nshift:]
+    out[..., nlon-nshift:] = data_v[..., :nshift]
+
+    #shift the mask in the same way:
+    if np.ma.isMaskedArray(data):
+        mask = np.ma.getmask(data)
+        if mask is not np.ma.nomask:
+            mask_shift = np.empty_like(mask)
+            mask_shift[..., :nlon-nshift] = mask[..., nshift:]
+            mask_shift[..., nlon-nshift:] = mask[..., :nshift]
+        else:
+            mask_shift = np.ma.nomask
+        return np.ma.masked_array(out, mask=mask_shift, fill_value=data.fill_value), lon_shift
+
+    return out, lon_shift
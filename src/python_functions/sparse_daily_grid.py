@@ -0,0 +1,284 @@
+def sparse_daily_grid(days, dim):
+
+    """
+    sparse_daily_grid(days, dim)
+
+        Function to store daily binned grids in a sparse form that only keeps the grid cells with data. A daily altimeter grid is mostly empty
+        (only the grid cells under the tracks of that day have data), so storing (cell index, value, count) for each day takes about an order of
+        magnitude less memory and disk than a dense masked (time, lat, lon) cube. The days are stored one after the other like a compressed
+        sparse row matrix: the data of day it are at positions day_start[it]:day_start[it+1].
+
+        Parameters
+        ----------
+        days : iterable of (time, data, N) for each day in order where data is a 2D numpy masked array (lat, lon) of binned data and N is a 2D
+               numpy masked array of the number of observations in each grid cell (or None)
+               e.g. days = [(day, data_bin['swh'], N) for day, data_bin, N in bin_l2p_days(...)] or zip(time_d, swhcor_d, N_d)
+        dim : dimesnions of the grid in the form of a list (dim = [lon, lat])
+               e.g. dim = [360, 133]
+
+        Returns
+        -------
+        sg : dictionary with the keys:
+            a) 'cell' : numpy int32 array of the flat cell index (lat_index*nlon + lon_index) of each stored value
+            b) 'value' : numpy array of the stored values
+            c) 'N' : numpy int32 array of the number of observations of each stored value (1 where N is None)
+            d) 'day_start' : numpy int64 array of length nt+1 of the position of the first value of each day
+            e) 'time' : numpy array of the time of each day
+            f) 'dim' : dimensions of the grid [nlon, nlat]
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize lists of the stored values of each day:
+    cell, value, count, time, day_start = [], [], [], [], [0]
+
+    #store the unmasked grid cells of each day:
+    for t, data, N in days:
+        data_v = np.ma.getdata(data).ravel()
+        valid = ~np.ma.getmaskarray(data).ravel() & np.isfinite(data_v)
+        ind = np.flatnonzero(valid)
+        cell.append(ind.astype(np.int32))
+        value.append(data_v[ind])
+        if N is None:
+            count.append(np.ones(len(ind), dtype=np.int32))
+        else:
+            count.append(np.ma.filled(N, 0).ravel()[ind].astype(np.int32))
+        time.append(t)
+        day_start.append(day_start[-1] + len(ind))
+
+    #concatenate the days:
+    sg = {}
+    sg['cell'] = np.concatenate(cell) if cell else np.array([], dtype=np.int32)
+    sg['value'] = np.concatenate(value) if value else np.array([])
+    sg['N'] = np.concatenate(count) if count else np.array([], dtype=np.int32)
+    sg['day_start'] = np.array(day_start, dtype=np.int64)
+    sg['time'] = np.array(time)
+    sg['dim'] = list(dim)
+
+    return sg
+
+def sparse_to_dense(sg, it0, it1):
+
+    """
+    sparse_to_dense(sg, it0, it1)
+
+        Function to convert the days it0 to it1 - 1 of a sparse daily grid back into a dense masked array
+
+        Parameters
+        ----------
+        sg : sparse daily grid (see sparse_daily_grid)
+        it0 : index of the first day
+        it1 : index after the last day
+               e.g. it0, it1 = 0, 1 (first day) or it0, it1 = 0, len(sg['time']) (all days)
+
+        Returns
+        -------
+        data : 3D numpy masked array (it1 - it0, lat, lon) of the data (masked where there is no data)
+        N : 3D numpy masked array (it1 - it0, lat, lon) of the number of observations
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #define dimensional variables:
+    nlon,nlat = sg['dim']
+    ncell = nlat*nlon
+    nt = it1 - it0
+
+    #find the stored values of the days and the day of each value relative to it0:
+    i0, i1 = sg['day_start'][it0], sg['day_start'][it1]
+    day = np.repeat(np.arange(nt), np.diff(sg['day_start'][it0:it1+1]))
+    flat = day*ncell + sg['cell'][i0:i1]
+
+    #scatter the values into the dense arrays:
+    data = np.ma.masked_all(nt*ncell)
+    N = np.ma.masked_all(nt*ncell)
+    data[flat] = sg['value'][i0:i1]
+    N[flat] = sg['N'][i0:i1]
+
+    return data.reshape((nt,nlat,nlon)), N.reshape((nt,nlat,nlon))
+
+def sparse_monthly_mean(sg):
+
+    """
+    sparse_monthly_mean(sg)
+
+        Function to average a sparse daily grid into monthly means of the daily values at each grid cell (the same average as taking the mean of
+        the daily masked arrays of each month). The work is proportional to the number of stored values rather than the number of grid cells.
+        A sparse daily grid without days gives empty outputs with no month.
+
+        Parameters
+        ----------
+        sg : sparse daily grid (see sparse_daily_grid) where sg['time'] holds datetime objects
+
+        Returns
+        -------
+        monthly_data : dictionary with the keys:
+            a) 'time' : list of (year, month) of each month from the first to the last month of the record
+            b) 'mean' : 3D numpy masked array (month, lat, lon) of the monthly mean (masked where no day of the month has data)
+            c) 'ndays' : 3D numpy array (month, lat, lon) of the number of days with data in each month
+            d) 'N' : 3D numpy array (month, lat, lon) of the total number of observations in each month
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #define dimensional variables:
+    nlon,nlat = sg['dim']
+    ncell = nlat*nlon
+
+    #compute the month of each day as an integer code (year*12 + month - 1) relative to the first month (no month without days):
+    codes = np.array([t.year*12 + t.month - 1 for t in sg['time']], dtype=np.int64)
+    code0 = codes.min() if len(codes) else 0
+    nmonth = codes.max() - code0 + 1 if len(codes) else 0
+
+    #find the month of each stored value and accumulate the sums and counts of each (month, grid cell):
+    month = np.repeat(codes - code0, np.diff(sg['day_start']))
+    flat = month*ncell + sg['cell']
+    data_sum = np.bincount(flat, weights=sg['value'], minlength=nmonth*ncell)
+    ndays = np.bincount(flat, minlength=nmonth*ncell)
+    N = np.bincount(flat, weights=sg['N'], minlength=nmonth*ncell)
+
+    #take the average:
+    monthly_data = {}
+    monthly_data['time'] = [(c//12, c%12 + 1) for c in range(code0, code0 + nmonth)]
+    monthly_data['mean'] = np.ma.masked_where(ndays == 0, data_sum)/np.ma.masked_where(ndays == 0, np.maximum(ndays, 1))
+    monthly_data['mean'] = monthly_data['mean'].reshape((nmonth,nlat,nlon))
+    monthly_data['ndays'] = ndays.reshape((nmonth,nlat,nlon))
+    monthly_data['N'] = N.reshape((nmonth,nlat,nlon))
+
+    return monthly_data
+
+def save_sparse_netcdf(sg, name, input_vars, lon, lat, output):
+
+    """
+    save_sparse_netcdf(sg, name, input_vars, lon, lat, output)
+
+        Function to save a sparse daily grid into a netCDF file as a CF contiguous ragged array (the values of each day are stored one after the
+        other along the 'obs' dimension and 'row_size' gives the number of values of each day). A netCDF dimension of length zero is unlimited, so
+        a sparse daily grid without values is saved with an 'obs' dimension of length one that only holds fill values (no day points to it).
+
+        Parameters
+        ----------
+        sg : sparse daily grid (see sparse_daily_grid) where sg['time'] holds datetime objects
+        name : name of the variable
+               e.g. name = 'swh'
+        input_vars : dictionary of the units and long_name of the variable
+               e.g. input_vars = {'units': 'm', 'long_name': 'corrected binned altimeter significant wave height'}
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+        output: filename (path to file and file's name)
+
+        Returns
+        -------
+        NetCDF file in the directory specified by the path in the output variable
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset, date2num
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset, date2num
+
+    nc = Dataset(output, 'w', format='NETCDF4')
+
+    time_units = 'days since 1900-01-01 00:00:00'
+    calendar = 'standard'
+
+    time_dim = nc.createDimension('time', len(sg['time']))
+    nobs = len(sg['cell'])
+    obs_dim = nc.createDimension('obs', max(nobs, 1))
+    lon_dim = nc.createDimension('lon', len(lon))
+    lat_dim = nc.createDimension('lat', len(lat))
+
+    vars={}
+    vars['time'] = nc.createVariable('time', '<f8', ('time',))
+    vars['lon'] = nc.createVariable('lon', '<f4', ('lon',))
+    vars['lat'] = nc.createVariable('lat', '<f4', ('lat',))
+    vars['row_size'] = nc.createVariable('row_size', '<i4', ('time',))
+    vars['cell'] = nc.createVariable('cell', '<i4', ('obs',), zlib=True)
+    vars[name] = nc.createVariable(name, '<f8', ('obs',), zlib=True)
+    vars['N'] = nc.createVariable('N', '<i4', ('obs',), zlib=True)
+
+    setattr(vars['lat'], 'units', 'degrees north')
+    setattr(vars['lon'], 'units', 'degrees east')
+    setattr(vars['time'], 'units', time_units)
+    setattr(vars['time'], 'calendar', calendar)
+    setattr(vars['row_size'], 'sample_dimension', 'obs')
+    setattr(vars['row_size'], 'long_name', 'number of grid cells with data on each day')
+    setattr(vars['cell'], 'long_name', 'flat grid cell index (lat_index*nlon + lon_index)')
+    setattr(vars['N'], 'long_name', 'number of along track observations in the grid cell')
+    for a in ['units', 'long_name']:
+        setattr(vars[name], a, input_vars[a])
+
+    vars['lat'][:] = lat
+    vars['lon'][:] = lon
+    vars['time'][:] = date2num(list(sg['time']), time_units, calendar)
+    vars['row_size'][:] = np.diff(sg['day_start'])
+    if nobs > 0:
+        vars['cell'][:] = sg['cell']
+        vars[name][:] = sg['value']
+        vars['N'][:] = sg['N']
+
+    nc.close()
+
+def read_sparse_netcdf(filename, name):
+
+    """
+    read_sparse_netcdf(filename, name)
+
+        Function to read a sparse daily grid saved with save_sparse_netcdf
+
+        Parameters
+        ----------
+        filename : path to the netCDF file
+        name : name of the variable
+               e.g. name = 'swh'
+
+        Returns
+        -------
+        sg : sparse daily grid (see sparse_daily_grid) where sg['time'] holds datetime objects
+        lon : numpy array column vector of longitude coordinates
+        lat : numpy array column vector of latitude coordinates
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset, num2date
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset, num2date
+
+    #read the ragged array (only the values that belong to a day, see save_sparse_netcdf):
+    nc = Dataset(filename, 'r')
+    lon = nc.variables['lon'][:]
+    lat = nc.variables['lat'][:]
+    sg = {}
+    sg['day_start'] = np.concatenate([[0], np.cumsum(nc.variables['row_size'][:])]).astype(np.int64)
+    nobs = sg['day_start'][-1]
+    sg['cell'] = np.asarray(nc.variables['cell'][:nobs])
+    sg['value'] = np.asarray(nc.variables[name][:nobs])
+    sg['N'] = np.asarray(nc.variables['N'][:nobs])
+    sg['time'] = num2date(nc.variables['time'][:], nc.variables['time'].units, nc.variables['time'].calendar)
+    sg['dim'] = [len(lon), len(lat)]
+    nc.close()
+
+    return sg, lon, lat
@@ -9,7 +9,8 @@ def stat_moments_temporal(data, date_time, task):
         ----------
         data : numpy masked array row vector of temporal data at a single latitude or longitude grid point or a numpy 3D array whaere the climatology is calculated at each grid point 
                e.g. print(data.shape) => (8766,) or print(data.shape) => (8766,133, 360)
-        date_time : numpy 2D array of date_time values which correspond to the time series of the data set
+        date_time : numpy 2D array of date_time values which correspond to the time series of the data set, or the time index of the data set
+               (see time_index), which avoids decoding the months of every time step from datetime values
         task : choose between computing the seasonal progression or monthly progression. Options include: 
                task = monthly or task = seasonally
                
@@ -20,14 +21,15 @@ def stat_moments_temporal(data, date_time, task):
         Libraries necessary to run function
         ---------------------------
         Numpy: import numpy as np
+        time index: from time_index import time_field
+        climatology groups: from climatology_groups import grouping_labels
     """
     
     #import library
     import numpy as np 
+    from time_index import time_field
+    from climatology_groups import grouping_labels
     
-    #set year and month 2D time arrays that correspond to the year and month at which swh data point was collected (time series indice array for year and month)
-    months = np.array([m.month for m in date_time])
-
     #initialize the dictionary that will hold all the resulting monthly mean, std, median, and nobs data
     monthly_data = {}
     monthly_data = {'month(s)': [],'data':[],'mean': [],'median': [],'var': [],'skew':[],'kurt':[],'N': [] }
@@ -35,6 +37,9 @@ def stat_moments_temporal(data, date_time, task):
     #case 1: monthly progression
     if task == 'monthly':
         
+        #set the month of each time step (time series indice array for month)
+        months = time_field(date_time = date_time, field = 'month')
+
         #initialize a month loop that will go through each month 1 to 12 
         for m in range(1,13):
 
@@ -79,21 +84,14 @@ def stat_moments_temporal(data, date_time, task):
             
     elif task == 'seasonally':
 
-        #initialize variables
-        seasons = [[12,1,2], [3,4,5], [6,7,8], [9,10,11]]
+        #label the time steps with their season (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON):
+        seasons, names = grouping_labels(date_time = date_time, grouping = 'seasonal')
 
-        #initialize a seasonal loop that will go through each month 1 to 12 
+        #initialize a seasonal loop that will go through each season
         for s in range(0,4):
 
-            #call season:
-            season = seasons[s]
-
-            #initialize the indices where the months vector elements are equal to the month value of the loop. Therefore, we obtain all the 2D arrays of swh wave height data that has been collected during the month of January, February, etc. in our given time series. 
-            bool_1 = months==season[0]
-            bool_2 = months==season[1]
-            bool_3 = months==season[2]
-            ind_1 = bool_1 | bool_2
-            ind = ind_1 |bool_3
+            #initialize the indices of the time steps of the season:
+            ind = seasons == s
 
             #save the time step of the month in the dictionary as a list 
             monthly_data['month(s)'].append(s)
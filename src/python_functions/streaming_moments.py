@@ -0,0 +1,231 @@
+def moments_accumulate(data, labels, ngroup):
+
+    """
+    moments_accumulate(data, labels, ngroup)
+
+        Function to accumulate the count, mean, and central moment sums up to order 4 of a chunk of temporal data at each grid point for each
+        group of time steps (e.g. calendar month or season). The moments of each group are computed about the group mean of the chunk (two passes
+        over the chunk), which avoids the cancellation of the raw moment formulas, and accumulators of different chunks are combined with the
+        parallel merge of merge_moments, so a long record can be reduced one chunk at a time.
+
+        Parameters
+        ----------
+        data : numpy array (or masked array) of temporal data with time as the first axis (masked and NaN values are ignored)
+               e.g. print(data.shape) => (365,133,360)
+        labels : numpy integer array of the group (0 to ngroup - 1) of each time step
+               e.g. labels = time_field(date_time = index, field = 'month') - 1
+        ngroup : number of groups
+               e.g. ngroup = 12
+
+        Returns
+        -------
+        acc : dictionary of numpy arrays (group, ...) with the keys:
+            a) 'N' : number of valid data points
+            b) 'mean' : mean of the valid data points
+            c) 'M2', 'M3', 'M4' : sums of the second, third, and fourth powers of the deviations from the mean
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #sort the time steps by group (the sort is skipped when they are already in order):
+    labels = np.asarray(labels)
+    if np.any(np.diff(labels) < 0):
+        order = np.argsort(labels, kind='stable')
+        labels = labels[order]
+        data = data[order]
+    groups, start, count_t = np.unique(labels, return_index=True, return_counts=True)
+
+    #set the valid data points and zero the invalid ones:
+    values = np.ma.getdata(data).astype(float)
+    valid = ~np.ma.getmaskarray(data) & np.isfinite(values)
+    values[~valid] = 0.
+
+    #initialize the accumulator:
+    shape = (ngroup,) + values.shape[1:]
+    acc = {}
+    for key in ['N', 'mean', 'M2', 'M3', 'M4']:
+        acc[key] = np.zeros(shape)
+    if len(groups) == 0:
+        return acc
+
+    #count the valid data points and compute the mean of each group:
+    N = np.add.reduceat(valid.view(np.uint8), start, axis=0, dtype=float)
+    mean = np.divide(np.add.reduceat(values, start, axis=0), N, out=np.zeros(N.shape), where=N>0)
+    acc['N'][groups] = N
+    acc['mean'][groups] = mean
+
+    #sum the powers of the deviations from the group mean:
+    dev = np.where(valid, values - np.repeat(mean, count_t, axis=0), 0.)
+    dev_p = dev*dev
+    acc['M2'][groups] = np.add.reduceat(dev_p, start, axis=0)
+    dev_p *= dev
+    acc['M3'][groups] = np.add.reduceat(dev_p, start, axis=0)
+    dev_p *= dev
+    acc['M4'][groups] = np.add.reduceat(dev_p, start, axis=0)
+
+    return acc
+
+def merge_moments(accs):
+
+    """
+    merge_moments(accs)
+
+        Function to merge moment accumulators of the same groups on the same grid (e.g. from consecutive chunks or from several files) with the
+        pairwise update formulas of Chan et al. (1979) and Pebay (2008). The merge is exact up to round off and does not depend on the order in
+        which the accumulators are merged.
+
+        Parameters
+        ----------
+        accs : list of accumulators (dictionaries with the keys 'N', 'mean', 'M2', 'M3', and 'M4' as returned by moments_accumulate)
+               e.g. accs = [acc_1993, acc_1994]
+
+        Returns
+        -------
+        acc : merged accumulator
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #initialize the merged accumulator with a copy of the first accumulator:
+    acc = {}
+    for key in ['N', 'mean', 'M2', 'M3', 'M4']:
+        acc[key] = np.array(accs[0][key], dtype=float)
+
+    #merge the other accumulators one at a time:
+    for acc_b in accs[1:]:
+        na, nb = acc['N'], acc_b['N']
+        n = na + nb
+        n_1 = np.divide(1., n, out=np.zeros(n.shape), where=n>0)
+        delta = acc_b['mean'] - acc['mean']
+        delta_n = delta*n_1
+        M2a, M3a = acc['M2'], acc['M3']
+
+        #update the fourth, third, and second moment sums (in this order, since each uses the lower moments of both accumulators):
+        acc['M4'] = (acc['M4'] + acc_b['M4'] + delta*delta_n**3*na*nb*(na*na - na*nb + nb*nb)
+                     + 6*delta_n**2*(na*na*acc_b['M2'] + nb*nb*M2a) + 4*delta_n*(na*acc_b['M3'] - nb*M3a))
+        acc['M3'] = M3a + acc_b['M3'] + delta*delta_n**2*na*nb*(na - nb) + 3*delta_n*(na*acc_b['M2'] - nb*M2a)
+        acc['M2'] = M2a + acc_b['M2'] + delta*delta_n*na*nb
+        acc['mean'] = acc['mean'] + delta_n*nb
+        acc['N'] = n
+
+    return acc
+
+def finalize_moments(acc):
+
+    """
+    finalize_moments(acc)
+
+        Function to turn a moment accumulator into the mean, variance, skewness, and excess kurtosis of the data of each group at each grid point
+        (the same definitions as stat_moments_temporal: moments normalized by N)
+
+        Parameters
+        ----------
+        acc : moment accumulator (dictionary with the keys 'N', 'mean', 'M2', 'M3', and 'M4')
+
+        Returns
+        -------
+        stats : dictionary of numpy masked arrays (group, ...) (masked where there is no data) with the keys:
+            a) 'mean' : mean
+            b) 'var' : variance
+            c) 'skew' : skewness
+            d) 'kurt' : excess kurtosis (kurtosis - 3)
+            e) 'N' : number of data points
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #mask the groups and grid points without data:
+    empty = acc['N'] == 0
+    N = np.ma.masked_where(empty, acc['N'])
+
+    #compute the moments (the skewness and kurtosis are masked where the variance is zero):
+    stats = {}
+    stats['mean'] = np.ma.masked_where(empty, acc['mean'])
+    stats['var'] = np.ma.masked_where(empty, acc['M2'])/N
+    stats['skew'] = (np.ma.masked_where(empty, acc['M3'])/N)/np.ma.masked_less_equal(stats['var'], 0)**1.5
+    stats['kurt'] = (np.ma.masked_where(empty, acc['M4'])/N)/np.ma.masked_less_equal(stats['var'], 0)**2 - 3
+    stats['N'] = N.astype(int)
+
+    return stats
+
+def moments_stream(filenames, variable, task, chunk):
+
+    """
+    moments_stream(filenames, variable, task, chunk)
+
+        Function to compute the monthly or seasonal climatology of the mean, variance, skewness, and kurtosis of a daily binned variable at each
+        grid point in a single pass over one or several netCDF files. The files are read chunk by chunk (only one chunk is held in memory) and the
+        months or seasons of the time steps come from the cached time index of each file (see time_index), so WW3, CCMP, and Ifremer files are
+        reduced in the same way and give maps on the same footing as stat_moments_temporal without holding the record or copies of its groups.
+
+        Parameters
+        ----------
+        filenames : netCDF file or list of netCDF files (e.g. yearly files) of the binned data with the variables time and (time, lat, lon) variable
+               e.g. filenames = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        variable : name of the variable
+               e.g. variable = 'hs'
+        task : choose between computing the seasonal progression or monthly progression. Options include:
+               task = 'monthly' or task = 'seasonally'
+        chunk : number of time steps read at a time
+               e.g. chunk = 365
+
+        Returns
+        -------
+        monthly_data : dictionary with the keys:
+            a) 'month(s)' : numpy array of the months (1 to 12) or seasons (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON)
+            b) 'mean', 'var', 'skew', 'kurt', 'N' : numpy masked arrays (month or season, lat, lon) (see finalize_moments)
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+        time index : from time_index import time_index
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset
+    from time_index import time_index
+
+    #set the groups of the task:
+    if task == 'monthly':
+        field, offset, groups = 'month', 1, np.arange(1, 13)
+    elif task == 'seasonally':
+        field, offset, groups = 'season', 0, np.arange(0, 4)
+    else:
+        raise ValueError("task should be 'monthly' or 'seasonally'")
+
+    if isinstance(filenames, str):
+        filenames = [filenames]
+
+    #accumulate the moments of each chunk of each file and merge them into the running accumulator:
+    acc = None
+    for filename in filenames:
+        labels = time_index(filename = filename)[field] - offset
+        nc = Dataset(filename, 'r')
+        var = nc.variables[variable]
+        for it in range(0, var.shape[0], chunk):
+            acc_c = moments_accumulate(data = var[it:it+chunk], labels = labels[it:it+chunk], ngroup = len(groups))
+            acc = acc_c if acc is None else merge_moments(accs = [acc, acc_c])
+        nc.close()
+
+    #compute the moments:
+    monthly_data = finalize_moments(acc = acc)
+    monthly_data['month(s)'] = groups
+
+    return monthly_data
@@ -0,0 +1,260 @@
+#in memory cache of the time indices of netCDF files (see time_index):
+time_index_cache = {}
+
+def decode_time_index(time_num, units, calendar):
+
+    """
+    decode_time_index(time_num, units, calendar)
+
+        Function to decode numeric netCDF times into integer arrays of the calendar fields of each time step. For the standard (gregorian),
+        proleptic gregorian, and julian calendars the dates are computed with integer day number arithmetic on the whole array at once, so no
+        datetime object is created. Other calendars, units that cannot be parsed, and standard calendar dates before the 1582-10-15 switch to the
+        gregorian calendar are decoded with num2date instead.
+
+        Parameters
+        ----------
+        time_num : numpy array of the numeric times of the netCDF time variable
+               e.g. time_num = nc.variables['time'][:]
+        units : units of the time variable
+               e.g. units = 'days since 1900-01-01 00:00:00'
+        calendar : calendar of the time variable
+               e.g. calendar = 'standard' or calendar = 'julian'
+
+        Returns
+        -------
+        index : dictionary with the following keys:
+            a) 'time_num', 'units', 'calendar' : the numeric times, units, and calendar that were decoded
+            b) 'days' : numpy float array of the days since the reference date of the units
+            c) 'year', 'month', 'day', 'doy' : numpy integer arrays of the year, month (1 to 12), day of the month, and day of the year (1 to 366)
+            d) 'season' : numpy integer array of the season (0 = DJF, 1 = MAM, 2 = JJA, 3 = SON)
+            e) 'month_code' : numpy integer array of the month group code year*12 + (month - 1)
+            f) 'season_code' : numpy integer array of the season group code year*4 + season, where December counts towards the DJF season of the
+               following year
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        re : import re
+        NetCDF : from netCDF4 import num2date
+    """
+
+    #import libraries:
+    import re
+    import numpy as np
+    from netCDF4 import num2date
+
+    #initialize the time index:
+    time_num = np.asarray(np.ma.getdata(time_num), dtype=float).ravel()
+    calendar = calendar.lower()
+    index = {'time_num': time_num, 'units': units, 'calendar': calendar}
+
+    #set the length of one time unit in microseconds:
+    unit_us = {'days': 86400e6, 'day': 86400e6, 'd': 86400e6, 'hours': 3600e6, 'hour': 3600e6, 'hrs': 3600e6, 'hr': 3600e6, 'h': 3600e6,
+               'minutes': 60e6, 'minute': 60e6, 'mins': 60e6, 'min': 60e6, 'seconds': 1e6, 'second': 1e6, 'secs': 1e6, 'sec': 1e6, 's': 1e6}
+
+    #parse the units (e.g. 'days since 1900-01-01 00:00:00'):
+    match = re.match(r'\s*(\w+)\s+since\s+(-?\d+)-(\d+)-(\d+)(?:[ T](\d+):(\d+)(?::(\d+(?:\.\d*)?))?)?\s*(?:Z|UTC|[+-]0+:?0*)?\s*$', units)
+    fast = match is not None and match.group(1).lower() in unit_us and calendar in ['standard', 'gregorian', 'proleptic_gregorian', 'julian']
+
+    if fast:
+
+        #set the day number of the reference date and its time of day in microseconds:
+        Y0, M0, D0 = int(match.group(2)), int(match.group(3)), int(match.group(4))
+        us0 = (int(match.group(5) or 0)*3600 + int(match.group(6) or 0)*60 + float(match.group(7) or 0))*1e6
+        greg = calendar != 'julian'
+        jdn0 = day_number(year = Y0, month = M0, day = D0, gregorian = greg)
+
+        #compute the day number and time of day of each time step in whole microseconds (so times at midnight are not rounded down a day):
+        us = np.round(time_num*unit_us[match.group(1).lower()] + us0).astype(np.int64)
+        jdn = jdn0 + us//86400000000
+
+        #the standard calendar is only gregorian from 1582-10-15 (day number 2299161) on:
+        if calendar in ['standard', 'gregorian'] and (jdn0 < 2299161 or (len(jdn) and jdn.min() < 2299161)):
+            fast = False
+
+    if fast:
+
+        #convert the day numbers to dates:
+        year, month, day = day_number_date(jdn = jdn, gregorian = greg)
+        doy = jdn - day_number(year = year, month = np.ones_like(year), day = np.ones_like(year), gregorian = greg) + 1
+
+    else:
+
+        #decode other calendars with datetime objects (one pass over the time steps):
+        date_time = num2date(time_num, units, calendar)
+        year = np.fromiter((t.year for t in date_time), dtype=np.int64, count=len(date_time))
+        month = np.fromiter((t.month for t in date_time), dtype=np.int64, count=len(date_time))
+        day = np.fromiter((t.day for t in date_time), dtype=np.int64, count=len(date_time))
+        doy = np.fromiter((t.timetuple().tm_yday for t in date_time), dtype=np.int64, count=len(date_time))
+
+    #set the days since the reference date, the calendar fields, and the group codes:
+    index['days'] = time_num*unit_us.get(units.split()[0].lower(), 86400e6)/86400e6
+    index['year'] = year
+    index['month'] = month
+    index['day'] = day
+    index['doy'] = doy
+    index['season'] = (month % 12)//3
+    index['month_code'] = year*12 + month - 1
+    index['season_code'] = (year + (month == 12))*4 + index['season']
+
+    return index
+
+def day_number(year, month, day, gregorian):
+
+    """
+    day_number(year, month, day, gregorian)
+
+        Function to compute the julian day number of dates (the number of days since noon of 4713-01-01 BC in the julian calendar)
+
+        Parameters
+        ----------
+        year, month, day : integers or numpy integer arrays of the dates
+        gregorian : True for dates of the (proleptic) gregorian calendar or False for dates of the julian calendar
+
+        Returns
+        -------
+        jdn : integer or numpy integer array of the julian day number of each date
+
+        Libraries necessary to run function
+        -----------------------------------
+        None
+    """
+
+    #count the years from March so that the leap day is the last day of the year:
+    a = (14 - month)//12
+    y = year + 4800 - a
+    m = month + 12*a - 3
+
+    #case 1: gregorian calendar
+    if gregorian:
+        jdn = day + (153*m + 2)//5 + 365*y + y//4 - y//100 + y//400 - 32045
+    #case 2: julian calendar
+    else:
+        jdn = day + (153*m + 2)//5 + 365*y + y//4 - 32083
+
+    return jdn
+
+def day_number_date(jdn, gregorian):
+
+    """
+    day_number_date(jdn, gregorian)
+
+        Function to convert julian day numbers to dates (inverse of day_number)
+
+        Parameters
+        ----------
+        jdn : numpy integer array of julian day numbers
+        gregorian : True for dates of the (proleptic) gregorian calendar or False for dates of the julian calendar
+
+        Returns
+        -------
+        year, month, day : numpy integer arrays of the dates
+
+        Libraries necessary to run function
+        -----------------------------------
+        None
+    """
+
+    #case 1: gregorian calendar (remove the centuries that are not leap years)
+    if gregorian:
+        a = jdn + 32044
+        b = (4*a + 3)//146097
+        c = a - 146097*b//4
+    #case 2: julian calendar
+    else:
+        b = 0
+        c = jdn + 32082
+
+    #find the year counted from March and the day of that year:
+    d = (4*c + 3)//1461
+    e = c - 1461*d//4
+    m = (5*e + 2)//153
+
+    #convert back to calendar years that start in January:
+    day = e - (153*m + 2)//5 + 1
+    month = m + 3 - 12*(m//10)
+    year = 100*b + d - 4800 + m//10
+
+    return year, month, day
+
+def time_index(filename, time_var='time'):
+
+    """
+    time_index(filename, time_var)
+
+        Function to read and decode the time variable of a netCDF file into a time index (see decode_time_index). The index is cached by the
+        absolute path, modification time, and size of the file and the name of the time variable, so the time axis of a file is only decoded once
+        per program no matter how many functions group its time steps.
+
+        Parameters
+        ----------
+        filename : path to the netCDF file
+               e.g. filename = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        time_var : name of the time variable (default 'time')
+
+        Returns
+        -------
+        index : time index of the file (see decode_time_index)
+
+        Libraries necessary to run function
+        -----------------------------------
+        os : import os
+        NetCDF : from netCDF4 import Dataset
+    """
+
+    #import libraries:
+    import os
+    from netCDF4 import Dataset
+
+    #look up the index in the cache:
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, time_var)
+    if key in time_index_cache:
+        return time_index_cache[key]
+
+    #read and decode the time variable:
+    nc = Dataset(path, 'r')
+    time = nc.variables[time_var]
+    index = decode_time_index(time_num = time[:], units = time.units, calendar = getattr(time, 'calendar', 'standard'))
+    nc.close()
+
+    time_index_cache[key] = index
+
+    return index
+
+def time_field(date_time, field):
+
+    """
+    time_field(date_time, field)
+
+        Function to get an integer calendar field of every time step either from a time index (no per element work) or from an array of datetime
+        (or cftime) values (one pass over the time steps), so that the temporal grouping functions accept both
+
+        Parameters
+        ----------
+        date_time : time index (see time_index and decode_time_index) or numpy array of datetime values of the time series
+        field : name of the field. Options include 'year', 'month', 'day', 'doy', 'season', 'month_code', or 'season_code'
+
+        Returns
+        -------
+        values : numpy integer array of the field of each time step
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+    """
+
+    #import libraries:
+    import numpy as np
+
+    #case 1: time index
+    if isinstance(date_time, dict):
+        return date_time[field]
+
+    #case 2: datetime values
+    get = {'year': lambda t: t.year, 'month': lambda t: t.month, 'day': lambda t: t.day, 'doy': lambda t: t.timetuple().tm_yday,
+           'season': lambda t: (t.month % 12)//3, 'month_code': lambda t: t.year*12 + t.month - 1,
+           'season_code': lambda t: (t.year + (t.month == 12))*4 + (t.month % 12)//3}[field]
+
+    return np.fromiter((get(t) for t in date_time), dtype=np.int64, count=len(date_time))
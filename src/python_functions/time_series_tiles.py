@@ -0,0 +1,193 @@
+def write_time_series_tiles(filename, variable, output, tile, rows=None):
+
+    """
+    write_time_series_tiles(filename, variable, output, tile, rows)
+
+        Function to write a transposed copy of a binned (time, lat, lon) variable laid out as (cell, time), where cell is the flat grid cell index
+        lat_index*nlon + lon_index. The copy is chunked in tiles of tile grid cells by the whole record, so the full time series of a grid cell or
+        of a tile of neighbouring grid cells is one contiguous compressed block instead of one value in every daily map. The values are copied
+        as stored in the source file (same type, fill value, and scale_factor and add_offset of packed variables), so the copy is exact and
+        no larger than the source. The source file is read in bands of latitude rows to keep memory bounded, and each band is read in blocks of
+        whole time chunks of the source. The bands of a source chunked in tiles (e.g. chunking = 'time_series' in create_binned_netcdf) are
+        aligned with its latitude chunks, so each chunk is decompressed once. A source chunked in daily maps is decompressed once per band (use
+        as few bands as the memory allows), and a contiguous source is read band by band without decompression.
+
+        Parameters
+        ----------
+        filename : path to the netCDF file of the binned data with the variables time, lat, lon, and the (time, lat, lon) variable
+               e.g. filename = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc'
+        variable : name of the variable
+               e.g. variable = 'swh'
+        output : filename of the transposed copy
+               e.g. output = '/zdata/home/lcolosi/data/ww3_hs_daily_time_series_tiles_93_16.nc'
+        tile : number of grid cells in each chunk of the copy
+               e.g. tile = 64
+        rows : number of latitude rows read from the source file at a time (the memory used is about rows*nlon*ntime times the size of the
+               stored type in bytes). For a source chunked in tiles smaller than the grid, rows is rounded up to a multiple of the latitude chunk
+               size. If rows = None (default), the bands are the latitude chunks of a source chunked in tiles, and otherwise the largest bands
+               of at most 1 GB (at least one row)
+               e.g. rows = 16
+
+        Returns
+        -------
+        NetCDF file with the dimensions (cell, time) and the variables time, lat, lon, and the (cell, time) variable
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+                 import netCDF4
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset
+    import netCDF4
+
+    #call the dimensions and the stored type, fill value, and chunk shape of the source variable (the values are copied as stored):
+    src = Dataset(filename, 'r')
+    src_var = src.variables[variable]
+    src_var.set_auto_maskandscale(False)
+    nt, nlat, nlon = src_var.shape
+    ncell = nlat*nlon
+    dtype = src_var.dtype
+    if '_FillValue' in src_var.ncattrs():
+        fill_value = src_var.getncattr('_FillValue')
+    else:
+        fill_value = netCDF4.default_fillvals[dtype.str[1:]]
+    chunks = src_var.chunking()
+
+    #set the time steps read at a time as whole time chunks of the source (about a year of daily maps) and the latitude chunk size:
+    if chunks == 'contiguous':
+        ct, cl = min(nt, 365), None
+    else:
+        ct, cl = chunks[0]*max(1, 365//chunks[0]), chunks[1]
+
+    #set the latitude rows of each band (a multiple of the latitude chunk size for a source chunked in tiles, and otherwise as given or the
+    #largest band of at most 1 GB):
+    if cl is not None and cl < nlat:
+        rows = cl if rows is None else min(-(-rows//cl)*cl, nlat)
+    elif rows is None:
+        rows = int(min(max(1e9//(nlon*nt*dtype.itemsize), 1), nlat))
+    else:
+        rows = min(rows, nlat)
+
+    nc = Dataset(output, 'w', format='NETCDF4')
+
+    cell_dim = nc.createDimension('cell', ncell)
+    time_dim = nc.createDimension('time', nt)
+    lon_dim = nc.createDimension('lon', nlon)
+    lat_dim = nc.createDimension('lat', nlat)
+
+    vars={}
+    vars['time'] = nc.createVariable('time', '<f8', ('time',))
+    vars['lon'] = nc.createVariable('lon', '<f4', ('lon',))
+    vars['lat'] = nc.createVariable('lat', '<f4', ('lat',))
+
+    #chunk the variable in tiles of grid cells by the whole record with the stored type and attributes of the source:
+    vars[variable] = nc.createVariable(variable, dtype, ('cell','time'), fill_value=fill_value, zlib=True, complevel=4, shuffle=True,
+        chunksizes=(min(tile, ncell), nt))
+    vars[variable].set_auto_maskandscale(False)
+    for a in src_var.ncattrs():
+        if a != '_FillValue':
+            setattr(vars[variable], a, src_var.getncattr(a))
+    setattr(vars[variable], 'cell', 'flat grid cell index lat_index*nlon + lon_index')
+
+    setattr(vars['lat'], 'units', 'degrees north')
+    setattr(vars['lon'], 'units', 'degrees east')
+    for a in ['units', 'calendar']:
+        if a in src.variables['time'].ncattrs():
+            setattr(vars['time'], a, src.variables['time'].getncattr(a))
+
+    vars['lat'][:] = src.variables['lat'][:]
+    vars['lon'][:] = src.variables['lon'][:]
+    vars['time'][:] = src.variables['time'][:]
+
+    #transpose the source file one band of latitude rows at a time, reading each band in blocks of whole time chunks of the source:
+    band = np.empty((rows*nlon, nt), dtype=dtype)
+    for r0 in range(0, nlat, rows):
+        r1 = min(r0 + rows, nlat)
+        n = (r1 - r0)*nlon
+        for t0 in range(0, nt, ct):
+            t1 = min(t0 + ct, nt)
+            band[:n,t0:t1] = src_var[t0:t1,r0:r1,:].reshape((t1 - t0, n)).T
+        vars[variable][r0*nlon:r1*nlon,:] = band[:n]
+
+    src.close()
+    nc.close()
+
+def read_time_series_tiles(filename, variable, ncells):
+
+    """
+    read_time_series_tiles(filename, variable, ncells)
+
+        Generator that streams the full time series of blocks of neighbouring grid cells from a transposed copy written with
+        write_time_series_tiles, so that per cell analyses (e.g. least square fits or statistical moments) read contiguous blocks
+
+        Parameters
+        ----------
+        filename : path to the transposed copy
+        variable : name of the variable
+               e.g. variable = 'swh'
+        ncells : number of grid cells yielded at a time (a multiple of the tile size of the copy reads whole chunks)
+               e.g. ncells = 720
+
+        Yields
+        -------
+        cells : numpy integer array of the flat grid cell indices of the block (lat_index*nlon + lon_index)
+        data : 2D numpy masked array (cell, time) of the time series of each grid cell of the block
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        NetCDF : from netCDF4 import Dataset
+    """
+
+    #import libraries:
+    import numpy as np
+    from netCDF4 import Dataset
+
+    #read the blocks of grid cells in order:
+    nc = Dataset(filename, 'r')
+    ncell = len(nc.dimensions['cell'])
+    try:
+        for c0 in range(0, ncell, ncells):
+            c1 = min(c0 + ncells, ncell)
+            yield np.arange(c0, c1), nc.variables[variable][c0:c1,:]
+    finally:
+        nc.close()
+
+def read_cell_series(filename, variable, ilat, ilon):
+
+    """
+    read_cell_series(filename, variable, ilat, ilon)
+
+        Function to read the full time series of one grid cell from a transposed copy written with write_time_series_tiles (one chunk is read)
+
+        Parameters
+        ----------
+        filename : path to the transposed copy
+        variable : name of the variable
+               e.g. variable = 'swh'
+        ilat, ilon : latitude and longitude indices of the grid cell
+               e.g. ilat, ilon = 100, 230
+
+        Returns
+        -------
+        data : numpy masked array of the time series of the grid cell
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset
+
+    #read the row of the grid cell:
+    nc = Dataset(filename, 'r')
+    nlon = len(nc.dimensions['lon'])
+    data = nc.variables[variable][ilat*nlon + ilon,:]
+    nc.close()
+
+    return data
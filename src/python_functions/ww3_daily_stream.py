@@ -0,0 +1,188 @@
+def ww3_daily_file(filename, product, steps_per_day, lat_range, chunk):
+
+    """
+    ww3_daily_file(filename, product, steps_per_day, lat_range, chunk)
+
+        Function to read one monthly WW3 CFSR file of a product within a latitude band and average its 3 hourly fields into daily means (see
+        mean_mask_daily). The file is read chunk by chunk as netCDF hyperslabs (see hyperslab_chunks), so the polar rows outside of the band are
+        never read and only one chunk of 3 hourly fields is held in memory. Only the full days of the file are kept, as in the WW3 binning program.
+
+        Parameters
+        ----------
+        filename : path to the monthly WW3 netCDF file
+        product : WW3 product of the file. Options include:
+               product = 'hs' => significant wave height read from the variable 'hs'
+               product = 'wnd' => wind speed computed from the wind velocity components 'uwnd' and 'vwnd'
+               product = 'fp' => peak frequency read from the variable 'fp'
+        steps_per_day : number of time steps in one day
+               e.g. steps_per_day = 8
+        lat_range : list of the southern and northern latitude limits that are read
+               e.g. lat_range = [-66, 66]
+        chunk : number of days read at a time
+               e.g. chunk = 8
+
+        Returns
+        -------
+        time_d : list of datetimes of the first time step of each day
+        data_d : 3D numpy masked array (day, lat, lon) of daily means
+
+        Libraries necessary to run function
+        -----------------------------------
+        Numpy : import numpy as np
+        hyperslab reader : from hyperslab_reader import hyperslab_chunks
+        temporal mean : from mean_temporal_masked_data import mean_mask_daily
+    """
+
+    #import libraries:
+    import numpy as np
+    from hyperslab_reader import hyperslab_chunks
+    from mean_temporal_masked_data import mean_mask_daily
+
+    #set the variables of the product:
+    if product == 'wnd':
+        variables = ['uwnd', 'vwnd']
+    else:
+        variables = [product]
+
+    #read the file one chunk of days at a time and average the full days of each chunk:
+    time_d, data_d = [], []
+    for time_c, data_c in hyperslab_chunks(filenames = [filename], variables = variables, lat_range = lat_range, chunk = chunk*steps_per_day):
+        if product == 'wnd':
+            data = np.ma.sqrt(data_c['uwnd']**2 + data_c['vwnd']**2)
+        else:
+            data = data_c[product]
+        nday = len(time_c)//steps_per_day
+        if nday == 0:
+            continue
+        data_mean, data_nc = mean_mask_daily(data = data[:nday*steps_per_day,:,:], steps_per_day = steps_per_day)
+        data_d.append(data_mean)
+        time_d.extend([time_c[iday*steps_per_day] for iday in range(0, nday, 1)])
+
+    return time_d, np.ma.concatenate(data_d, axis=0)
+
+def ww3_grid_axes(lon, lat, dlon, lat_range):
+
+    """
+    ww3_grid_axes(lon, lat, dlon, lat_range)
+
+        Function to find the longitude coordinates of the WW3 grid shifted by dlon degrees (the same shift as shift_grid) and the latitude
+        coordinates within lat_range, i.e. the grid of the daily fields of ww3_daily_fields.
+
+        Parameters
+        ----------
+        lon : numpy array column vector of longitude coordinates of the WW3 files
+        lat : numpy array column vector of latitude coordinates of the WW3 files
+        dlon : degrees of longitude to shift the grid by (see shift_grid)
+               e.g. dlon = 180
+        lat_range : list of the southern and northern latitude limits that are kept
+               e.g. lat_range = [-66, 66]
+
+        Returns
+        -------
+        lon_shift : read only numpy array of the shifted longitude coordinates (see shift_split)
+        lat_trunc : numpy array of the truncated latitude coordinates
+
+        Libraries necessary to run function
+        -----------------------------------
+        shift : from shift_grid import shift_split
+        hyperslab reader : from hyperslab_reader import lat_band
+    """
+
+    #import libraries:
+    from shift_grid import shift_split
+    from hyperslab_reader import lat_band
+
+    #shift the longitude axis (the split point is cached by shift_split):
+    nshift, lon_shift = shift_split(lon = lon, dlon = dlon)
+
+    #truncate the latitude axis to the rows within lat_range:
+    lat_trunc = lat[lat_band(lat = lat, lat_range = lat_range)]
+
+    return lon_shift, lat_trunc
+
+def ww3_daily_fields(filenames, steps_per_day, dlon, lat_range, chunk, nworkers):
+
+    """
+    ww3_daily_fields(filenames, steps_per_day, dlon, lat_range, chunk, nworkers)
+
+        Generator that reads the matched monthly WW3 Hs, Wnd and fp files in a single pass and yields the daily hs, wind speed and fp of each month
+        together. The three files of a month are read and averaged concurrently by a pool of processes (netCDF files cannot be read safely from
+        several threads), the next month is read while the current one is yielded, only the latitude band is read from the files (see
+        ww3_daily_file), and the longitude shift is applied once per month to the three products. The daily times of the three products are checked so that they stay aligned.
+
+        Parameters
+        ----------
+        filenames : dictionary of the list of monthly files of each product sorted in time (the lists must have one file per month for the same months)
+               e.g. filenames = {'hs': sorted(glob.glob('.../Hs/*.nc')), 'wnd': sorted(glob.glob('.../Wnd/*.nc')), 'fp': sorted(glob.glob('.../fp/*.nc'))}
+        steps_per_day : number of time steps in one day
+               e.g. steps_per_day = 8
+        dlon : degrees of longitude to shift the grid by (see shift_grid)
+               e.g. dlon = 180
+        lat_range : list of the southern and northern latitude limits that are kept
+               e.g. lat_range = [-66, 66]
+        chunk : number of days read at a time from each file (see ww3_daily_file)
+               e.g. chunk = 8
+        nworkers : number of worker processes (3 reads the three files of a month at the same time)
+               e.g. nworkers = 3
+
+        Yields
+        -------
+        time_d : list of datetimes of the first time step of each day of the month
+        fields : dictionary of 3D numpy masked arrays (day, lat, lon) of the shifted and truncated daily means with the keys 'hs', 'wsp' and 'fp'
+
+        Libraries necessary to run function
+        -----------------------------------
+        NetCDF : from netCDF4 import Dataset
+        concurrent.futures : from concurrent.futures import ProcessPoolExecutor
+        collections : from collections import deque
+        shift : from shift_grid import shift_grid
+    """
+
+    #import libraries:
+    from netCDF4 import Dataset
+    from shift_grid import shift_grid
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+
+    #check that every product has a file for each month:
+    products = ['hs', 'wnd', 'fp']
+    names = {'hs': 'hs', 'wnd': 'wsp', 'fp': 'fp'}
+    nfiles = [len(filenames[p]) for p in products]
+    if len(set(nfiles)) != 1:
+        raise ValueError('The Hs, Wnd and fp file lists have different lengths: %s' %nfiles)
+
+    #call the longitude of the grid from the first Hs file:
+    nc = Dataset(filenames['hs'][0], 'r')
+    lon = nc.variables['longitude'][:]
+    nc.close()
+
+    with ProcessPoolExecutor(max_workers = nworkers) as pool:
+
+        #submit the files of the first two months and keep a queue of the months in flight:
+        months = iter(range(nfiles[0]))
+        pending = deque()
+        for imonth in months:
+            pending.append(dict((p, pool.submit(ww3_daily_file, filenames[p][imonth], p, steps_per_day, lat_range, chunk)) for p in products))
+            if len(pending) == 2:
+                break
+
+        #yield the months in order and submit a new month each time a month is yielded:
+        while pending:
+            futures = pending.popleft()
+            results = dict((p, futures[p].result()) for p in products)
+            for imonth in months:
+                pending.append(dict((p, pool.submit(ww3_daily_file, filenames[p][imonth], p, steps_per_day, lat_range, chunk)) for p in products))
+                break
+
+            #check that the three products cover the same days:
+            time_d = results['hs'][0]
+            for p in ['wnd', 'fp']:
+                if list(results[p][0]) != list(time_d):
+                    raise ValueError('The daily times of the %s and hs files starting on %s do not match' %(p, time_d[0] if len(time_d) else None))
+
+            #shift the daily stacks of the three products (the split point of the grid is cached by shift_grid):
+            fields = {}
+            for p in products:
+                fields[names[p]], lon_shift = shift_grid(data = results[p][1], lon = lon, dlon = dlon)
+
+            yield time_d, fields
@@ -38,6 +38,7 @@ from matplotlib import cm
 #my functions
 from running_mean import running_mean
 from save_binned_ccmp2_wsp import save_netcdf_fields
+from hyperslab_reader import hyperslab_stream, lat_band
 
 
 # Set dimensions for data of space and time which depends on the spatial orientation of the data set and the time period which the data is collected from. For the CCMP v2 data set, we want the following data orientation: 
@@ -163,39 +164,27 @@ time_d = []
 
 #initialize counter:
 i = 0
-                                   
-#call each data file separately from each day in order:
-for f in filenames:
-                                   
-    #set nc variable in order to read attributes and obtained data: 
-    nc = Dataset(f, 'r')
 
-    #call corrected swh, corrected wsp, lon, and lat data from data file f: 
-    uwnd = nc.variables['uwnd'][:]
-    vwnd = nc.variables['vwnd'][:]
-    time_i = num2date(nc.variables['time'][:], nc.variables['time'].units) #convert time directly into datetime format instead of integer value time 
+#set the latitude band from -66 to 66 degrees (the same 529 rows from -66.125 to 65.875 as the original truncation wsp_d[trunc:len(lat)-trunc-1,:]):
+lat_range = [lat_min - dlat/2, lat_max]
+                                   
+#call the wind velocity components of each day in order, reading only the latitude band of each file (the next files are read in the background):
+for time_i, data_i in hyperslab_stream(filenames = filenames, variables = ['uwnd', 'vwnd'], lat_range = lat_range, chunk = 4, nprefetch = 4):
     
     #compute wind speed: 
-    wsp_h = np.sqrt((uwnd**2) + (vwnd**2))
-    
-    #print(wsp_h.shape)
+    wsp_h = np.sqrt((data_i['uwnd']**2) + (data_i['vwnd']**2))
     
     #Average the time steps from each day to obtain a daily average
     wsp_d = (wsp_h[0,:,:]+wsp_h[1,:,:]+wsp_h[2,:,:]+wsp_h[3,:,:])/4
-
+    
     #decrease the resolution of the the wsp matrix via convolution: 
     #wsp_conv = running_mean(data = wsp_d, k_dim = [4,4]) #For one to one grid point comparison of ccmp v2 and Ifremer product 1
     
     #take only the data points from CCMP v2 which match with the along track satellite data points Ifremer:
     #wsp_along_track = land_fill(data = wsp_d, fill = 'Satellite', res = '1_deg') #For one to one grid point comparison of ccmp v2 and Ifremer product 1
     
-    #truncate wsp data such that we are only looking at data from -66 to 66 degrees:
-    trunc = abs(int((min(lat)-lat_min)/dlat))
-    #wsp_c = wsp_conv[trunc:len(lat)-trunc,:] #For one to one grid point comparison of ccmp v2 and Ifremer product 1
-    wsp_c = wsp_d[trunc:len(lat)-trunc-1,:]
-    
-    #bin wsp and time data (make sure that wsp_c is a masked array): 
-    wsp_ccmp_d[i,:,:] = wsp_c
+    #bin wsp and time data (make sure that wsp_d is a masked array): 
+    wsp_ccmp_d[i,:,:] = wsp_d
     time_d.append([time_i[0]])
     
     #counter sum 
@@ -208,7 +197,8 @@ for f in filenames:
 # In[14]:
 
 
-print(trunc,len(lat)-trunc-1,lat[49],lat[579-1])
+ilat = lat_band(lat = lat, lat_range = lat_range)
+print(ilat,lat[ilat][0],lat[ilat][-1])
 print(wsp_ccmp_d.shape)
 
 
@@ -217,7 +207,7 @@ print(wsp_ccmp_d.shape)
 # In[12]:
 
 
-lat_n = lat[trunc:len(lat)-trunc-1]
+lat_n = lat[lat_band(lat = lat, lat_range = lat_range)]
 
 
 # Save WSP, longitude, latitude, and time variables into yearly netCDF files (data is too larger for 0.25 resolution)
@@ -244,7 +234,7 @@ for year in np.unique(years):
     time_y = time_c[ind_year]
     
     #save data into a netCDF file:
-    save_netcdf_fields(wsp = wsp_ccmp_y, lon = lon, lat = lat_n, time = time_y, output = '/zdata/downloads/colosi_data_bk/binned_data/ccmpv2_wind_data/daily_binned_ccmp_v2_data/ccmp_v2_wsp_daily_binned_data_' + '%s' %year + '_high_res.nc')
+    save_netcdf_fields(wsp = wsp_ccmp_y, lon = lon, lat = lat_n, time = time_y, output = '/zdata/downloads/colosi_data_bk/binned_data/ccmpv2_wind_data/daily_binned_ccmp_v2_data/ccmp_v2_wsp_daily_binned_data_' + '%s' %year + '_high_res.nc', dtype = 'f4')
 
 
 # Check that data is properly binned 
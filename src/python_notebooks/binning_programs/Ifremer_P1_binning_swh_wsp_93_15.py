@@ -34,7 +34,7 @@ import cmocean.cm as cmo
 from matplotlib import cm 
 
 #my functions
-from binning_along_track_data import bin_data
+from binning_along_track_data import bin_data_multi
 from shift_grid import shift_grid
 from save_binned_data_nc import save_netcdf_fields
 
@@ -130,9 +130,10 @@ for f in filenames:
     lat_i = nc.variables['lat'][:]
     time_i = num2date(nc.variables['time'][:], nc.variables['time'].units) #convert time directly into datetime format instead of integer value time 
                                                              
-    #bin data from current day: 
-    swh_bin = bin_data(data = swh_i, lon = lon_i, lat = lat_i, dim = [nlon, nlat], orientation = ['Atlantic',[-180, 179], [-66,66]])
-    wsp_bin = bin_data(data = wsp_i, lon = lon_i, lat = lat_i, dim = [nlon, nlat], orientation = ['Atlantic',[-180, 179], [-66,66]])
+    #bin swh and wsp data from current day in one pass (the cell indices are computed once for both variables): 
+    data_bin, N_bin = bin_data_multi(data = {'swh': swh_i, 'wsp': wsp_i}, lon = lon_i, lat = lat_i, dim = [nlon, nlat], orientation = ['Atlantic',[-180, 179], [-66,66]])
+    swh_bin = data_bin['swh']
+    wsp_bin = data_bin['wsp']
     
     #shift the data from the atlantic prespective to the Pacific perspective
     swh_bin_shift, lon_shift = shift_grid(data = swh_bin, lon = lon, dlon = 180)
@@ -163,7 +164,7 @@ print(lat_n.shape,lon_n.shape)
 # In[ ]:
 
 
-save_netcdf_fields(swh = swhcor_d, wsp = wspcor_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/home/lcolosi/data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_swh_wsp_daily_binned_data_93_16_update.nc')
+save_netcdf_fields(swh = swhcor_d, wsp = wspcor_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/home/lcolosi/data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_swh_wsp_daily_binned_data_93_16_update.nc', dtype = 'f4')
 
 
 # Plot one time step of the binned data in order to see the orientation of the binned data 
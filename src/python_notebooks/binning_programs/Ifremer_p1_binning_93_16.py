@@ -25,6 +25,8 @@ from netCDF4 import Dataset, num2date, date2num
 
 #My functions 
 #from binning_along_track_data_bia_method import bin_along_track_sat
+from binning_along_track_data import bin_fields
+from grid_index import grid_index
 from save_binned_ifremer_p1_swh import save_netcdf_swh
 from save_binned_ifremer_p1_wsp import save_netcdf_wsp
 
@@ -140,23 +142,14 @@ for f in filenames:
     #obtain the unique day time step
     day = np.unique(days)[0]
     
-    #loop through each along track data point: 
-    for i in range(len(swh)):
-        
-        #set indices for lon and lat:
-        indlat = np.abs(grid_lat - lat[i]).argmin()
-        indlon = np.abs(grid_lon - lon[i]).argmin()
-        #apply indices to data: 
-        data_base['swh'][indlat, indlon] += swh[i] # += adds the values following and reinitialize the variable such that it is equal to the new value 
-        data_base['swhcor'][indlat, indlon] += swhcor[i]
-        data_base['wspcor'][indlat,indlon] += wspcor[i]
-        data_base['N'][indlat, indlon] += 1
-        
-    #take the average of data points that have been summed together on the same grid point
-    N = np.ma.masked_where(data_base['N'] == 0, data_base['N'])
-    swh_bin = np.ma.masked_where(data_base['N'] == 0, data_base['swh'])/N
-    swhcor_bin = np.ma.masked_where(data_base['N'] == 0, data_base['swhcor'])/N
-    wspcor_bin = np.ma.masked_where(data_base['N'] == 0, data_base['wspcor'])/N
+    #set the grid cell index of every along track data point once (shared by swh, swhcor, and wspcor):
+    ind = grid_index(lon = lon, lat = lat, regular_grid = regular_grid, lat_range = [-90, 90])
+    
+    #bin swh, swhcor, and wspcor in one pass and take the average of data points that have been summed together on the same grid point
+    data_bin, N = bin_fields(data = {'swh': swh, 'swhcor': swhcor, 'wspcor': wspcor}, ind = ind, dim = [nlon, nlat])
+    swh_bin = data_bin['swh']
+    swhcor_bin = data_bin['swhcor']
+    wspcor_bin = data_bin['wspcor']
     
     #save the data in a 3D array: 
     swh_array[c,:,:] = swh_bin
@@ -182,8 +175,8 @@ print(time_array)
 # In[10]:
 
 
-save_netcdf_swh(swh = swhcor_array, lon = grid_lon, lat = grid_lat, time = time_array, output = '/zdata/downloads/colosi_data_bk/binned_data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_swh_daily_binned_data_93_16_bia.nc')
-save_netcdf_wsp(wsp = wspcor_array, lon = grid_lon, lat = grid_lat, time = time_array, output = '/zdata/downloads/colosi_data_bk/binned_data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_wsp_daily_binned_data_93_16_bia.nc')
+save_netcdf_swh(swh = swhcor_array, lon = grid_lon, lat = grid_lat, time = time_array, output = '/zdata/downloads/colosi_data_bk/binned_data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_swh_daily_binned_data_93_16_bia.nc', dtype = 'f4')
+save_netcdf_wsp(wsp = wspcor_array, lon = grid_lon, lat = grid_lat, time = time_array, output = '/zdata/downloads/colosi_data_bk/binned_data/ifremer_p1_daily_data/my_daily_binned_ifremer_data/ifremer_wsp_daily_binned_data_93_16_bia.nc', dtype = 'f4')
 
 
 #  
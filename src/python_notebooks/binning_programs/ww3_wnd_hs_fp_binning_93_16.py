@@ -41,8 +41,7 @@ from running_mean import running_mean
 from save_binned_ww3_hs import save_netcdf_fields_ww3_hs
 from save_binned_ww3_wnd import save_netcdf_fields_ww3_wsp
 from save_binned_ww3_fp import save_netcdf_fields_ww3_fp
-from shift_grid import shift_grid
-from mean_temporal_masked_data import mean_mask_t
+from ww3_daily_stream import ww3_daily_fields, ww3_grid_axes
 
 
 # Set dimensions for data of space and time which depends on the spatial orientation of the data set and the time period which the data is collected from. For the WW3 data set, we want the following data orientation: 
@@ -162,178 +161,42 @@ lat_min, lat_max = -66, 66 #extend the matrix to 66 north and south for latitude
 
 # Because each file is a separate day, I do not need to worry about making sure what file correspond to which day. Because each variable for hs, wind velocity components, and peak frequency are in their own files, I will need to complete these separately 
 
-# ##### Hs: 
+# ##### Hs, Wnd and fp: 
+
+# The Hs, Wnd and fp files of each month are read together by a pool of processes so that the three products stay time aligned and the shift and truncation of the grid are applied once per month
 
 # In[10]:
 
 
-#initialize masked array to concatinate 2d arrays directly into a 3D array:
+#initialize masked arrays to concatinate the daily 2d arrays directly into 3D arrays:
 hs_ww3_cfsr_d = np.ma.masked_all([nt, nlat, nlon])
+wsp_ww3_cfsr_d = np.ma.masked_all([nt, nlat, nlon])
+fp_ww3_cfsr_d = np.ma.masked_all([nt, nlat, nlon])
 time_d = []
 
 #initialize counter:
 i = 0
-                                   
-#call each data file separately from each day in order:
-for f in filenames_hs:
-                                   
-    #set nc variable in order to read attributes and obtained data: 
-    nc_hs = Dataset(f, 'r')
+
+#call the daily hs, wsp and fp of each month in order (orientated over to the Pacific and truncated from -78:78 to -66:66):
+filenames = {'hs': filenames_hs, 'wnd': filenames_wnd, 'fp': filenames_fp}
+for time_m, fields in ww3_daily_fields(filenames = filenames, steps_per_day = res_time, dlon = 180, lat_range = [lat_min, lat_max], chunk = 8, nworkers = 3):
     
-    #call corrected swh and time data from data file f: 
-    hs = nc_hs.variables['hs'][:]
-    time_i = num2date(nc_hs.variables['time'][:], nc_hs.variables['time'].units) #convert time directly into datetime format instead of integer value time
+    #save the daily arrays of the month in the 3D arrays: 
+    nday = len(time_m)
+    hs_ww3_cfsr_d[i:i+nday,:,:] = fields['hs']
+    wsp_ww3_cfsr_d[i:i+nday,:,:] = fields['wsp']
+    fp_ww3_cfsr_d[i:i+nday,:,:] = fields['fp']
+    time_d.extend([[t] for t in time_m])
     
-    #create a loop to go through each time step and find the indices for where 
-    for iday in range(res_time,len(time_i)+1,res_time):
-        
-        #call data from 1 day: 
-        hs_d = hs[(iday-res_time):iday,:,:]
-        
-        #average the data each day in order to obtain the daily mean hs global grid: 
-        hs_mean = mean_mask_t(data = hs_d)
-        
-        #decrease resolution up to 1 degree: 
-        #hs_conv = running_mean(data = hs_mean, k_dim = [2,2]) #Only for one to one comparison of data with Ifremer 
-        
-        #orientate the data over to the Pacific: 
-        hs_shift, lon_shift = shift_grid(data = hs_mean, lon = lon, dlon = 180)
-        
-        #take only the data points from ww3 which match with the along track satellite data points Ifremer:
-        #wsp_along_track = land_fill(data = hs_conv, fill = 'Satellite', res = '1_deg') #For one to one grid point comparison of ww3 and Ifremer product 1
-        
-        #truncate the latitude dimension from -78:78 to -66:66
-        trunc = abs(int((min(lat)-lat_min)/dlat))
-        #wsp_c = wsp_conv[trunc:len(lat)-trunc,:] #For one to one grid point comparison of ccmp v2 and Ifremer product 1
-        hs_c = hs_shift[trunc:len(lat)-trunc-4,:]
-        
-        #save the average daily array in a 3D array: 
-        hs_ww3_cfsr_d[i,:,:] = hs_c
-        time_d.append([time_i[iday-res_time]])
-        
-        #counter sum 
-        i = i + 1
-        print(i)
+    #counter sum 
+    i = i + nday
+    print(i)
 
 
 # In[11]:
 
 
 print(time_d)
-#trunc = abs(int((min(lat)-lat_min)/dlat))
-#print(lat[trunc:len(lat) - trunc - 4])
-#print(hs_ww3_cfsr_d.shape)
-
-
-# ##### Wnd: 
-
-# In[33]:
-
-
-#initialize masked array to concatinate 2d arrays directly into a 3D array:
-wsp_ww3_cfsr_d = np.ma.masked_all([nt, nlat, nlon])
-
-#initialize counter:
-i = 0
-                                   
-#call each data file separately from each day in order:
-for f in filenames_wnd:
-                                   
-    #set nc variable in order to read attributes and obtained data: 
-    nc_wnd = Dataset(f, 'r')
-    
-    #call corrected wind velocity components, lon, and lat data from data file f: 
-    uwnd = nc_wnd.variables['uwnd'][:]
-    vwnd = nc_wnd.variables['vwnd'][:]
-    time_i = num2date(nc_wnd.variables['time'][:], nc_wnd.variables['time'].units) #convert time directly into datetime format instead of integer value time 
-    
-    #compute wind speed: 
-    wsp = np.sqrt((uwnd**2) + (vwnd**2))
-    
-    #create a loop to go through each time step and find the indices for where 
-    for iday in range(res_time,len(time_i)+1,res_time):
-        
-        #call data from 1 day: 
-        wsp_d = wsp[(iday-res_time):iday,:,:]
-        
-        #average the data each day in order to obtain the daily mean hs global grid: 
-        wsp_mean = mean_mask_t(data = hs_d)
-        
-        #decrease resolution up to 1 degree: 
-        #wsp_conv = running_mean(data = wsp_mean, k_dim = [2,2]) #Only for one to one comparison of data with Ifremer 
-        
-        #orientate the data over to the Pacific: 
-        wsp_shift, lon_shift = shift_grid(data = wsp_mean, lon = lon, dlon = 180)
-        
-        #take only the data points from ww3 which match with the along track satellite data points Ifremer:
-        #wsp_along_track = land_fill(data = wsp_conv, fill = 'Satellite', res = '1_deg') #For one to one grid point comparison of ww3 and Ifremer product 1
-        
-        #truncate the latitude dimension from -78:78 to -66:66
-        trunc = abs(int((min(lat)-lat_min)/dlat))
-        #wsp_c = wsp_conv[trunc:len(lat)-trunc,:] #For one to one grid point comparison of ccmp v2 and Ifremer product 1
-        wsp_c = wsp_shift[trunc:len(lat)-trunc-4,:]
-        
-        #save the average daily array in a 3D array: 
-        wsp_ww3_cfsr_d[i,:,:] = wsp_c
-        
-        #counter sum 
-        i = i + 1
-        print(i)
-    
-
-
-# ##### fp:
-
-# In[34]:
-
-
-#initialize masked array to concatinate 2d arrays directly into a 3D array:
-fp_ww3_cfsr_d = np.ma.masked_all([nt, nlat, nlon])
-
-#initialize counter:
-i = 0
-                                   
-#call each data file separately from each day in order:
-for f in filenames_fp:
-                                   
-    #set nc variable in order to read attributes and obtained data: 
-    nc_fp = Dataset(f, 'r')
-    
-    #call corrected swh and time data from data file f: 
-    fp = nc_fp.variables['fp'][:]
-    time_i = num2date(nc_fp.variables['time'][:], nc_fp.variables['time'].units) #convert time directly into datetime format instead of integer value time 
-    
-    #create a loop to go through each time step and find the indices for where 
-    for iday in range(res_time,len(time_i)+1,res_time):
-        
-        #call data from 1 day: 
-        fp_d = fp[(iday-res_time):iday,:,:]
-        
-        #average the data each day in order to obtain the daily mean hs global grid: 
-        fp_mean = mean_mask_t(data = fp_d)
-        
-        #decrease resolution up to 1 degree: 
-        #fp_conv = running_mean(data = fp_mean, k_dim = [2,2])
-        
-        #orientate the data over to the Pacific: 
-        fp_shift, lon_shift = shift_grid(data = fp_mean, lon = lon, dlon = 180)
-        
-        #take only the data points from ww3 which match with the along track satellite data points Ifremer:
-        #fp_along_track = land_fill(data = fp_conv, fill = 'Satellite', res = '1_deg') #For one to one grid point comparison of ww3 and Ifremer product 1
-        
-        #truncate the latitude dimension from -78:78 to -66:66
-        trunc = abs(int((min(lat)-lat_min)/dlat))
-        #wsp_c = wsp_conv[trunc:len(lat)-trunc,:] #For one to one grid point comparison of ccmp v2 and Ifremer product 1
-        fp_c = fp_shift[trunc:len(lat)-trunc-4,:]
-        
-        #save the average daily array in a 3D array: 
-        fp_ww3_cfsr_d[i,:,:] = fp_c
-        
-        #counter sum 
-        i = i + 1
-        print(i)
-
-    
 
 
 # Reinitialize longitude anlatitude vectors with new orientations and resolutions
@@ -341,8 +204,7 @@ for f in filenames_fp:
 # In[13]:
 
 
-lon_n = np.arange(0,360,0.5)
-lat_n = lat[trunc:len(lat)-trunc-4]
+lon_n, lat_n = ww3_grid_axes(lon = lon, lat = lat, dlon = 180, lat_range = [lat_min, lat_max])
 print(lat_n.shape, lon_n.shape, hs_ww3_cfsr_d.shape)
 
 
@@ -353,7 +215,7 @@ print(lat_n.shape, lon_n.shape, hs_ww3_cfsr_d.shape)
 # In[14]:
 
 
-save_netcdf_fields_ww3_hs(swh = hs_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc')
+save_netcdf_fields_ww3_hs(swh = hs_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_hs_daily_binned_data_93_16.nc', dtype = 'f4')
 
 
 # ##### Wnd
@@ -361,7 +223,7 @@ save_netcdf_fields_ww3_hs(swh = hs_ww3_cfsr_d, lon = lon_n, lat = lat_n, time =
 # In[ ]:
 
 
-save_netcdf_fields_ww3_wsp(wsp = wsp_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_wnd_daily_binned_data_93_16.nc')
+save_netcdf_fields_ww3_wsp(wsp = wsp_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_wnd_daily_binned_data_93_16.nc', dtype = 'f4')
 
 
 # ##### fp
@@ -369,7 +231,7 @@ save_netcdf_fields_ww3_wsp(wsp = wsp_ww3_cfsr_d, lon = lon_n, lat = lat_n, time
 # In[ ]:
 
 
-save_netcdf_fields_ww3_fp(fp = fp_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_fp_daily_binned_data_93_16.nc')
+save_netcdf_fields_ww3_fp(fp = fp_ww3_cfsr_d, lon = lon_n, lat = lat_n, time = time_d, output = '/zdata/downloads/colosi_data_bk/binned_data/WW3/CFSR/lc_binned_data/ww3_fp_daily_binned_data_93_16.nc', dtype = 'f4')
 
 
 # Check that data is being correctly binned